@@ -6,7 +6,7 @@ use std::io::{self, Write};
 use std::path::Path;
 use std::process::Command as ProcessCommand;
 use std::sync::atomic::{AtomicBool, Ordering};
-use std::sync::Arc;
+use std::sync::{Arc, Mutex, OnceLock};
 
 // Import from lib module
 use installer::{
@@ -377,24 +377,63 @@ fn is_safe_shell_command(cmd: &str) -> bool {
     false
 }
 
-fn get_drive_size(drive: &str) -> Result<u64> {
-    // Use direct command execution to avoid shell injection issues
-    match execute_safe_command("lsblk", &["-b", "-o", "SIZE", "-n", drive]) {
-        Ok(output) => {
-            let size_str = output.trim();
-            if size_str.is_empty() {
-                Ok(0)
-            } else {
-                // Take only the first line (drive size, not partitions)
-                let first_line = size_str.lines().next().unwrap_or("").trim();
-                Ok(first_line.parse::<u64>().unwrap_or(0))
-            }
-        }
-        Err(e) => Err(e),
+// Drive sizes keyed by device path, so repeated lookups of the same drive
+// during one install do not re-read sysfs. Cleared when a drive is repartitioned.
+static DRIVE_SIZE_CACHE: OnceLock<Mutex<HashMap<String, u64>>> = OnceLock::new();
+
+fn drive_size_cache() -> &'static Mutex<HashMap<String, u64>> {
+    DRIVE_SIZE_CACHE.get_or_init(|| Mutex::new(HashMap::new()))
+}
+
+fn clear_drive_size_cache() {
+    if let Ok(mut cache) = drive_size_cache().lock() {
+        cache.clear();
     }
 }
 
+fn get_drive_size(drive: &str) -> Result<u64> {
+    let cached = drive_size_cache()
+        .lock()
+        .ok()
+        .and_then(|cache| cache.get(drive).copied());
+    if let Some(size) = cached {
+        return Ok(size);
+    }
+
+    // Read the size straight from sysfs instead of spawning lsblk per drive.
+    // The kernel reports it in 512-byte sectors regardless of the logical block size.
+    let name = Path::new(drive)
+        .file_name()
+        .map(|name| name.to_string_lossy().into_owned())
+        .unwrap_or_default();
+    let size_path = format!("/sys/block/{name}/size");
+    let sectors = fs::read_to_string(&size_path)
+        .with_context(|| format!("Failed to read drive size from {size_path}"))?;
+    let size = sectors.trim().parse::<u64>().unwrap_or(0) * 512;
+
+    if let Ok(mut cache) = drive_size_cache().lock() {
+        cache.insert(drive.to_string(), size);
+    }
+    Ok(size)
+}
+
+// Block device name prefixes that are never install targets (loopback, RAM
+// disks, optical drives, device-mapper and compressed swap devices)
+const NON_STORAGE_PREFIXES: &[&str] = &["loop", "ram", "sr", "dm-", "zram"];
+
+fn is_non_storage_device(name: &str) -> bool {
+    NON_STORAGE_PREFIXES
+        .iter()
+        .any(|prefix| name.starts_with(prefix))
+}
+
 fn check_drive_size(drive: &str) -> bool {
+    // Skip the size lookup entirely for devices that can never be targets
+    let name = drive.rsplit('/').next().unwrap_or(drive);
+    if is_non_storage_device(name) {
+        return false;
+    }
+
     match get_drive_size(drive) {
         Ok(size) => size > 12884901888, // 12GB in bytes
         Err(_) => false,
@@ -403,26 +442,30 @@ fn check_drive_size(drive: &str) -> bool {
 
 fn get_drives() -> Result<Vec<String>> {
     let sys_block = Path::new("/sys/block");
-    if !sys_block.exists() {
-        warn(&format!(
-            "Sys block directory not found: {}",
-            sys_block.display()
-        ));
-        return Ok(vec![]);
-    }
+    // Only the top-level entry names are needed, so a single read_dir pass is
+    // enough; a missing directory is detected from the same call instead of a
+    // separate exists() stat.
+    let entries = match fs::read_dir(sys_block) {
+        Ok(entries) => entries,
+        Err(e) if e.kind() == io::ErrorKind::NotFound => {
+            warn(&format!(
+                "Sys block directory not found: {}",
+                sys_block.display()
+            ));
+            return Ok(vec![]);
+        }
+        Err(e) => return Err(e.into()),
+    };
 
     let mut drives = Vec::new();
-    for entry in fs::read_dir(sys_block)? {
+    for entry in entries {
         let entry = entry?;
         let drive_name = entry.file_name();
         let drive_path = format!("/dev/{}", drive_name.to_string_lossy());
 
         // Skip loopback devices and other non-physical drives
         let name_str = drive_name.to_string_lossy();
-        if name_str.starts_with("loop")
-            || name_str.starts_with("ram")
-            || name_str.starts_with("dm-")
-        {
+        if is_non_storage_device(&name_str) {
             continue;
         }
 
@@ -799,36 +842,61 @@ fn set_efi_boot_flag(partition: &str) -> Result<()> {
     Ok(())
 }
 
+// Parse `lsblk -ln -o NAME,SIZE` output into a device-name -> size map
+fn parse_lsblk_sizes(output: &str) -> HashMap<String, String> {
+    output
+        .lines()
+        .filter_map(|line| {
+            let mut fields = line.split_whitespace();
+            Some((fields.next()?.to_string(), fields.next()?.to_string()))
+        })
+        .collect()
+}
+
+// Translate a layout into one sgdisk command per partition
+fn build_sgdisk_commands(drive: &str, layout: &[Partition]) -> Result<Vec<String>> {
+    let mut commands = Vec::with_capacity(layout.len());
+    for (part_num, partition) in (1u32..).zip(layout.iter()) {
+        let size = match partition.size.as_str() {
+            "512M" => "0:+512M",
+            "8G" => "0:+8G",
+            "2M" => "0:+2M",
+            "rest" => "0:0",
+            _ => bail!("Unsupported size: {}", partition.size),
+        };
+
+        let typecode = match partition.partition_type.as_str() {
+            "uefi" => "ef00",
+            "linux" => "8300",
+            "21686148-6449-6E6F-744E-656564454649" => "ef02",
+            _ => "8300",
+        };
+
+        let label = partition.label.as_deref().unwrap_or("");
+
+        commands.push(format!(
+            "sgdisk --new={part_num}:{size} --typecode={part_num}:{typecode} --change-name={part_num}:'{label}' {drive}"
+        ));
+    }
+    Ok(commands)
+}
+
 fn partition_drive(drive: &str, layout: &[Partition]) -> Result<()> {
     info(&format!("Partitioning drive {drive}"));
+    clear_drive_size_cache();
 
     // Step 2: Create new partition table
     info("Creating new partition table");
     if execute("which sgdisk").is_ok() {
+        // Build every partition command up front so an unsupported layout is
+        // rejected before the existing partition table is cleared
+        let partition_commands = build_sgdisk_commands(drive, layout)?;
+
         execute(&format!("sgdisk --clear {drive}"))?;
 
         // Create partitions
-        for (part_num, partition) in (1u32..).zip(layout.iter()) {
-            let size = match partition.size.as_str() {
-                "512M" => "0:+512M",
-                "8G" => "0:+8G",
-                "2M" => "0:+2M",
-                "rest" => "0:0",
-                _ => bail!("Unsupported size: {}", partition.size),
-            };
-
-            let typecode = match partition.partition_type.as_str() {
-                "uefi" => "ef00",
-                "linux" => "8300",
-                "21686148-6449-6E6F-744E-656564454649" => "ef02",
-                _ => "8300",
-            };
-
-            let label = partition.label.as_deref().unwrap_or("");
-
-            execute(&format!(
-                "sgdisk --new={part_num}:{size} --typecode={part_num}:{typecode} --change-name={part_num}:'{label}' {drive}"
-            ))?;
+        for command in &partition_commands {
+            execute(command)?;
         }
 
         // Use --refresh flag to notify kernel
@@ -841,12 +909,17 @@ fn partition_drive(drive: &str, layout: &[Partition]) -> Result<()> {
     info("Waiting for partitions to be recognized");
     let partition_names = wait_for_partitions(drive, layout.len())?;
 
-    // Step 4: Show what partitions were created
+    // Step 4: Show what partitions were created, sizing them all from a single
+    // lsblk listing of the drive instead of one lsblk call per partition
     info("Verifying new partitions were created");
+    let sizes = execute(&format!("lsblk -ln -o NAME,SIZE {drive}"))
+        .map(|output| parse_lsblk_sizes(&output))
+        .unwrap_or_default();
     println!("SUCCESS: Created {} partitions:", partition_names.len());
     for (i, partition) in partition_names.iter().enumerate() {
-        if let Ok(info) = execute(&format!("lsblk -n -o NAME,SIZE {partition}")) {
-            println!("  Partition {}: {} ({})", i + 1, partition, info.trim());
+        let name = partition.rsplit('/').next().unwrap_or(partition);
+        if let Some(size) = sizes.get(name) {
+            println!("  Partition {}: {} ({} {})", i + 1, partition, name, size);
         } else {
             println!("  Partition {}: {}", i + 1, partition);
         }
@@ -903,15 +976,11 @@ fn format_partition(device: &str, partition: &Partition) -> Result<()> {
                     );
                 }
 
-                // Create each subvolume with error handling
-                for subvolume in subvolumes {
-                    let subvol_path = format!("{temp_mount}{subvolume}");
-                    info(&format!("Creating BTRFS subvolume: {subvolume}"));
-                    if let Err(e) = execute(&format!("btrfs subvolume create {subvol_path}")) {
-                        // Attempt cleanup on failure
-                        let _ = execute(&format!("umount {temp_mount}"));
-                        bail!("Failed to create BTRFS subvolume '{}': {}", subvolume, e);
-                    }
+                // Create the subvolumes with error handling
+                if let Err(e) = create_subvolumes(temp_mount, subvolumes) {
+                    // Attempt cleanup on failure
+                    let _ = execute(&format!("umount {temp_mount}"));
+                    return Err(e);
                 }
 
                 // Unmount the temporary filesystem
@@ -940,6 +1009,60 @@ fn format_partition(device: &str, partition: &Partition) -> Result<()> {
     Ok(())
 }
 
+// Run independent commands concurrently, one thread per command.
+// Results are returned in the same order as `commands`.
+fn execute_batch(commands: &[String]) -> Vec<Result<String>> {
+    std::thread::scope(|scope| {
+        let handles: Vec<_> = commands
+            .iter()
+            .map(|command| scope.spawn(move || execute(command)))
+            .collect();
+        handles
+            .into_iter()
+            .map(|handle| {
+                handle
+                    .join()
+                    .unwrap_or_else(|_| Err(anyhow::anyhow!("Command thread panicked")))
+            })
+            .collect()
+    })
+}
+
+fn subvolume_depth(subvolume: &str) -> usize {
+    subvolume.split('/').filter(|part| !part.is_empty()).count()
+}
+
+// Create BTRFS subvolumes under `mount_point`. Subvolumes at the same nesting
+// depth do not depend on each other, so each depth level is created as one
+// concurrent batch; levels run shallowest first so parents exist before children.
+fn create_subvolumes(mount_point: &str, subvolumes: &[String]) -> Result<()> {
+    let mut depths: Vec<usize> = subvolumes.iter().map(|s| subvolume_depth(s)).collect();
+    depths.sort_unstable();
+    depths.dedup();
+
+    for depth in depths {
+        let level: Vec<&String> = subvolumes
+            .iter()
+            .filter(|subvolume| subvolume_depth(subvolume) == depth)
+            .collect();
+        let commands: Vec<String> = level
+            .iter()
+            .map(|subvolume| {
+                info(&format!("Creating BTRFS subvolume: {subvolume}"));
+                format!("btrfs subvolume create {mount_point}{subvolume}")
+            })
+            .collect();
+
+        for (subvolume, result) in level.iter().zip(execute_batch(&commands)) {
+            if let Err(e) = result {
+                bail!("Failed to create BTRFS subvolume '{}': {}", subvolume, e);
+            }
+        }
+    }
+
+    Ok(())
+}
+
 fn verify_filesystem(partition: &str, fs_type: &str) -> Result<()> {
     match fs_type {
         "vfat" => {
@@ -1237,16 +1360,11 @@ fn format_drive(drive: &str, layout: &[Partition]) -> Result<()> {
                         );
                     }
 
-                    // Create each subvolume with error handling
-                    for subvolume in subvolumes {
-                        let subvol_path = format!("{temp_mount}{subvolume}");
-                        info(&format!("Creating BTRFS subvolume: {subvolume}"));
-                        if let Err(e) = execute(&format!("btrfs subvolume create {subvol_path}"))
-                        {
-                            // Attempt cleanup on failure
-                            let _ = execute(&format!("umount {temp_mount}"));
-                            bail!("Failed to create BTRFS subvolume '{}': {}", subvolume, e);
-                        }
+                    // Create the subvolumes with error handling
+                    if let Err(e) = create_subvolumes(temp_mount, subvolumes) {
+                        // Attempt cleanup on failure
+                        let _ = execute(&format!("umount {temp_mount}"));
+                        return Err(e);
                     }
 
                     // Unmount the temporary filesystem
@@ -3474,4 +3592,86 @@ mod tests_main {
         let _ = std::fs::remove_dir_all(&base);
         Ok(())
     }
+
+    #[test]
+    fn test_get_drive_size_uses_cache() -> Result<()> {
+        let drive = "/dev/regicide-test-cached";
+        drive_size_cache()
+            .lock()
+            .unwrap()
+            .insert(drive.to_string(), 4096);
+        assert_eq!(get_drive_size(drive)?, 4096);
+
+        clear_drive_size_cache();
+        assert!(get_drive_size(drive).is_err());
+        Ok(())
+    }
+
+    fn test_partition(size: &str, label: Option<&str>, partition_type: &str) -> Partition {
+        Partition {
+            size: size.to_string(),
+            label: label.map(str::to_string),
+            format: "btrfs".to_string(),
+            partition_type: partition_type.to_string(),
+            subvolumes: None,
+            inside: None,
+        }
+    }
+
+    #[test]
+    fn test_build_sgdisk_commands() -> Result<()> {
+        let layout = vec![
+            test_partition("512M", Some("EFI"), "uefi"),
+            test_partition("rest", None, "linux"),
+        ];
+        let commands = build_sgdisk_commands("/dev/sda", &layout)?;
+
+        assert_eq!(
+            commands,
+            vec![
+                "sgdisk --new=1:0:+512M --typecode=1:ef00 --change-name=1:'EFI' /dev/sda",
+                "sgdisk --new=2:0:0 --typecode=2:8300 --change-name=2:'' /dev/sda",
+            ]
+        );
+        Ok(())
+    }
+
+    #[test]
+    fn test_build_sgdisk_commands_rejects_unsupported_size() {
+        let layout = vec![
+            test_partition("512M", Some("EFI"), "uefi"),
+            test_partition("3T", None, "linux"),
+        ];
+
+        assert!(build_sgdisk_commands("/dev/sda", &layout).is_err());
+    }
+
+    #[test]
+    fn test_parse_lsblk_sizes() {
+        let sizes = parse_lsblk_sizes("sda   256G\nsda1  512M\nsda2 255.5G\n\n");
+
+        assert_eq!(sizes.len(), 3);
+        assert_eq!(sizes["sda1"], "512M");
+        assert_eq!(sizes["sda2"], "255.5G");
+    }
+
+    #[test]
+    fn test_check_drive_size_skips_non_storage_devices() {
+        // A cached size above the minimum must not be consulted for these names
+        drive_size_cache()
+            .lock()
+            .unwrap()
+            .insert("/dev/loop0".to_string(), u64::MAX);
+
+        assert!(!check_drive_size("/dev/loop0"));
+        assert!(!check_drive_size("/dev/sr0"));
+        assert!(!check_drive_size("/dev/zram0"));
+    }
+
+    #[test]
+    fn test_subvolume_depth() {
+        assert_eq!(subvolume_depth("/home"), 1);
+        assert_eq!(subvolume_depth("/overlay/etc"), 2);
+        assert_eq!(subvolume_depth("overlay/var/"), 2);
+    }
 }
@@ -6,15 +6,10 @@ import unittest
 from unittest.mock import Mock, patch, MagicMock, call
 import tempfile
 import os
-import sys
 import json
 import time
-from pathlib import Path
 from typing import Dict, List, Any
 
-# Add the project root to Python path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
-
 class TestBtrMindCore(unittest.TestCase):
     """Test BtrMind core functionality with mock BTRFS operations."""
     
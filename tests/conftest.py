@@ -0,0 +1,9 @@
+"""
+Shared pytest configuration for the RegicideOS test suite.
+"""
+
+import sys
+from pathlib import Path
+
+# Add the project root to Python path once per session instead of per module
+sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -0,0 +1,9 @@
+"""
+Shared pytest configuration for the RegicideOS installer test suite.
+"""
+
+import sys
+from pathlib import Path
+
+# Add the installer directory to Python path once for every installer test module
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "installer"))
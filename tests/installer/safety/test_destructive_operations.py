@@ -5,15 +5,94 @@ These tests ensure that dangerous operations cannot be executed accidentally.
 
 import unittest
 from unittest.mock import Mock, patch, MagicMock, call
+import contextlib
+import re
+from dataclasses import dataclass
 import subprocess
 import tempfile
 import os
 import sys
-from pathlib import Path
 from io import StringIO
 
-# Add the installer directory to Python path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+def build_keyword_matcher(keywords):
+    """Build a predicate that reports whether any keyword occurs in a string.
+
+    Uses a single Aho-Corasick automaton when pyahocorasick is installed and
+    falls back to one compiled regex alternation otherwise.
+    """
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for keyword in keywords:
+            automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+        return lambda text: next(automaton.iter(text), None) is not None
+    
+    pattern = re.compile("|".join(re.escape(keyword) for keyword in keywords))
+    return lambda text: pattern.search(text) is not None
+
+# Set REGICIDE_FAST_TESTS=1 to skip the framework demo tests in a quick dev loop
+FAST_TESTS = os.environ.get("REGICIDE_FAST_TESTS") == "1"
+SKIP_IN_FAST_SUITE = unittest.skipIf(
+    FAST_TESTS, "framework demo tests; unset REGICIDE_FAST_TESTS to run them"
+)
+
+# Shared results for the simulated subprocess wrapper; never mutated by tests
+DRY_RUN_RESULT = subprocess.CompletedProcess(args=(), returncode=0, stdout=b"", stderr=b"")
+EXECUTE_RESULT = subprocess.CompletedProcess(args=(), returncode=0, stdout=b"success", stderr=b"")
+
+@dataclass(frozen=True, slots=True)
+class SafetyRequirement:
+    """A critical installer safety requirement and its implementation status."""
+    requirement: str
+    description: str
+    implementation: str
+    testable: bool
+
+SAFETY_REQUIREMENTS = (
+    SafetyRequirement(
+        requirement="UEFI-only enforcement",
+        description="Must reject BIOS systems before any destructive operations",
+        implementation="Implemented in main.py UEFI check",
+        testable=True,
+    ),
+    SafetyRequirement(
+        requirement="Configuration validation",
+        description="Must validate all parameters before installation",
+        implementation="Implemented in config.py",
+        testable=True,
+    ),
+    SafetyRequirement(
+        requirement="Dry-run mode",
+        description="Must support safe simulation of all operations",
+        implementation="Needs implementation in common.py",
+        testable=True,
+    ),
+    SafetyRequirement(
+        requirement="User confirmation",
+        description="Must require explicit user confirmation before destructive operations",
+        implementation="Partially implemented in main.py",
+        testable=True,
+    ),
+    SafetyRequirement(
+        requirement="Operation logging",
+        description="Must log all operations for audit and debugging",
+        implementation="Needs comprehensive implementation",
+        testable=True,
+    ),
+)
+
+def capture_stdout(test_case):
+    """Redirect stdout into an in-memory buffer for the duration of a test."""
+    buffer = StringIO()
+    redirect = contextlib.redirect_stdout(buffer)
+    redirect.__enter__()
+    test_case.addCleanup(redirect.__exit__, None, None, None)
+    return buffer
 
 class TestDestructiveOperationSafety(unittest.TestCase):
     """Test safety mechanisms for destructive operations."""
@@ -34,6 +113,10 @@ class TestDestructiveOperationSafety(unittest.TestCase):
             "delete",     # Deletion operations
             "remove",     # Removal operations
         ]
+        
+        self._matches_dangerous = build_keyword_matcher(
+            self.dangerous_commands + self.destructive_patterns
+        )
     
     def test_identify_dangerous_commands(self):
         """Test identification of potentially dangerous commands."""
@@ -44,24 +127,8 @@ class TestDestructiveOperationSafety(unittest.TestCase):
         self.assertTrue(self._is_dangerous_command(dangerous_command))
     
     def _is_dangerous_command(self, command):
-        """Helper method to identify dangerous commands."""
-        command_lower = command.lower()
-        
-        # Check for dangerous command names
-        for dangerous_cmd in self.dangerous_commands:
-            if dangerous_cmd in command_lower:
-                return True
-        
-        # Check for dangerous patterns
-        for pattern in self.destructive_patterns:
-            if pattern in command_lower:
-                return True
-        
-        # Check for device writes
-        if "of=/dev/" in command_lower:
-            return True
-        
-        return False
+        """Helper method to identify dangerous commands and device writes."""
+        return self._matches_dangerous(command.lower())
     
     def test_subprocess_safety_wrapper(self):
         """Test safety wrapper for subprocess calls."""
@@ -71,30 +138,24 @@ class TestDestructiveOperationSafety(unittest.TestCase):
                 self.calls_made = []
                 self.dangerous_commands = dangerous_cmds
                 self.destructive_patterns = destructive_ptrns
+                self._matches_dangerous = build_keyword_matcher(
+                    dangerous_cmds + destructive_ptrns
+                )
             
             def run(self, command, dry_run=False):
                 """Safe subprocess execution with dry-run support."""
                 if dry_run or self.dry_run:
                     self.calls_made.append(("DRY_RUN", command))
-                    return Mock(returncode=0, stdout=b"", stderr=b"")
+                    return DRY_RUN_RESULT
                 
                 if self._is_dangerous_command(command):
                     raise PermissionError(f"Dangerous command blocked: {command}")
                 
                 self.calls_made.append(("EXECUTE", command))
-                return Mock(returncode=0, stdout=b"success", stderr=b"")
+                return EXECUTE_RESULT
             
             def _is_dangerous_command(self, command):
-                command_lower = command.lower()
-                for dangerous_cmd in self.dangerous_commands:
-                    if dangerous_cmd in command_lower:
-                        return True
-                for pattern in self.destructive_patterns:
-                    if pattern in command_lower:
-                        return True
-                if "of=/dev/" in command_lower:
-                    return True
-                return False
+                return self._matches_dangerous(command.lower())
         
         safe_subprocess = SafeSubprocess(self.dangerous_commands, self.destructive_patterns)
         
@@ -112,12 +173,14 @@ class TestDestructiveOperationSafety(unittest.TestCase):
         self.assertEqual(result.returncode, 0)
         self.assertEqual(safe_subprocess.calls_made[-1][0], "EXECUTE")
 
+@SKIP_IN_FAST_SUITE
 class TestDryRunMode(unittest.TestCase):
     """Test dry-run mode for safe testing of operations."""
     
     def setUp(self):
         """Set up test fixtures."""
         self.original_execute = None
+        self.stdout = capture_stdout(self)
     
     def test_dry_run_mode_implementation(self):
         """Test implementation of dry-run mode for the installer."""
@@ -163,6 +226,7 @@ class TestDryRunMode(unittest.TestCase):
         
         self.assertEqual(len(executor.executed_commands), 1)
         self.assertEqual(len(executor.dry_run_commands), 2)
+        self.assertIn("[DRY-RUN] Would execute: dd if=/dev/zero of=/dev/sda", self.stdout.getvalue())
     
     def test_dry_run_safety_validation(self):
         """Test that dry-run mode provides proper safety validation."""
@@ -216,10 +280,16 @@ class TestDryRunMode(unittest.TestCase):
         
         self.assertTrue(result)
         self.assertTrue(installer.validation_passed)
+        self.assertEqual(self.stdout.getvalue().count("[DRY-RUN] Validating"), 4)
 
+@SKIP_IN_FAST_SUITE
 class TestSafetyIntegration(unittest.TestCase):
     """Test integration of safety mechanisms with installer operations."""
     
+    def setUp(self):
+        """Set up test fixtures."""
+        self.stdout = capture_stdout(self)
+    
     def test_comprehensive_safety_framework(self):
         """Test comprehensive safety framework for installer."""
         
@@ -305,18 +375,19 @@ class TestSafetyIntegration(unittest.TestCase):
             
             def _simulate_operations(self, config):
                 """Simulate operations in dry-run mode."""
-                operations = [
+                operations = (
                     f"Partition drive {config['drive']}",
                     f"Format filesystem {config['filesystem']}",
                     f"Download root image from {config['root_url']}",
                     "Install bootloader",
                     "Configure system",
-                ]
+                )
                 
-                print("[SIMULATION] Simulating installation operations:")
-                for op in operations:
-                    print(f"  [SIM] {op}")
-                    self.operation_log.append(f"SIM: {op}")
+                self.operation_log.extend(f"SIM: {op}" for op in operations)
+                sys.stdout.write(
+                    "[SIMULATION] Simulating installation operations:\n"
+                    + "".join(f"  [SIM] {op}\n" for op in operations)
+                )
             
             def _get_user_confirmation(self):
                 """Get user confirmation for installation."""
@@ -342,56 +413,21 @@ class TestSafetyIntegration(unittest.TestCase):
         self.assertTrue(result)
         self.assertTrue(safety_framework.safety_checks_passed)
         self.assertGreater(len(safety_framework.operation_log), 0)
+        self.assertIn("  [SIM] Partition drive /dev/sda\n", self.stdout.getvalue())
+        self.assertIn("Dry-run complete - no changes made", self.stdout.getvalue())
 
+@SKIP_IN_FAST_SUITE
 class TestSafetyCriticalRequirements(unittest.TestCase):
     """Test that critical safety requirements are met."""
     
     def test_critical_safety_requirements(self):
         """Test all critical safety requirements are documented and enforced."""
-        
-        safety_requirements = [
-            {
-                "requirement": "UEFI-only enforcement",
-                "description": "Must reject BIOS systems before any destructive operations",
-                "implementation": "Implemented in main.py UEFI check",
-                "testable": True
-            },
-            {
-                "requirement": "Configuration validation",
-                "description": "Must validate all parameters before installation",
-                "implementation": "Implemented in config.py",
-                "testable": True
-            },
-            {
-                "requirement": "Dry-run mode",
-                "description": "Must support safe simulation of all operations",
-                "implementation": "Needs implementation in common.py",
-                "testable": True
-            },
-            {
-                "requirement": "User confirmation",
-                "description": "Must require explicit user confirmation before destructive operations",
-                "implementation": "Partially implemented in main.py",
-                "testable": True
-            },
-            {
-                "requirement": "Operation logging",
-                "description": "Must log all operations for audit and debugging",
-                "implementation": "Needs comprehensive implementation",
-                "testable": True
-            }
-        ]
-        
-        # Verify all requirements are documented
-        for req in safety_requirements:
-            self.assertIn("requirement", req)
-            self.assertIn("description", req)
-            self.assertIn("implementation", req)
-            self.assertIn("testable", req)
-            self.assertTrue(req["testable"], f"Requirement {req['requirement']} must be testable")
+        # SafetyRequirement construction guarantees every field is present
+        for req in SAFETY_REQUIREMENTS:
+            self.assertTrue(req.testable, f"Requirement {req.requirement} must be testable")
         
         # This test documents the safety requirements and their implementation status
-        self.assertEqual(len(safety_requirements), 5, "All critical safety requirements must be documented")
+        self.assertEqual(len(SAFETY_REQUIREMENTS), 5, "All critical safety requirements must be documented")
 
 if __name__ == '__main__':
     # Run with detailed output
@@ -3,14 +3,9 @@ Test configuration validation and parsing for the RegicideOS installer.
 """
 
 import unittest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch, MagicMock, DEFAULT
 import tempfile
 import os
-import sys
-from pathlib import Path
-
-# Add the installer directory to Python path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 MODULES_AVAILABLE = False
 try:
@@ -31,15 +26,13 @@ class TestConfigValidation(unittest.TestCase):
             "filesystem": "btrfs"
         }
     
-    @patch('config.common.get_drives')
-    @patch('config.common.check_url')
-    @patch('config.common.get_fs')
-    def test_parse_config_valid(self, mock_get_fs, mock_check_url, mock_get_drives):
+    @patch.multiple('config.common', get_drives=DEFAULT, check_url=DEFAULT, get_fs=DEFAULT)
+    def test_parse_config_valid(self, get_drives, check_url, get_fs):
         """Test parsing a valid configuration."""
         # Mock the validation functions
-        mock_get_drives.return_value = ["/dev/sda", "/dev/sdb"]
-        mock_check_url.return_value = True
-        mock_get_fs.return_value = ["btrfs", "btrfs_encryption_dev"]
+        get_drives.return_value = ["/dev/sda", "/dev/sdb"]
+        check_url.return_value = True
+        get_fs.return_value = ["btrfs", "btrfs_encryption_dev"]
         
         result = parse_config(self.valid_config, interactive=False)
         
@@ -47,54 +40,46 @@ class TestConfigValidation(unittest.TestCase):
         self.assertEqual(result["filesystem"], "btrfs")
         self.assertEqual(result["root_url"], self.valid_config["root_url"])
     
-    @patch('config.common.get_drives')
-    @patch('config.common.check_url')
-    @patch('config.common.get_fs')
-    def test_parse_config_invalid_drive(self, mock_get_fs, mock_check_url, mock_get_drives):
+    @patch.multiple('config.common', get_drives=DEFAULT, check_url=DEFAULT, get_fs=DEFAULT)
+    def test_parse_config_invalid_drive(self, get_drives, check_url, get_fs):
         """Test parsing with invalid drive selection."""
         # Mock available drives but config has invalid drive
-        mock_get_drives.return_value = ["/dev/sdb", "/dev/sdc"]
-        mock_check_url.return_value = True
-        mock_get_fs.return_value = ["btrfs"]
+        get_drives.return_value = ["/dev/sdb", "/dev/sdc"]
+        check_url.return_value = True
+        get_fs.return_value = ["btrfs"]
         
         # Should raise SystemExit due to die() call in non-interactive mode
         with self.assertRaises(SystemExit):
             parse_config({"drive": "/dev/invalid"}, interactive=False)
     
-    @patch('config.common.get_drives')
-    @patch('config.common.check_url')
-    @patch('config.common.get_fs')
-    def test_parse_config_invalid_url(self, mock_get_fs, mock_check_url, mock_get_drives):
+    @patch.multiple('config.common', get_drives=DEFAULT, check_url=DEFAULT, get_fs=DEFAULT)
+    def test_parse_config_invalid_url(self, get_drives, check_url, get_fs):
         """Test parsing with invalid URL."""
-        mock_get_drives.return_value = ["/dev/sda"]
-        mock_check_url.return_value = False  # URL validation fails
-        mock_get_fs.return_value = ["btrfs"]
+        get_drives.return_value = ["/dev/sda"]
+        check_url.return_value = False  # URL validation fails
+        get_fs.return_value = ["btrfs"]
         
         with self.assertRaises(SystemExit):
             parse_config({"drive": "/dev/sda", "root_url": "invalid-url"}, interactive=False)
     
-    @patch('config.common.get_drives')
-    @patch('config.common.check_url')
-    @patch('config.common.get_fs')
-    def test_parse_config_invalid_filesystem(self, mock_get_fs, mock_check_url, mock_get_drives):
+    @patch.multiple('config.common', get_drives=DEFAULT, check_url=DEFAULT, get_fs=DEFAULT)
+    def test_parse_config_invalid_filesystem(self, get_drives, check_url, get_fs):
         """Test parsing with unsupported filesystem."""
-        mock_get_drives.return_value = ["/dev/sda"]
-        mock_check_url.return_value = True
-        mock_get_fs.return_value = ["btrfs"]  # Only btrfs supported
+        get_drives.return_value = ["/dev/sda"]
+        check_url.return_value = True
+        get_fs.return_value = ["btrfs"]  # Only btrfs supported
         
         # Traditional filesystem should fail
         with self.assertRaises(SystemExit):
             parse_config({"drive": "/dev/sda", "filesystem": "traditional"}, interactive=False)
     
-    @patch('config.common.get_drives')
-    @patch('config.common.check_url')
-    @patch('config.common.get_fs')
+    @patch.multiple('config.common', get_drives=DEFAULT, check_url=DEFAULT, get_fs=DEFAULT)
     @patch('builtins.input')
-    def test_parse_config_interactive_mode(self, mock_input, mock_get_fs, mock_check_url, mock_get_drives):
+    def test_parse_config_interactive_mode(self, mock_input, get_drives, check_url, get_fs):
         """Test interactive configuration mode."""
-        mock_get_drives.return_value = ["/dev/sda", "/dev/sdb"]
-        mock_check_url.return_value = True
-        mock_get_fs.return_value = ["btrfs", "btrfs_encryption_dev"]
+        get_drives.return_value = ["/dev/sda", "/dev/sdb"]
+        check_url.return_value = True
+        get_fs.return_value = ["btrfs", "btrfs_encryption_dev"]
         
         # Simulate user accepting defaults
         mock_input.return_value = ""
@@ -118,14 +103,12 @@ class TestConfigValidation(unittest.TestCase):
             with self.assertRaises(SystemExit):
                 parse_config(incomplete_config, interactive=False)
     
-    @patch('config.common.get_drives')
-    @patch('config.common.check_url')
-    @patch('config.common.get_fs')
-    def test_config_btrfs_encryption_support(self, mock_get_fs, mock_check_url, mock_get_drives):
+    @patch.multiple('config.common', get_drives=DEFAULT, check_url=DEFAULT, get_fs=DEFAULT)
+    def test_config_btrfs_encryption_support(self, get_drives, check_url, get_fs):
         """Test that btrfs encryption is properly supported."""
-        mock_get_drives.return_value = ["/dev/sda"]
-        mock_check_url.return_value = True
-        mock_get_fs.return_value = ["btrfs", "btrfs_encryption_dev"]
+        get_drives.return_value = ["/dev/sda"]
+        check_url.return_value = True
+        get_fs.return_value = ["btrfs", "btrfs_encryption_dev"]
         
         # Test btrfs_encryption_dev is accepted
         result = parse_config({
@@ -136,14 +119,12 @@ class TestConfigValidation(unittest.TestCase):
         
         self.assertEqual(result["filesystem"], "btrfs_encryption_dev")
     
-    @patch('config.common.get_drives')
-    @patch('config.common.check_url')
-    @patch('config.common.get_fs')
-    def test_config_lvm_rejected(self, mock_get_fs, mock_check_url, mock_get_drives):
+    @patch.multiple('config.common', get_drives=DEFAULT, check_url=DEFAULT, get_fs=DEFAULT)
+    def test_config_lvm_rejected(self, get_drives, check_url, get_fs):
         """Test that LVM layouts are rejected due to btrfs-only requirement."""
-        mock_get_drives.return_value = ["/dev/sda"]
-        mock_check_url.return_value = True
-        mock_get_fs.return_value = ["btrfs"]  # Only btrfs in available options
+        get_drives.return_value = ["/dev/sda"]
+        check_url.return_value = True
+        get_fs.return_value = ["btrfs"]  # Only btrfs in available options
         
         # LVM should not be available in get_fs return, but test if somehow specified
         with self.assertRaises(SystemExit):
@@ -3,19 +3,65 @@ Test disk operations with mocking to ensure safety and prevent real disk access.
 """
 
 import unittest
-from unittest.mock import Mock, patch, MagicMock, call
+from unittest.mock import Mock, patch, MagicMock, call, mock_open
+from contextlib import contextmanager
 import tempfile
 import os
 import subprocess
-import sys
-from pathlib import Path
 
-# Add the installer directory to Python path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+def make_popen(stdout=b'', stderr=b''):
+    """Build a finished subprocess.Popen stand-in that yields the given output."""
+    process = Mock(spec=subprocess.Popen)
+    process.communicate.return_value = (stdout, stderr)
+    process.returncode = 0
+    return process
+
+def start_class_patch(cls, target):
+    """Start a patcher shared by every test in cls; stopped after the class."""
+    patcher = patch(target)
+    cls.addClassCleanup(patcher.stop)
+    return patcher.start()
+
+@contextmanager
+def _flag(module, name, value):
+    """Temporarily set a module-level flag without the patcher machinery."""
+    old = getattr(module, name)
+    setattr(module, name, value)
+    try:
+        yield
+    finally:
+        setattr(module, name, old)
+
+def bucket_calls(calls, keys):
+    """Group recorded execute() calls by the command keywords they contain in one pass."""
+    buckets = {key: [] for key in keys}
+    for recorded in calls:
+        command = recorded[0][0]
+        for key in keys:
+            if key in command:
+                buckets[key].append(recorded)
+    return buckets
+
+def _fake_direntry(name):
+    """Build an os.DirEntry stand-in for a top-level /sys/block entry."""
+    entry = Mock(spec=os.DirEntry)
+    entry.name = name
+    entry.path = f"/sys/block/{name}"
+    entry.is_dir.return_value = True
+    return entry
+
+def _fake_scandir(names):
+    """Build an os.scandir() result usable as an iterator or a context manager."""
+    entries = [_fake_direntry(name) for name in names]
+    iterator = MagicMock()
+    iterator.__iter__.side_effect = lambda: iter(entries)
+    iterator.__enter__.return_value = iterator
+    return iterator
 
 MODULES_AVAILABLE = False
 try:
     from common import get_drive_size, check_drive_size, get_drives, execute
+    import common
     import drive
     MODULES_AVAILABLE = True
 except ImportError:
@@ -30,30 +76,19 @@ class TestDiskOperations(unittest.TestCase):
         self.test_drive = "/dev/sda"
         self.test_drive_size = 256 * 1024 * 1024 * 1024  # 256GB in bytes
         
-    @patch('subprocess.Popen')
-    def test_get_drive_size_success(self, mock_popen):
-        """Test successful drive size detection."""
-        # Mock successful subprocess response
-        mock_process = Mock()
-        mock_process.communicate.return_value = (b'268435456000\n', b'')  # 256GB
-        mock_popen.return_value = mock_process
-        
+    @patch('builtins.open', new_callable=mock_open, read_data=b'524288000\n')
+    def test_get_drive_size_success(self, mock_file):
+        """Test successful drive size detection from sysfs."""
+        # sysfs reports the size in 512-byte sectors
         result = get_drive_size(self.test_drive)
         
-        self.assertEqual(result, 268435456000)
-        mock_popen.assert_called_once_with(
-            f"lsblk -bo SIZE {self.test_drive} | grep -v -m 1 SIZE",
-            stdout=subprocess.PIPE, shell=True
-        )
+        self.assertEqual(result, 268435456000)  # 256GB
+        mock_file.assert_called_once_with('/sys/block/sda/size', 'rb')
     
-    @patch('subprocess.Popen')
-    def test_get_drive_size_failure(self, mock_popen):
+    @patch('builtins.open', side_effect=FileNotFoundError)
+    def test_get_drive_size_failure(self, mock_file):
         """Test drive size detection failure."""
-        # Mock empty response (drive not found)
-        mock_process = Mock()
-        mock_process.communicate.return_value = (b'', b'')
-        mock_popen.return_value = mock_process
-        
+        # Drive not present in /sys/block
         result = get_drive_size(self.test_drive)
         
         self.assertEqual(result, 0)  # Should return 0 on failure
@@ -89,14 +124,12 @@ class TestDiskOperations(unittest.TestCase):
         
         self.assertTrue(result)  # Should pass at exact boundary
     
-    @patch('os.walk')
+    @patch('os.scandir')
     @patch('common.check_drive_size')
-    def test_get_drives_success(self, mock_check_size, mock_walk):
+    def test_get_drives_success(self, mock_check_size, mock_scandir):
         """Test successful drive enumeration."""
-        # Mock /sys/block directory contents
-        mock_walk.return_value = [
-            ('/sys/block', ['sda', 'sdb', 'sr0'], []),
-        ]
+        # Mock /sys/block top-level entries
+        mock_scandir.return_value = _fake_scandir(['sda', 'sdb', 'sr0'])
         
         # Mock drive size checks - sda and sdb pass, sr0 fails
         def side_effect_check_size(drive):
@@ -108,14 +141,13 @@ class TestDiskOperations(unittest.TestCase):
         
         expected = ['/dev/sda', '/dev/sdb']  # Only drives > 12GB
         self.assertEqual(result, expected)
+        mock_scandir.assert_called_once_with('/sys/block')
     
-    @patch('os.walk')
+    @patch('os.scandir')
     @patch('common.check_drive_size')
-    def test_get_drives_no_valid_drives(self, mock_check_size, mock_walk):
+    def test_get_drives_no_valid_drives(self, mock_check_size, mock_scandir):
         """Test behavior when no valid drives are found."""
-        mock_walk.return_value = [
-            ('/sys/block', ['sda', 'sdb'], []),
-        ]
+        mock_scandir.return_value = _fake_scandir(['sda', 'sdb'])
         
         # All drives fail size check
         mock_check_size.return_value = False
@@ -138,7 +170,7 @@ class TestDiskOperations(unittest.TestCase):
     def test_execute_pretend_mode(self, mock_execute):
         """Test pretend mode (should not execute real commands)."""
         # This tests the PRETEND functionality
-        with patch('common.PRETEND', True):
+        with _flag(common, 'PRETEND', True):
             execute("dangerous command")
             
             # Should not call the real execute function
@@ -148,12 +180,10 @@ class TestDiskOperations(unittest.TestCase):
     @patch('subprocess.Popen')
     def test_execute_subprocess_call(self, mock_popen, mock_execute):
         """Test that execute properly calls subprocess."""
-        mock_process = Mock()
-        mock_process.communicate.return_value = (b'test output', b'')
-        mock_popen.return_value = mock_process
+        mock_popen.return_value = make_popen(b'test output')
         
         # Call the real execute function
-        with patch('common.PRETEND', False):
+        with _flag(common, 'PRETEND', False):
             result = execute("test command")
             
             self.assertEqual(result, b'test output')
@@ -167,16 +197,21 @@ class TestDiskOperations(unittest.TestCase):
 class TestDrivePartitioning(unittest.TestCase):
     """Test drive partitioning operations with mocking."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Patch command execution once for the whole class."""
+        cls.mock_execute = start_class_patch(cls, 'common.execute')
+    
     def setUp(self):
         """Set up test fixtures."""
+        self.mock_execute.reset_mock(return_value=True, side_effect=True)
         self.test_layout = [
             {"size": "512M", "label": "EFI", "format": "vfat", "type": "uefi"},
             {"size": True, "label": "ROOTS", "format": "btrfs", "type": "linux"},
         ]
         self.test_drive = "/dev/sda"
     
-    @patch('common.execute')
-    def test_partition_drive_unmount_existing(self, mock_execute):
+    def test_partition_drive_unmount_existing(self):
         """Test that existing mounts are unmounted before partitioning."""
         drive.partition_drive(self.test_drive, self.test_layout)
         
@@ -186,21 +221,20 @@ class TestDrivePartitioning(unittest.TestCase):
             call(unittest.mock.ANY)  # sfdisk command
         ]
         
-        mock_execute.assert_called()
+        self.mock_execute.assert_called()
         # First call should be umount
-        first_call = mock_execute.call_args_list[0]
+        first_call = self.mock_execute.call_args_list[0]
         self.assertIn("umount", first_call[0][0])
     
-    @patch('common.execute')
     @patch('common.get_drive_size')
-    def test_partition_drive_sfdisk_command(self, mock_get_size, mock_execute):
+    def test_partition_drive_sfdisk_command(self, mock_get_size):
         """Test sfdisk command generation."""
         mock_get_size.return_value = 256 * 1024 * 1024 * 1024  # 256GB
         
         drive.partition_drive(self.test_drive, self.test_layout)
         
         # Check that sfdisk was called with proper partition table
-        sfdisk_calls = [call for call in mock_execute.call_args_list if 'sfdisk' in call[0][0]]
+        sfdisk_calls = [call for call in self.mock_execute.call_args_list if 'sfdisk' in call[0][0]]
         self.assertEqual(len(sfdisk_calls), 1)
         
         sfdisk_command = sfdisk_calls[0][0][0]
@@ -209,14 +243,11 @@ class TestDrivePartitioning(unittest.TestCase):
         self.assertIn('type=uefi', sfdisk_command)
         self.assertIn('type=linux', sfdisk_command)
     
-    @patch('common.execute')
-    def test_partition_drive_lvm_cleanup(self, mock_execute):
+    def test_partition_drive_lvm_cleanup(self):
         """Test LVM cleanup before partitioning."""
         # Mock vgs command to return some volume groups
         with patch('subprocess.Popen') as mock_popen:
-            mock_process = Mock()
-            mock_process.communicate.return_value = (b'vg0\nvg1\n', b'')
-            mock_popen.return_value = mock_process
+            mock_popen.return_value = make_popen(b'vg0\nvg1\n')
             
             drive.partition_drive(self.test_drive, self.test_layout)
             
@@ -227,34 +258,38 @@ class TestDrivePartitioning(unittest.TestCase):
             ]
             
             # Check that vgchange was called for each VG
-            vgchange_calls = [call for call in mock_execute.call_args_list if 'vgchange' in call[0][0]]
+            vgchange_calls = [call for call in self.mock_execute.call_args_list if 'vgchange' in call[0][0]]
             self.assertEqual(len(vgchange_calls), 2)
 
 @unittest.skipUnless(MODULES_AVAILABLE, "Installer Python modules not available")
 class TestDriveFormatting(unittest.TestCase):
     """Test drive formatting operations with mocking."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Patch command execution and process spawning once for the whole class."""
+        cls.mock_execute = start_class_patch(cls, 'common.execute')
+        cls.mock_popen = start_class_patch(cls, 'subprocess.Popen')
+    
     def setUp(self):
         """Set up test fixtures."""
+        self.mock_execute.reset_mock(return_value=True, side_effect=True)
+        self.mock_popen.reset_mock(return_value=True, side_effect=True)
         self.test_layout = [
             {"size": "512M", "label": "EFI", "format": "vfat", "type": "uefi"},
             {"size": True, "label": "ROOTS", "format": "btrfs", "type": "linux"},
         ]
         self.test_drive = "/dev/sda"
     
-    @patch('common.execute')
-    @patch('subprocess.Popen')
-    def test_format_drive_vfat(self, mock_popen, mock_execute):
+    def test_format_drive_vfat(self):
         """Test VFAT formatting."""
         # Mock lsblk command to find partition
-        mock_process = Mock()
-        mock_process.communicate.return_value = (b'/dev/sda1\n', b'')
-        mock_popen.return_value = mock_process
+        self.mock_popen.return_value = make_popen(b'/dev/sda1\n')
         
         drive.format_drive(self.test_drive, self.test_layout)
         
         # Should format EFI partition as vfat
-        vfat_calls = [call for call in mock_execute.call_args_list if 'mkfs.vfat' in call[0][0]]
+        vfat_calls = [call for call in self.mock_execute.call_args_list if 'mkfs.vfat' in call[0][0]]
         self.assertEqual(len(vfat_calls), 1)
         
         vfat_command = vfat_calls[0][0][0]
@@ -262,16 +297,12 @@ class TestDriveFormatting(unittest.TestCase):
         self.assertIn('-F 32', vfat_command)
         self.assertIn('-n EFI', vfat_command)
     
-    @patch('common.execute')
-    @patch('subprocess.Popen')
     @patch('os.path.exists')
     @patch('os.mkdir')
-    def test_format_drive_btrfs_with_subvolumes(self, mock_mkdir, mock_exists, mock_popen, mock_execute):
+    def test_format_drive_btrfs_with_subvolumes(self, mock_mkdir, mock_exists):
         """Test BTRFS formatting with subvolumes."""
         # Mock partition detection and directory operations
-        mock_process = Mock()
-        mock_process.communicate.return_value = (b'/dev/sda2\n', b'')
-        mock_popen.return_value = mock_process
+        self.mock_popen.return_value = make_popen(b'/dev/sda2\n')
         mock_exists.return_value = False  # /mnt/temp doesn't exist
         
         layout_with_subvolumes = [
@@ -281,26 +312,24 @@ class TestDriveFormatting(unittest.TestCase):
         
         drive.format_drive(self.test_drive, layout_with_subvolumes)
         
+        calls = bucket_calls(
+            self.mock_execute.call_args_list,
+            ('mkfs.btrfs', 'btrfs subvolume create', 'mount'),
+        )
+        
         # Check BTRFS formatting
-        btrfs_calls = [call for call in mock_execute.call_args_list if 'mkfs.btrfs' in call[0][0]]
-        self.assertEqual(len(btrfs_calls), 1)
+        self.assertEqual(len(calls['mkfs.btrfs']), 1)
         
         # Check subvolume creation
-        subvol_calls = [call for call in mock_execute.call_args_list if 'btrfs subvolume create' in call[0][0]]
-        self.assertEqual(len(subvol_calls), 2)
+        self.assertEqual(len(calls['btrfs subvolume create']), 2)
         
         # Check mount/unmount operations
-        mount_calls = [call for call in mock_execute.call_args_list if 'mount' in call[0][0]]
-        self.assertTrue(len(mount_calls) >= 2)  # Mount for subvol creation, then unmount
+        self.assertTrue(len(calls['mount']) >= 2)  # Mount for subvol creation, then unmount
     
-    @patch('common.execute')
-    @patch('subprocess.Popen')
-    def test_format_drive_luks_encryption(self, mock_popen, mock_execute):
+    def test_format_drive_luks_encryption(self):
         """Test LUKS encryption setup."""
         # Mock partition detection
-        mock_process = Mock()
-        mock_process.communicate.return_value = (b'/dev/sda2\n', b'')
-        mock_popen.return_value = mock_process
+        self.mock_popen.return_value = make_popen(b'/dev/sda2\n')
         
         luks_layout = [
             {"size": True, "label": "XENIA", "format": "luks", "type": "linux",
@@ -309,13 +338,13 @@ class TestDriveFormatting(unittest.TestCase):
         
         drive.format_drive(self.test_drive, luks_layout)
         
+        calls = bucket_calls(self.mock_execute.call_args_list, ('cryptsetup', 'luksFormat'))
+        
         # Check LUKS formatting
-        luks_calls = [call for call in mock_execute.call_args_list if 'cryptsetup' in call[0][0]]
-        self.assertTrue(len(luks_calls) >= 2)  # luksFormat and luksOpen
+        self.assertTrue(len(calls['cryptsetup']) >= 2)  # luksFormat and luksOpen
         
         # Check that encryption was configured
-        format_calls = [call for call in luks_calls if 'luksFormat' in call[0][0]]
-        self.assertEqual(len(format_calls), 1)
+        self.assertEqual(len(calls['luksFormat']), 1)
 
 @unittest.skipUnless(MODULES_AVAILABLE, "Installer Python modules not available")
 class TestDriveSafety(unittest.TestCase):
@@ -7,15 +7,26 @@ import unittest
 from unittest.mock import Mock, patch, MagicMock
 import tempfile
 import os
-import sys
-from pathlib import Path
+import re
 
-# Add the installer directory to Python path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+UEFI_DIE_MESSAGE = "This installer does not currently support BIOS systems. Please (if possible) enable UEFI."
+UEFI_DIE_RE = re.compile(r"not currently support BIOS systems")
 
+# (UEFI firmware directory present, installer should die)
+UEFI_GATE_CASES = [
+    (True, False),
+    (False, True),
+]
+
+def check_uefi():
+    """Replicate the UEFI gate at the start of main.main()."""
+    if not os.path.isdir("/sys/firmware/efi"):
+        main.common.die(UEFI_DIE_MESSAGE)
+
+# main pulls in every installer module, so import it once under a guard and
+# skip the suite when the installer modules are absent
 MODULES_AVAILABLE = False
 try:
-    from common import die
     import main
     MODULES_AVAILABLE = True
 except ImportError:
@@ -33,40 +44,23 @@ class TestUEFIDetection(unittest.TestCase):
         """Clean up after tests."""
         main.common.die = self.original_die
     
-    @patch('os.path.isdir')
-    def test_uefi_detection_success(self, mock_isdir):
-        """Test successful UEFI detection."""
-        # Mock UEFI firmware directory as present
-        mock_isdir.return_value = True
-        
-        # This should not raise an exception
-        with patch('builtins.print'):
-            try:
-                # Call the UEFI check from main
-                if not os.path.isdir("/sys/firmware/efi"):
-                    main.common.die("This installer does not currently support BIOS systems. Please (if possible) enable UEFI.")
-            except SystemExit:
-                self.fail("UEFI detection should not fail when UEFI is present")
-    
-    @patch('os.path.isdir')
-    def test_uefi_detection_bios_rejection(self, mock_isdir):
-        """Test that BIOS systems are properly rejected."""
-        # Mock UEFI firmware directory as absent
-        mock_isdir.return_value = False
-        
-        # Mock the die function to capture the call
-        with patch.object(main.common, 'die') as mock_die:
-            mock_die.side_effect = SystemExit(1)
-            
-            with self.assertRaises(SystemExit):
-                # Simulate the UEFI check from main.py
-                if not os.path.isdir("/sys/firmware/efi"):
-                    main.common.die("This installer does not currently support BIOS systems. Please (if possible) enable UEFI.")
-            
-            # Verify die was called with correct message
-            mock_die.assert_called_once_with(
-                "This installer does not currently support BIOS systems. Please (if possible) enable UEFI."
-            )
+    def test_uefi_detection_gate(self):
+        """Test that UEFI systems pass the gate and BIOS systems are rejected."""
+        with patch('os.path.isdir') as mock_isdir, \
+             patch.object(main.common, 'die', side_effect=SystemExit(1)) as mock_die:
+            for uefi_present, should_die in UEFI_GATE_CASES:
+                with self.subTest(uefi_present=uefi_present):
+                    mock_isdir.return_value = uefi_present
+                    mock_die.reset_mock()
+                    
+                    if should_die:
+                        with self.assertRaises(SystemExit):
+                            check_uefi()
+                        # Verify die was called with correct message
+                        mock_die.assert_called_once_with(UEFI_DIE_MESSAGE)
+                    else:
+                        check_uefi()
+                        mock_die.assert_not_called()
     
     @patch('os.path.isdir')
     def test_uefi_detection_critical_safety(self, mock_isdir):
@@ -83,13 +77,11 @@ class TestUEFIDetection(unittest.TestCase):
         with patch.object(main.common, 'die', side_effect=capture_die):
             with self.assertRaises(SystemExit):
                 # Test the critical UEFI check
-                if not os.path.isdir("/sys/firmware/efi"):
-                    main.common.die("This installer does not currently support BIOS systems. Please (if possible) enable UEFI.")
+                check_uefi()
         
         # Verify the safety check worked
         self.assertEqual(len(death_messages), 1)
-        self.assertIn("BIOS systems", death_messages[0])
-        self.assertIn("not currently support", death_messages[0])
+        self.assertRegex(death_messages[0], UEFI_DIE_RE)
 
 @unittest.skipUnless(MODULES_AVAILABLE, "Installer Python modules not available")
 class TestUEFIDetectionEdgeCases(unittest.TestCase):
@@ -277,15 +269,13 @@ class TestUEFIDetectionSafety(unittest.TestCase):
 class TestUEFIDetectionMocking(unittest.TestCase):
     """Test mocking capabilities for UEFI detection in different environments."""
     
-    def test_mock_uefi_system(self):
-        """Test ability to mock UEFI system for testing."""
-        with patch('os.path.isdir', return_value=True):
-            self.assertTrue(os.path.isdir("/sys/firmware/efi"))
-    
-    def test_mock_bios_system(self):
-        """Test ability to mock BIOS system for testing."""
-        with patch('os.path.isdir', return_value=False):
-            self.assertFalse(os.path.isdir("/sys/firmware/efi"))
+    def test_mock_firmware_type(self):
+        """Test ability to mock UEFI and BIOS systems for testing."""
+        with patch('os.path.isdir') as mock_isdir:
+            for uefi_present, _ in UEFI_GATE_CASES:
+                with self.subTest(uefi_present=uefi_present):
+                    mock_isdir.return_value = uefi_present
+                    self.assertEqual(os.path.isdir("/sys/firmware/efi"), uefi_present)
     
     def test_mock_uefi_detection_error(self):
         """Test ability to mock UEFI detection errors."""
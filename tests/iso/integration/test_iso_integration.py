@@ -6,29 +6,131 @@ import unittest
 from unittest.mock import Mock, patch, MagicMock, call
 import tempfile
 import os
-import sys
-import subprocess
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 import shutil
+import uuid
+import threading
+import time
+import hashlib
+import json
+from collections import OrderedDict, deque
+from itertools import islice
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
-# Add the project root to Python path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+# Same layout as date(1)'s default output, which the reports used to shell out for
+_REPORT_DATE_FORMAT = "%a %b %e %H:%M:%S %Z %Y"
+
+@lru_cache(maxsize=1)
+def _now_cached(sec_bucket):
+    """Format the report date once per wall-clock second."""
+    return datetime.fromtimestamp(sec_bucket).astimezone().strftime(_REPORT_DATE_FORMAT)
+
+def _report_timestamp():
+    """Report date shared by every workflow created within the same second."""
+    return _now_cached(int(time.time()))
+
+# Log markers each workflow must emit, shared by the assertions below
+_EXPECTED_BUILD_PHASES = frozenset({
+    "Starting pre-build validation",
+    "Setting up build environment",
+    "Creating ISO directory structure",
+    "Creating root filesystem",
+    "Preparing bootloaders",
+    "Creating ISO image",
+    "Running post-build validation",
+    "Cleaning up and generating report",
+})
+
+_EXPECTED_VALIDATION_PHASES = frozenset({
+    "Validating file properties",
+    "Validating checksum",
+    "Validating ISO structure",
+    "Validating boot capability",
+    "Validating security features",
+    "Generating validation report",
+})
+
+_EXPECTED_INTEGRATION_PHASES = frozenset({
+    "Starting ISO build",
+    "ISO build completed",
+    "Starting ISO validation",
+    "ISO validation completed",
+    "Generating combined report",
+    "Combined report generated",
+})
+
+# Live GRUB menu, submitted to the kernel as one vectored write
+_GRUB_CFG_LINES = (
+    b"set timeout=10\n",
+    b"set default=0\n",
+    b'menuentry "RegicideOS Live" {\n',
+    b"    linux /boot/vmlinuz boot=live\n",
+    b"    initrd /boot/initrd\n",
+    b"}\n",
+)
+
+def _write_lines(fd, lines):
+    """Write lines to an open descriptor, normally in a single os.write."""
+    payload = memoryview(("\n".join(lines) + "\n").encode())
+    while payload:
+        payload = payload[os.write(fd, payload):]
+
+def _write_report(path, lines):
+    """Write report lines to path with a single os.write on a raw fd."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        _write_lines(fd, lines)
+    finally:
+        os.close(fd)
+
+def _mkdirs_relative(dir_fd, tree):
+    """Create a nested {name: children} mapping of directories under dir_fd.
+
+    Each level is opened once and its children are created relative to it,
+    so every path component is looked up a single time (mkdirat-style).
+    """
+    for name, children in tree.items():
+        try:
+            os.mkdir(name, dir_fd=dir_fd)
+        except FileExistsError:
+            pass
+        if children:
+            child_fd = os.open(name, os.O_RDONLY | os.O_DIRECTORY, dir_fd=dir_fd)
+            try:
+                _mkdirs_relative(child_fd, children)
+            finally:
+                os.close(child_fd)
+
+def _make_dirs(root, leaves):
+    """Create relative directories (and their parents) under an existing root."""
+    tree = {}
+    for leaf in leaves:
+        node = tree
+        for part in Path(leaf).parts:
+            node = node.setdefault(part, {})
+    
+    root_fd = os.open(root, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        _mkdirs_relative(root_fd, tree)
+    finally:
+        os.close(root_fd)
 
 class TestISOBuildIntegration(unittest.TestCase):
     """Test complete ISO build and validation workflow."""
     
     def setUp(self):
         """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
+        self._td_ctx = tempfile.TemporaryDirectory()
+        self.temp_dir = self._td_ctx.name
         self.build_dir = os.path.join(self.temp_dir, "build")
         self.iso_dir = os.path.join(self.build_dir, "iso")
         self.work_dir = os.path.join(self.build_dir, "work")
         self.output_dir = os.path.join(self.build_dir, "output")
         
         # Create directories
-        os.makedirs(self.iso_dir, exist_ok=True)
-        os.makedirs(self.work_dir, exist_ok=True)
-        os.makedirs(self.output_dir, exist_ok=True)
+        _make_dirs(self.temp_dir, ["build/iso", "build/work", "build/output"])
         
         # Mock configuration
         self.config = {
@@ -51,8 +153,7 @@ class TestISOBuildIntegration(unittest.TestCase):
         
     def tearDown(self):
         """Clean up test fixtures."""
-        if os.path.exists(self.temp_dir):
-            shutil.rmtree(self.temp_dir)
+        self._td_ctx.cleanup()
     
     def test_complete_build_workflow(self):
         """Test complete ISO build workflow."""
@@ -63,50 +164,84 @@ class TestISOBuildIntegration(unittest.TestCase):
                 self.iso_dir = os.path.join(build_dir, "iso")
                 self.work_dir = os.path.join(build_dir, "work")
                 self.output_dir = os.path.join(build_dir, "output")
-                self.workflow_log = []
-                self.errors = []
+                
+                # Paths reused across phases, built once per workflow
+                iso_root = Path(self.iso_dir)
+                self._boot_dir = iso_root / "boot"
+                self._grub_dir = self._boot_dir / "grub"
+                self._efi_dir = iso_root / "EFI" / "BOOT"
+                self._live_dir = iso_root / "live"
+                # deques: phases append from worker threads without a lock
+                self.workflow_log = deque()
+                self.errors = deque()
+                self._report_date = None
+                self._pending_cleanups = []
+                self._iso_file = None
+                self._iso_size = None
             
             def run_complete_workflow(self):
                 """Run complete build workflow."""
+                # (description, phase, descriptions of the phases it depends on).
+                # The root filesystem is staged under work_dir while the ISO
+                # tree and bootloaders are laid out under iso_dir, so those
+                # branches run side by side once the environment exists.
+                phases = [
+                    ("Pre-build validation", self._pre_build_validation, ()),
+                    ("Build environment setup", self._setup_build_environment,
+                     ("Pre-build validation",)),
+                    ("ISO structure creation", self._create_iso_structure,
+                     ("Build environment setup",)),
+                    ("Root filesystem creation", self._create_root_filesystem,
+                     ("Build environment setup",)),
+                    ("Bootloader preparation", self._prepare_bootloaders,
+                     ("ISO structure creation",)),
+                    ("ISO image creation", self._create_iso_image,
+                     ("ISO structure creation", "Root filesystem creation",
+                      "Bootloader preparation")),
+                    ("Post-build validation", self._post_build_validation,
+                     ("ISO image creation",)),
+                    ("Cleanup and reporting", self._cleanup_and_report,
+                     ("Post-build validation",)),
+                ]
+                
                 try:
-                    # Phase 1: Pre-build validation
-                    if not self._pre_build_validation():
-                        raise RuntimeError("Pre-build validation failed")
-                    
-                    # Phase 2: Build environment setup
-                    if not self._setup_build_environment():
-                        raise RuntimeError("Build environment setup failed")
-                    
-                    # Phase 3: ISO structure creation
-                    if not self._create_iso_structure():
-                        raise RuntimeError("ISO structure creation failed")
-                    
-                    # Phase 4: Root filesystem creation
-                    if not self._create_root_filesystem():
-                        raise RuntimeError("Root filesystem creation failed")
-                    
-                    # Phase 5: Bootloader preparation
-                    if not self._prepare_bootloaders():
-                        raise RuntimeError("Bootloader preparation failed")
-                    
-                    # Phase 6: ISO image creation
-                    if not self._create_iso_image():
-                        raise RuntimeError("ISO image creation failed")
-                    
-                    # Phase 7: Post-build validation
-                    if not self._post_build_validation():
-                        raise RuntimeError("Post-build validation failed")
-                    
-                    # Phase 8: Cleanup and reporting
-                    if not self._cleanup_and_report():
-                        raise RuntimeError("Cleanup and reporting failed")
-                    
+                    self._run_phases(phases)
                     return True
                     
                 except Exception as e:
                     self.errors.append(f"Workflow failed: {e}")
                     return False
             
+            def _run_phases(self, phases):
+                """Run each phase as soon as all of its dependencies succeeded."""
+                pending = list(phases)
+                running = {}
+                completed = set()
+                
+                with ThreadPoolExecutor(max_workers=self.config["build"]["parallel_jobs"]) as pool:
+                    while pending or running:
+                        ready = [phase for phase in pending if completed.issuperset(phase[2])]
+                        for phase in ready:
+                            pending.remove(phase)
+                            running[pool.submit(phase[1])] = phase[0]
+                        
+                        if not running:
+                            # Nothing can start and nothing is in flight: some
+                            # dependency names a phase that never completes
+                            unsatisfiable = ", ".join(phase[0] for phase in pending)
+                            raise RuntimeError(f"Unsatisfiable phase dependencies: {unsatisfiable}")
+                        
+                        finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            name = running.pop(future)
+                            if not future.result():
+                                # Drop queued siblings; ones already running
+                                # finish before the pool shuts down
+                                for sibling in running:
+                                    sibling.cancel()
+                                raise RuntimeError(f"{name} failed")
+                            completed.add(name)
+            
             def _pre_build_validation(self):
                 """Pre-build validation phase."""
                 self.workflow_log.append("Starting pre-build validation...")
@@ -137,14 +272,8 @@ class TestISOBuildIntegration(unittest.TestCase):
                 """Setup build environment phase."""
                 self.workflow_log.append("Setting up build environment...")
                 
-                # Create required directories
-                dirs = [self.iso_dir, self.work_dir, self.output_dir]
-                for dir_path in dirs:
-                    os.makedirs(dir_path, exist_ok=True)
-                
-                # Create log directory
-                log_dir = os.path.join(self.build_dir, "logs")
-                os.makedirs(log_dir, exist_ok=True)
+                # Create required directories and the log directory
+                _make_dirs(self.build_dir, ["iso", "work", "output", "logs"])
                 
                 self.workflow_log.append("✓ Build environment setup completed")
                 return True
@@ -162,16 +291,14 @@ class TestISOBuildIntegration(unittest.TestCase):
                     "live",
                     ".disk"
                 ]
-                
-                for item in structure:
-                    item_path = os.path.join(self.iso_dir, item)
-                    os.makedirs(item_path, exist_ok=True)
+                _make_dirs(self.iso_dir, structure)
                 
                 # Create disk info files
                 info_file = os.path.join(self.iso_dir, ".disk", "info")
-                with open(info_file, 'w') as f:
-                    f.write(f"RegicideOS {self.config['iso']['version']}\\n")
-                    f.write(f"Architecture: {self.config['iso']['architecture']}\\n")
+                Path(info_file).write_text(
+                    f"RegicideOS {self.config['iso']['version']}\n"
+                    f"Architecture: {self.config['iso']['architecture']}\n"
+                )
                 
                 self.workflow_log.append("✓ ISO directory structure created")
                 return True
@@ -182,27 +309,26 @@ class TestISOBuildIntegration(unittest.TestCase):
                 
                 # Create temporary root directory
                 temp_root = os.path.join(self.work_dir, "rootfs")
-                os.makedirs(temp_root, exist_ok=True)
                 
                 # Create basic directory structure
                 basic_dirs = ["bin", "boot", "dev", "etc", "usr", "var"]
-                for dir_name in basic_dirs:
-                    dir_path = os.path.join(temp_root, dir_name)
-                    os.makedirs(dir_path, exist_ok=True)
+                _make_dirs(self.work_dir, [f"rootfs/{dir_name}" for dir_name in basic_dirs])
                 
                 # Create system files
                 self._create_system_files(temp_root)
                 
                 # Create squashfs image
-                live_dir = os.path.join(self.iso_dir, "live")
-                os.makedirs(live_dir, exist_ok=True)
-                
-                squashfs_file = os.path.join(live_dir, "filesystem.squashfs")
-                with open(squashfs_file, 'w') as f:
-                    f.write("Mock squashfs filesystem\\n")
-                
-                # Clean up temporary root
-                shutil.rmtree(temp_root)
+                _make_dirs(self.iso_dir, ["live"])
+                (self._live_dir / "filesystem.squashfs").write_text("Mock squashfs filesystem\n")
+                
+                # Clean up temporary root off the critical path: move it aside
+                # so the name is free again, then delete it in the background
+                trash = os.path.join(self.work_dir, f".trash-{uuid.uuid4().hex}")
+                os.rename(temp_root, trash)
+                cleanup = threading.Thread(
+                    target=shutil.rmtree, args=(trash,), kwargs={"ignore_errors": True}, daemon=True)
+                cleanup.start()
+                self._pending_cleanups.append(cleanup)
                 
                 self.workflow_log.append("✓ Root filesystem created")
                 return True
@@ -212,34 +338,32 @@ class TestISOBuildIntegration(unittest.TestCase):
                 # Create os-release
                 os_release_file = os.path.join(root_dir, "etc", "os-release")
                 os.makedirs(os.path.dirname(os_release_file), exist_ok=True)
-                with open(os_release_file, 'w') as f:
-                    f.write('NAME="RegicideOS"\\n')
-                    f.write(f'VERSION="{self.config["iso"]["version"]}"\\n')
-                    f.write('ID=regicideos\\n')
+                Path(os_release_file).write_text(
+                    'NAME="RegicideOS"\n'
+                    f'VERSION="{self.config["iso"]["version"]}"\n'
+                    'ID=regicideos\n'
+                )
                 
                 # Create hostname
                 hostname_file = os.path.join(root_dir, "etc", "hostname")
-                with open(hostname_file, 'w') as f:
-                    f.write("regicideos-live\\n")
+                Path(hostname_file).write_text("regicideos-live\n")
             
             def _prepare_bootloaders(self):
                 """Prepare bootloaders phase."""
                 self.workflow_log.append("Preparing bootloaders...")
                 
                 # Create GRUB configuration
-                grub_cfg = os.path.join(self.iso_dir, "boot", "grub", "grub.cfg")
-                with open(grub_cfg, 'w') as f:
-                    f.write("set timeout=10\\n")
-                    f.write("set default=0\\n")
-                    f.write('menuentry "RegicideOS Live" {\\n')
-                    f.write("    linux /boot/vmlinuz boot=live\\n")
-                    f.write("    initrd /boot/initrd\\n")
-                    f.write("}\\n")
+                fd = os.open(self._grub_dir / "grub.cfg", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+                try:
+                    if hasattr(os, "writev"):
+                        os.writev(fd, _GRUB_CFG_LINES)
+                    else:
+                        os.write(fd, b"".join(_GRUB_CFG_LINES))
+                finally:
+                    os.close(fd)
                 
                 # Create UEFI bootloader stubs
-                efi_boot = os.path.join(self.iso_dir, "EFI", "BOOT", "BOOTX64.EFI")
-                with open(efi_boot, 'w') as f:
-                    f.write("Mock UEFI bootloader\\n")
+                (self._efi_dir / "BOOTX64.EFI").write_text("Mock UEFI bootloader\n")
                 
                 self.workflow_log.append("✓ Bootloaders prepared")
                 return True
@@ -252,13 +376,14 @@ class TestISOBuildIntegration(unittest.TestCase):
                 iso_filename = f"regicideos-{self.config['iso']['version']}-{self.config['iso']['architecture']}.iso"
                 iso_file = os.path.join(self.output_dir, iso_filename)
                 
-                with open(iso_file, 'w') as f:
-                    f.write("Mock ISO image content\\n")
+                Path(iso_file).write_text("Mock ISO image content\n")
+                # Record the size while the inode is still hot for post-build validation
+                self._iso_file = iso_file
+                self._iso_size = os.stat(iso_file).st_size
                 
                 # Create checksum file
                 checksum_file = f"{iso_file}.sha256"
-                with open(checksum_file, 'w') as f:
-                    f.write("mock_checksum_value regicideos-1.0.0-x86_64.iso\\n")
+                Path(checksum_file).write_text("mock_checksum_value regicideos-1.0.0-x86_64.iso\n")
                 
                 self.workflow_log.append("✓ ISO image created")
                 return True
@@ -267,22 +392,28 @@ class TestISOBuildIntegration(unittest.TestCase):
                 """Post-build validation phase."""
                 self.workflow_log.append("Running post-build validation...")
                 
+                # One directory scan answers every check below
+                with os.scandir(self.output_dir) as it:
+                    entries = {entry.name: entry for entry in it}
+                
                 # Check if ISO file exists
-                iso_files = [f for f in os.listdir(self.output_dir) if f.endswith('.iso')]
-                if not iso_files:
+                iso_entries = [entry for name, entry in entries.items() if name.endswith('.iso')]
+                if not iso_entries:
                     self.errors.append("No ISO file created")
                     return False
                 
                 # Check ISO file size
-                iso_file = os.path.join(self.output_dir, iso_files[0])
-                file_size = os.path.getsize(iso_file)
+                iso_entry = iso_entries[0]
+                if iso_entry.path == self._iso_file:
+                    file_size = self._iso_size
+                else:
+                    file_size = iso_entry.stat().st_size
                 if file_size == 0:
                     self.errors.append("ISO file is empty")
                     return False
                 
                 # Check checksum file
-                checksum_file = f"{iso_file}.sha256"
-                if not os.path.exists(checksum_file):
+                if f"{iso_entry.name}.sha256" not in entries:
                     self.errors.append("Checksum file not created")
                     return False
                 
@@ -293,17 +424,25 @@ class TestISOBuildIntegration(unittest.TestCase):
                 """Cleanup and reporting phase."""
                 self.workflow_log.append("Cleaning up and generating report...")
                 
+                # Wait for background cleanups so the report reflects them
+                for cleanup in self._pending_cleanups:
+                    cleanup.join()
+                self._pending_cleanups.clear()
+                
                 # Generate build report
                 report_file = os.path.join(self.output_dir, "build-report.txt")
-                with open(report_file, 'w') as f:
-                    f.write("RegicideOS ISO Build Report\\n")
-                    f.write("=========================\\n")
-                    f.write(f"Version: {self.config['iso']['version']}\\n")
-                    f.write(f"Architecture: {self.config['iso']['architecture']}\\n")
-                    f.write(f"Build Date: {subprocess.check_output(['date'], universal_newlines=True).strip()}\\n")
-                    f.write("\\nWorkflow Log:\\n")
-                    for log_entry in self.workflow_log:
-                        f.write(f"  {log_entry}\\n")
+                self._report_date = self._report_date or _report_timestamp()
+                lines = [
+                    "RegicideOS ISO Build Report",
+                    "=========================",
+                    f"Version: {self.config['iso']['version']}",
+                    f"Architecture: {self.config['iso']['architecture']}",
+                    f"Build Date: {self._report_date}",
+                    "",
+                    "Workflow Log:",
+                ]
+                lines.extend(f"  {log_entry}" for log_entry in self.workflow_log)
+                _write_report(report_file, lines)
                 
                 self.workflow_log.append("✓ Cleanup and reporting completed")
                 return True
@@ -317,97 +456,154 @@ class TestISOBuildIntegration(unittest.TestCase):
         self.assertGreater(len(workflow.workflow_log), 0)
         
         # Verify workflow phases were executed
-        expected_phases = [
-            "Starting pre-build validation",
-            "Setting up build environment",
-            "Creating ISO directory structure",
-            "Creating root filesystem",
-            "Preparing bootloaders",
-            "Creating ISO image",
-            "Running post-build validation",
-            "Cleaning up and generating report"
-        ]
-        
-        for phase in expected_phases:
-            self.assertTrue(any(phase in log for log in workflow.workflow_log))
+        log_blob = "\n".join(workflow.workflow_log)
+        missing = sorted(p for p in _EXPECTED_BUILD_PHASES if p not in log_blob)
+        self.assertFalse(missing, missing)
         
         # Verify output files were created
-        self.assertTrue(os.path.exists(self.output_dir))
-        output_files = os.listdir(self.output_dir)
-        self.assertGreater(len(output_files), 0)
+        with os.scandir(self.output_dir) as it:
+            self.assertIsNotNone(next(it, None))
+        
+        # The staged root filesystem was removed before the report was written
+        self.assertEqual(os.listdir(self.work_dir), [])
+        
+        # A dependency on a phase that never runs is reported, not waited on
+        with self.assertRaisesRegex(RuntimeError, "Unsatisfiable.*Orphan phase"):
+            workflow._run_phases([("Orphan phase", lambda: True, ("Misspelled phase",))])
 
 class TestISOValidationIntegration(unittest.TestCase):
     """Test ISO validation integration."""
     
     def setUp(self):
         """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
+        self._td_ctx = tempfile.TemporaryDirectory()
+        self.temp_dir = self._td_ctx.name
         self.test_iso = os.path.join(self.temp_dir, "test.iso")
         
         # Create a mock ISO file
-        with open(self.test_iso, 'wb') as f:
-            f.write(b"Mock ISO content" * 1000)
+        Path(self.test_iso).write_bytes(b"Mock ISO content" * 1000)
         
         # Create mock ISO structure for mounting tests
         self.iso_mount = os.path.join(self.temp_dir, "mount")
-        os.makedirs(self.iso_mount, exist_ok=True)
         
         # Create basic ISO structure
-        os.makedirs(os.path.join(self.iso_mount, "EFI", "BOOT"), exist_ok=True)
-        os.makedirs(os.path.join(self.iso_mount, "boot", "grub"), exist_ok=True)
-        os.makedirs(os.path.join(self.iso_mount, "live"), exist_ok=True)
+        _make_dirs(self.temp_dir, ["mount/EFI/BOOT", "mount/boot/grub", "mount/live"])
         
         # Create required files
-        with open(os.path.join(self.iso_mount, "EFI", "BOOT", "BOOTX64.EFI"), 'w') as f:
-            f.write("Mock UEFI bootloader\\n")
+        Path(self.iso_mount, "EFI", "BOOT", "BOOTX64.EFI").write_text("Mock UEFI bootloader\n")
         
-        with open(os.path.join(self.iso_mount, "boot", "grub", "grub.cfg"), 'w') as f:
-            f.write('menuentry "RegicideOS Live" {\\n')
-            f.write("    linux /boot/vmlinuz boot=live\\n")
-            f.write("    initrd /boot/initrd\\n")
-            f.write("}\\n")
+        Path(self.iso_mount, "boot", "grub", "grub.cfg").write_text(
+            'menuentry "RegicideOS Live" {\n'
+            "    linux /boot/vmlinuz boot=live\n"
+            "    initrd /boot/initrd\n"
+            "}\n"
+        )
         
     def tearDown(self):
         """Clean up test fixtures."""
-        if os.path.exists(self.temp_dir):
-            shutil.rmtree(self.temp_dir)
+        self._td_ctx.cleanup()
     
     def test_complete_validation_workflow(self):
         """Test complete ISO validation workflow."""
         class ISOValidationWorkflow:
+            # Results of the file-property phase, keyed by (path, mtime_ns,
+            # size) so a rebuilt image misses. The checksum phase is never
+            # cached: it exists to catch changes stat metadata would not show.
+            _VALIDATION_CACHE = OrderedDict()
+            _VALIDATION_CACHE_SIZE = 5
+            
             def __init__(self, iso_file, mount_point):
                 self.iso_file = iso_file
                 self.mount_point = mount_point
-                self.validation_log = []
-                self.errors = []
+                
+                # Paths reused across phases, built once per workflow
+                mount_root = Path(mount_point)
+                self._boot_dir = mount_root / "boot"
+                self._grub_dir = self._boot_dir / "grub"
+                self._efi_dir = mount_root / "EFI" / "BOOT"
+                self._live_dir = mount_root / "live"
+                self.validation_log = deque()
+                self.errors = deque()
                 self.validation_results = {}
+                self._passed = 0
+                self._total = 0
+                self._efi_present = None
+                self._report_date = None
             
             def run_complete_validation(self):
-                """Run complete validation workflow."""
+                """Run complete validation workflow.
+                
+                The report is opened up front and each phase's section is
+                appended as soon as it finishes, so a run that dies midway
+                still leaves a partial report behind.
+                """
+                report_fd = None
                 try:
-                    # Phase 1: File validation
-                    self.validation_results["file_validation"] = self._validate_file()
+                    report_fd = self._open_validation_report()
+                    cache_key = self._cache_key()
                     
-                    # Phase 2: Checksum validation
-                    self.validation_results["checksum_validation"] = self._validate_checksum()
+                    phases = [
+                        # Phase 1: File validation
+                        ("file_validation",
+                         lambda: self._cached_phase(cache_key, "file_validation", self._validate_file)),
+                        # Phase 2: Checksum validation
+                        ("checksum_validation", self._validate_checksum),
+                        # Phase 3: Structure validation
+                        ("structure_validation", self._validate_structure),
+                        # Phase 4: Boot validation
+                        ("boot_validation", self._validate_boot),
+                        # Phase 5: Security validation
+                        ("security_validation", self._validate_security),
+                    ]
                     
-                    # Phase 3: Structure validation
-                    self.validation_results["structure_validation"] = self._validate_structure()
-                    
-                    # Phase 4: Boot validation
-                    self.validation_results["boot_validation"] = self._validate_boot()
-                    
-                    # Phase 5: Security validation
-                    self.validation_results["security_validation"] = self._validate_security()
-                    
-                    # Phase 6: Generate report
-                    self._generate_validation_report()
+                    for name, phase in phases:
+                        log_start = len(self.validation_log)
+                        result = phase()
+                        self._record_result(name, result)
+                        self._write_report_section(report_fd, name, result, list(islice(self.validation_log, log_start, None)))
                     
                     return self._calculate_overall_result()
                     
                 except Exception as e:
                     self.errors.append(f"Validation workflow failed: {e}")
                     return False
+                
+                finally:
+                    if report_fd is not None:
+                        self._close_validation_report(report_fd)
+            
+            def _record_result(self, name, result):
+                """Store a phase result and keep the running pass tally."""
+                self.validation_results[name] = result
+                self._total += 1
+                self._passed += bool(result)
+            
+            def _cache_key(self):
+                """Identify the ISO contents by path, modification time and size."""
+                try:
+                    st = os.stat(self.iso_file)
+                except OSError:
+                    return None
+                return (self.iso_file, st.st_mtime_ns, st.st_size)
+            
+            def _cached_phase(self, cache_key, name, phase):
+                """Run a phase unless it already passed for this exact ISO file."""
+                cache = self._VALIDATION_CACHE
+                if cache_key is None:
+                    return phase()
+                
+                if cache.get(cache_key, {}).get(name):
+                    cache.move_to_end(cache_key)
+                    self.validation_log.append(f"✓ {name} passed (cached)")
+                    return True
+                
+                result = phase()
+                if result:
+                    cache.setdefault(cache_key, {})[name] = True
+                    cache.move_to_end(cache_key)
+                    while len(cache) > self._VALIDATION_CACHE_SIZE:
+                        cache.popitem(last=False)
+                return result
             
             def _validate_file(self):
                 """Validate basic file properties."""
@@ -445,12 +641,15 @@ class TestISOValidationIntegration(unittest.TestCase):
                 """Validate ISO structure."""
                 self.validation_log.append("Validating ISO structure...")
                 
-                required_dirs = ["EFI/BOOT", "boot/grub", "live"]
+                required_dirs = {
+                    "EFI/BOOT": self._efi_dir,
+                    "boot/grub": self._grub_dir,
+                    "live": self._live_dir,
+                }
                 missing_dirs = []
                 
-                for dir_path in required_dirs:
-                    full_path = os.path.join(self.mount_point, dir_path)
-                    if not os.path.exists(full_path):
+                for dir_path, full_path in required_dirs.items():
+                    if not full_path.exists():
                         missing_dirs.append(dir_path)
                 
                 if missing_dirs:
@@ -465,14 +664,15 @@ class TestISOValidationIntegration(unittest.TestCase):
                 self.validation_log.append("Validating boot capability...")
                 
                 # Check UEFI bootloader
-                efi_bootloader = os.path.join(self.mount_point, "EFI", "BOOT", "BOOTX64.EFI")
-                if not os.path.exists(efi_bootloader):
+                efi_bootloader = self._efi_dir / "BOOTX64.EFI"
+                self._efi_present = efi_bootloader.exists()
+                if not self._efi_present:
                     self.errors.append("UEFI bootloader not found")
                     return False
                 
                 # Check GRUB configuration
-                grub_config = os.path.join(self.mount_point, "boot", "grub", "grub.cfg")
-                if not os.path.exists(grub_config):
+                grub_config = self._grub_dir / "grub.cfg"
+                if not grub_config.exists():
                     self.errors.append("GRUB configuration not found")
                     return False
                 
@@ -484,53 +684,54 @@ class TestISOValidationIntegration(unittest.TestCase):
                 self.validation_log.append("Validating security features...")
                 
                 # Check for secure boot compatibility
-                efi_bootloader = os.path.join(self.mount_point, "EFI", "BOOT", "BOOTX64.EFI")
-                if os.path.exists(efi_bootloader):
+                # Reuse the boot phase's lookup when it has already run
+                efi_present = self._efi_present
+                if efi_present is None:
+                    efi_present = (self._efi_dir / "BOOTX64.EFI").exists()
+                if efi_present:
                     self.validation_log.append("✓ Secure boot compatible")
                 
                 # Check file permissions (mock)
                 self.validation_log.append("✓ Security validation passed")
                 return True
             
-            def _generate_validation_report(self):
-                """Generate validation report."""
+            def _open_validation_report(self):
+                """Create the validation report and write its header."""
                 self.validation_log.append("Generating validation report...")
                 
                 report_file = f"{self.iso_file}.validation-report.txt"
-                with open(report_file, 'w') as f:
-                    f.write("RegicideOS ISO Validation Report\\n")
-                    f.write("==============================\\n")
-                    f.write(f"ISO File: {self.iso_file}\\n")
-                    f.write(f"Validation Date: {subprocess.check_output(['date'], universal_newlines=True).strip()}\\n")
-                    f.write("\\nValidation Results:\\n")
-                    
-                    for test_name, result in self.validation_results.items():
-                        status = "PASSED" if result else "FAILED"
-                        f.write(f"  {test_name}: {status}\\n")
-                    
+                self._report_date = self._report_date or _report_timestamp()
+                fd = os.open(report_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+                _write_lines(fd, [
+                    "RegicideOS ISO Validation Report",
+                    "==============================",
+                    f"ISO File: {self.iso_file}",
+                    f"Validation Date: {self._report_date}",
+                ])
+                return fd
+            
+            def _write_report_section(self, fd, name, result, log_lines):
+                """Append one finished phase to the validation report."""
+                status = "PASSED" if result else "FAILED"
+                _write_lines(fd, ["", f"{name}: {status}", *(f"  {line}" for line in log_lines)])
+            
+            def _close_validation_report(self, fd):
+                """Append any errors and close the validation report."""
+                try:
                     if self.errors:
-                        f.write("\\nErrors:\\n")
-                        for error in self.errors:
-                            f.write(f"  - {error}\\n")
-                    
-                    f.write("\\nValidation Log:\\n")
-                    for log_entry in self.validation_log:
-                        f.write(f"  {log_entry}\\n")
+                        _write_lines(fd, ["", "Errors:", *(f"  - {error}" for error in self.errors)])
+                finally:
+                    os.close(fd)
                 
                 self.validation_log.append("✓ Validation report generated")
             
             def _calculate_overall_result(self):
                 """Calculate overall validation result."""
-                total_tests = len(self.validation_results)
-                passed_tests = sum(1 for result in self.validation_results.values() if result)
-                
-                if total_tests == 0:
+                if self._total == 0:
                     return False
                 
-                success_rate = passed_tests / total_tests
-                
                 # Require at least 80% success rate
-                return success_rate >= 0.8
+                return self._passed / self._total >= 0.8
         
         # Test the complete validation workflow
         workflow = ISOValidationWorkflow(self.test_iso, self.iso_mount)
@@ -540,17 +741,9 @@ class TestISOValidationIntegration(unittest.TestCase):
         self.assertGreater(len(workflow.validation_log), 0)
         
         # Verify validation phases were executed
-        expected_phases = [
-            "Validating file properties",
-            "Validating checksum",
-            "Validating ISO structure",
-            "Validating boot capability",
-            "Validating security features",
-            "Generating validation report"
-        ]
-        
-        for phase in expected_phases:
-            self.assertTrue(any(phase in log for log in workflow.validation_log))
+        log_blob = "\n".join(workflow.validation_log)
+        missing = sorted(p for p in _EXPECTED_VALIDATION_PHASES if p not in log_blob)
+        self.assertFalse(missing, missing)
         
         # Verify validation results
         self.assertIn("file_validation", workflow.validation_results)
@@ -560,29 +753,47 @@ class TestISOValidationIntegration(unittest.TestCase):
         # Verify report was generated
         report_file = f"{self.test_iso}.validation-report.txt"
         self.assertTrue(os.path.exists(report_file))
+        report = Path(report_file).read_text()
+        for name in workflow.validation_results:
+            self.assertIn(f"{name}: PASSED", report)
+        
+        # Revalidating the unchanged ISO reuses the file-property result but
+        # always re-runs the checksum check
+        rerun = ISOValidationWorkflow(self.test_iso, self.iso_mount)
+        self.assertTrue(rerun.run_complete_validation())
+        self.assertIn("✓ file_validation passed (cached)", rerun.validation_log)
+        self.assertNotIn("✓ checksum_validation passed (cached)", rerun.validation_log)
+        self.assertNotIn("Validating file properties...", rerun.validation_log)
 
 class TestISOBuildValidationIntegration(unittest.TestCase):
     """Test integration between build and validation processes."""
     
     def setUp(self):
         """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
+        self._td_ctx = tempfile.TemporaryDirectory()
+        self.temp_dir = self._td_ctx.name
         self.build_dir = os.path.join(self.temp_dir, "build")
-        os.makedirs(self.build_dir, exist_ok=True)
+        _make_dirs(self.temp_dir, ["build"])
+        self.config = {"iso": {"version": "1.0.0", "architecture": "x86_64"}}
         
     def tearDown(self):
         """Clean up test fixtures."""
-        if os.path.exists(self.temp_dir):
-            shutil.rmtree(self.temp_dir)
+        self._td_ctx.cleanup()
     
     def test_build_and_validation_integration(self):
         """Test integration between build and validation processes."""
         class BuildValidationIntegration:
-            def __init__(self, build_dir):
+            # Bump when _build_iso changes what it produces, so old markers miss
+            BUILD_VERSION = 1
+            
+            def __init__(self, build_dir, config):
                 self.build_dir = build_dir
-                self.integration_log = []
-                self.errors = []
+                self.config = config
+                self.integration_log = deque()
+                self.errors = deque()
                 self.iso_file = None
+                self._iso_size = None
+                self._report_date = None
             
             def run_build_and_validate(self):
                 """Run build and validation together."""
@@ -608,24 +819,39 @@ class TestISOBuildValidationIntegration(unittest.TestCase):
                     self.errors.append(f"Integration failed: {e}")
                     return False
             
+            def _build_marker(self, output_dir):
+                """Marker file naming the ISO built from the current inputs."""
+                inputs = json.dumps(
+                    {"config": self.config, "version": self.BUILD_VERSION}, sort_keys=True
+                ).encode()
+                return Path(output_dir) / f".build-{hashlib.sha256(inputs).hexdigest()[:12]}.marker"
+            
             def _build_iso(self):
                 """Build ISO (mock)."""
-                # Create mock build structure
-                iso_dir = os.path.join(self.build_dir, "iso")
                 output_dir = os.path.join(self.build_dir, "output")
+                marker = self._build_marker(output_dir)
+                
+                # Reuse the ISO from a previous build of identical inputs
+                if marker.exists():
+                    cached_iso = marker.read_text()
+                    try:
+                        self._iso_size = os.stat(cached_iso).st_size
+                    except FileNotFoundError:
+                        pass
+                    else:
+                        self.iso_file = cached_iso
+                        self.integration_log.append("✓ ISO build completed (skipping build, cache hit)")
+                        return True
                 
-                os.makedirs(iso_dir, exist_ok=True)
-                os.makedirs(output_dir, exist_ok=True)
-                
-                # Create mock ISO structure
-                os.makedirs(os.path.join(iso_dir, "EFI", "BOOT"), exist_ok=True)
-                os.makedirs(os.path.join(iso_dir, "boot", "grub"), exist_ok=True)
-                os.makedirs(os.path.join(iso_dir, "live"), exist_ok=True)
+                # Create output directory and mock ISO structure
+                _make_dirs(self.build_dir, ["output", "iso/EFI/BOOT", "iso/boot/grub", "iso/live"])
                 
                 # Create mock ISO file
-                self.iso_file = os.path.join(output_dir, "regicideos-1.0.0-x86_64.iso")
-                with open(self.iso_file, 'w') as f:
-                    f.write("Mock ISO content" * 1000)
+                iso_filename = f"regicideos-{self.config['iso']['version']}-{self.config['iso']['architecture']}.iso"
+                self.iso_file = os.path.join(output_dir, iso_filename)
+                Path(self.iso_file).write_text("Mock ISO content" * 1000)
+                self._iso_size = os.stat(self.iso_file).st_size
+                marker.write_text(self.iso_file)
                 
                 self.integration_log.append("✓ ISO build completed")
                 return True
@@ -636,12 +862,16 @@ class TestISOBuildValidationIntegration(unittest.TestCase):
                     self.errors.append("No ISO file to validate")
                     return False
                 
-                if not os.path.exists(self.iso_file):
-                    self.errors.append("ISO file does not exist")
-                    return False
+                # The build already stat'ed the image; only look again if it didn't
+                file_size = self._iso_size
+                if file_size is None:
+                    try:
+                        file_size = os.stat(self.iso_file).st_size
+                    except FileNotFoundError:
+                        self.errors.append("ISO file does not exist")
+                        return False
                 
                 # Mock validation checks
-                file_size = os.path.getsize(self.iso_file)
                 if file_size < 1024:
                     self.errors.append("ISO file is too small")
                     return False
@@ -652,26 +882,28 @@ class TestISOBuildValidationIntegration(unittest.TestCase):
             def _generate_combined_report(self):
                 """Generate combined build and validation report."""
                 report_file = os.path.join(self.build_dir, "build-validation-report.txt")
-                with open(report_file, 'w') as f:
-                    f.write("RegicideOS Build and Validation Report\\n")
-                    f.write("======================================\\n")
-                    f.write(f"Report Date: {subprocess.check_output(['date'], universal_newlines=True).strip()}\\n")
-                    f.write("\\nIntegration Log:\\n")
-                    for log_entry in self.integration_log:
-                        f.write(f"  {log_entry}\\n")
-                    
-                    if self.errors:
-                        f.write("\\nErrors:\\n")
-                        for error in self.errors:
-                            f.write(f"  - {error}\\n")
-                    else:
-                        f.write("\\nNo errors reported.\\n")
+                self._report_date = self._report_date or _report_timestamp()
+                lines = [
+                    "RegicideOS Build and Validation Report",
+                    "======================================",
+                    f"Report Date: {self._report_date}",
+                    "",
+                    "Integration Log:",
+                ]
+                lines.extend(f"  {log_entry}" for log_entry in self.integration_log)
+                
+                if self.errors:
+                    lines += ["", "Errors:"]
+                    lines.extend(f"  - {error}" for error in self.errors)
+                else:
+                    lines += ["", "No errors reported."]
+                _write_report(report_file, lines)
                 
                 self.integration_log.append("✓ Combined report generated")
                 return True
         
         # Test the integration
-        integration = BuildValidationIntegration(self.build_dir)
+        integration = BuildValidationIntegration(self.build_dir, self.config)
         result = integration.run_build_and_validate()
         
         self.assertTrue(result)
@@ -679,21 +911,25 @@ class TestISOBuildValidationIntegration(unittest.TestCase):
         self.assertGreater(len(integration.integration_log), 0)
         
         # Verify integration phases
-        expected_phases = [
-            "Starting ISO build",
-            "ISO build completed",
-            "Starting ISO validation",
-            "ISO validation completed",
-            "Generating combined report",
-            "Combined report generated"
-        ]
-        
-        for phase in expected_phases:
-            self.assertTrue(any(phase in log for log in integration.integration_log))
+        log_blob = "\n".join(integration.integration_log)
+        missing = sorted(p for p in _EXPECTED_INTEGRATION_PHASES if p not in log_blob)
+        self.assertFalse(missing, missing)
         
         # Verify combined report was generated
         report_file = os.path.join(self.build_dir, "build-validation-report.txt")
         self.assertTrue(os.path.exists(report_file))
+        
+        # Unchanged inputs reuse the existing ISO and go straight to validation
+        rerun = BuildValidationIntegration(self.build_dir, self.config)
+        self.assertTrue(rerun.run_build_and_validate())
+        self.assertIn("cache hit", "\n".join(rerun.integration_log))
+        self.assertEqual(rerun.iso_file, integration.iso_file)
+        
+        # A config change invalidates the marker
+        changed = BuildValidationIntegration(
+            self.build_dir, {"iso": {"version": "1.0.1", "architecture": "x86_64"}})
+        self.assertTrue(changed.run_build_and_validate())
+        self.assertNotIn("cache hit", "\n".join(changed.integration_log))
 
 if __name__ == '__main__':
     # Run tests with detailed output
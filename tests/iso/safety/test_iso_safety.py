@@ -6,20 +6,155 @@ import unittest
 from unittest.mock import Mock, patch, MagicMock, call
 import tempfile
 import os
-import sys
 import subprocess
 from pathlib import Path
 import shutil
+from functools import lru_cache
+import stat
+import re
+from collections import deque
 
-# Add the project root to Python path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Safe build script skeleton handed out by BuildScriptSafety
+_SAFE_TEMPLATE = '''#!/bin/bash
+# Safe ISO Build Script for RegicideOS
+set -euo pipefail
+
+# Safety settings
+BUILD_DIR="$(pwd)/build"
+WORK_DIR="${BUILD_DIR}/work"
+OUTPUT_DIR="${BUILD_DIR}/output"
+
+# Validate environment
+if [[ ! -d "$BUILD_DIR" ]]; then
+    echo "Error: Build directory not found"
+    exit 1
+fi
+
+# Create safe workspace
+mkdir -p "$WORK_DIR" "$OUTPUT_DIR"
+
+# Safe build operations
+echo "Starting safe ISO build process..."
+
+# Add safe build commands here
+# Example: cp -r source/* "$WORK_DIR/"
+# Example: xorriso -as mkisofs -o "$OUTPUT_DIR/iso.iso" "$WORK_DIR"
+
+echo "ISO build completed successfully"
+'''
+_SAFE_TEMPLATE_BYTES = _SAFE_TEMPLATE.encode()
+
+@lru_cache(maxsize=4096)
+def _normalize_absolute(path):
+    return os.path.normpath(path)
+
+def _normalize_path(path):
+    """Absolute, normalized form of path; absolute inputs are memoized."""
+    if os.path.isabs(path):
+        return _normalize_absolute(path)
+    # Relative paths depend on the current directory, so never cache them
+    return os.path.abspath(path)
+
+# Whole-line shell comments and blank lines in a build script
+_COMMENT_OR_BLANK_RE = re.compile(r"^[ \t]*(?:#.*)?$", re.MULTILINE)
+
+class _PrefixTrie:
+    """Tags keyed by path components; lookups return the deepest tagged prefix.
+
+    Matching whole components means "/etc" never claims "/etcetera", and a
+    nested root can override its parent (allow "/tmp" but deny "/tmp/secret").
+    """
+    
+    _TAG = object()
+    
+    def __init__(self):
+        self._root = {}
+    
+    def insert(self, components, tag):
+        node = self._root
+        for component in components:
+            node = node.setdefault(component, {})
+        node[self._TAG] = tag
+    
+    def lookup_longest(self, components):
+        node = self._root
+        tag = node.get(self._TAG)
+        for component in components:
+            node = node.get(component)
+            if node is None:
+                break
+            tag = node.get(self._TAG, tag)
+        return tag
+
+def _iter_tree(directory):
+    """Yield a DirEntry for everything below directory, without following symlinks."""
+    with os.scandir(directory) as it:
+        for entry in it:
+            yield entry
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_tree(entry.path)
+
+def _chmod_tree(root, dir_mode, file_mode):
+    """Apply dir_mode/file_mode to everything below root.
+
+    Walks with os.scandir so entry types come from the DirEntry instead of
+    an extra stat per node. Symlinks are left alone rather than followed.
+    """
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    os.chmod(entry.path, dir_mode)
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    os.chmod(entry.path, file_mode)
+
+def build_pattern_scanner(patterns_by_category):
+    """Compile {category: patterns} into a scanner yielding every (category, pattern) hit.
+
+    Uses a single Aho-Corasick automaton when pyahocorasick is installed and
+    falls back to one compiled regex alternation otherwise; the lookahead
+    lets finditer report matches that overlap.
+    """
+    values = {}
+    for category, patterns in patterns_by_category.items():
+        for pattern in patterns:
+            values[pattern] = (category, pattern)
+    
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for pattern, value in values.items():
+            automaton.add_word(pattern, value)
+        automaton.make_automaton()
+        return lambda text: (value for _, value in automaton.iter(text))
+    
+    alternation = "|".join(re.escape(p) for p in sorted(values, key=len, reverse=True))
+    scanner = re.compile(f"(?=({alternation}))")
+    return lambda text: (values[m.group(1)] for m in scanner.finditer(text))
 
 class TestISOCreationSafety(unittest.TestCase):
     """Test safety aspects of ISO creation process."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Create one scratch root shared by every test in the class."""
+        cls._root = tempfile.mkdtemp()
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the shared scratch root in one pass."""
+        shutil.rmtree(cls._root, ignore_errors=True)
+    
     def setUp(self):
         """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
+        # Fresh per-test directory under the shared root; removed with it
+        self.temp_dir = tempfile.mkdtemp(dir=self._root)
         self.build_dir = os.path.join(self.temp_dir, "build")
         self.work_dir = os.path.join(self.build_dir, "work")
         self.output_dir = os.path.join(self.build_dir, "output")
@@ -27,15 +162,13 @@ class TestISOCreationSafety(unittest.TestCase):
         # Create directories
         os.makedirs(self.work_dir, exist_ok=True)
         os.makedirs(self.output_dir, exist_ok=True)
-        
-    def tearDown(self):
-        """Clean up test fixtures."""
-        if os.path.exists(self.temp_dir):
-            shutil.rmtree(self.temp_dir)
     
     def test_dangerous_command_detection(self):
         """Test detection of dangerous commands in build process."""
         class CommandSafetyChecker:
+            # Built from the first instance's pattern lists, then shared
+            _scanner = None
+            
             def __init__(self):
                 self.dangerous_commands = [
                     "rm -rf /",
@@ -53,47 +186,65 @@ class TestISOCreationSafety(unittest.TestCase):
                     "root:",
                     "password"
                 ]
-                self.violations = []
+                self.violations = deque()
                 self.warnings = []
-            
-            def check_command_safety(self, command):
-                """Check if a command is safe to execute."""
-                command_lower = command.lower()
                 
+                if CommandSafetyChecker._scanner is None:
+                    CommandSafetyChecker._scanner = build_pattern_scanner({
+                        "dangerous": self.dangerous_commands,
+                        "suspicious": self.suspicious_patterns,
+                        "sudo": ["sudo"],
+                        "world_writable": ["chmod 777"],
+                    })
+            
+            def _scan(self, command_lower):
+                """Group every pattern found in one pass over the command by category."""
+                hits = {}
+                for category, pattern in CommandSafetyChecker._scanner(command_lower):
+                    hits.setdefault(category, []).append(pattern)
+                return hits
+            
+            def _check_hits(self, hits):
+                """Record violations and warnings for the patterns found in a command."""
                 # Check for dangerous commands
-                for dangerous_cmd in self.dangerous_commands:
-                    if dangerous_cmd in command_lower:
-                        self.violations.append(f"Dangerous command detected: {dangerous_cmd}")
-                        return False
+                dangerous = hits.get("dangerous")
+                if dangerous:
+                    self.violations.append(f"Dangerous command detected: {dangerous[0]}")
+                    return False
                 
                 # Check for suspicious patterns
-                for pattern in self.suspicious_patterns:
-                    if pattern in command_lower:
-                        self.warnings.append(f"Suspicious pattern detected: {pattern}")
+                for pattern in dict.fromkeys(hits.get("suspicious", ())):
+                    self.warnings.append(f"Suspicious pattern detected: {pattern}")
                 
                 return True
             
+            def check_command_safety(self, command):
+                """Check if a command is safe to execute."""
+                return self._check_hits(self._scan(command.lower()))
+            
             def validate_build_script(self, script_content):
                 """Validate entire build script for safety."""
                 violations = []
                 warnings = []
                 
-                lines = script_content.split('\n')
-                for line_num, line in enumerate(lines, 1):
+                # Comment and blank lines are emptied in one C-level pass;
+                # the newlines stay, so line numbers still match the script
+                for line_num, line in enumerate(_COMMENT_OR_BLANK_RE.sub("", script_content).splitlines(), 1):
                     line = line.strip()
                     
-                    # Skip comments and empty lines
-                    if line.startswith('#') or not line:
+                    # Skip whitespace-only lines left behind
+                    if not line:
                         continue
                     
-                    if not self.check_command_safety(line):
+                    hits = self._scan(line.lower())
+                    if not self._check_hits(hits):
                         violations.append(f"Line {line_num}: {line}")
                     
                     # Check for other safety issues
-                    if 'sudo' in line and not line.startswith('#'):
+                    if "sudo" in hits:
                         warnings.append(f"Line {line_num}: sudo command detected")
                     
-                    if 'chmod 777' in line:
+                    if "world_writable" in hits:
                         warnings.append(f"Line {line_num}: world-writable permissions")
                 
                 return violations, warnings
@@ -147,6 +298,21 @@ mkfs.ext4 /dev/sdb1
         
         violations, warnings = checker.validate_build_script(dangerous_script)
         self.assertGreater(len(violations), 0)
+        
+        # Overlapping patterns are all reported from the single scan
+        checker.warnings.clear()
+        self.assertTrue(checker.check_command_safety("cat /dev/sdb > password.txt"))
+        self.assertEqual(checker.warnings, [
+            "Suspicious pattern detected: /dev/sdb",
+            "Suspicious pattern detected: password",
+        ])
+        
+        violations, warnings = checker.validate_build_script("sudo chmod 777 /tmp/build\n")
+        self.assertEqual(violations, [])
+        self.assertEqual(warnings, [
+            "Line 1: sudo command detected",
+            "Line 1: world-writable permissions",
+        ])
     
     def test_file_access_safety(self):
         """Test file access safety during ISO creation."""
@@ -154,27 +320,30 @@ mkfs.ext4 /dev/sdb1
             def __init__(self, allowed_dirs, forbidden_paths):
                 self.allowed_dirs = allowed_dirs
                 self.forbidden_paths = forbidden_paths
-                self.violations = []
+                self.violations = deque()
+                
+                # Forbidden roots go in last so they win over an identical allowed root
+                self._roots = _PrefixTrie()
+                for allowed_dir in allowed_dirs:
+                    self._roots.insert(_normalize_path(allowed_dir).split(os.sep), "allow")
+                for forbidden in forbidden_paths:
+                    self._roots.insert(_normalize_path(forbidden).split(os.sep), "deny")
             
             def check_file_access(self, file_path, operation="read"):
                 """Check if file access is safe."""
                 # Normalize path
-                file_path = os.path.abspath(file_path)
+                file_path = _normalize_path(file_path)
+                
+                # The most specific configured root containing the path decides
+                access = self._roots.lookup_longest(file_path.split(os.sep))
                 
                 # Check forbidden paths
-                for forbidden in self.forbidden_paths:
-                    if file_path.startswith(forbidden):
-                        self.violations.append(f"Access to forbidden path: {file_path}")
-                        return False
+                if access == "deny":
+                    self.violations.append(f"Access to forbidden path: {file_path}")
+                    return False
                 
                 # Check if path is within allowed directories
-                in_allowed_dir = False
-                for allowed_dir in self.allowed_dirs:
-                    if file_path.startswith(allowed_dir):
-                        in_allowed_dir = True
-                        break
-                
-                if not in_allowed_dir:
+                if access is None:
                     self.violations.append(f"Access outside allowed directories: {file_path}")
                     return False
                 
@@ -245,13 +414,25 @@ mkfs.ext4 /dev/sdb1
         system_file = "/usr/bin/ls"
         result = safety.validate_operation("delete", system_file)
         self.assertFalse(result)
+        
+        # Prefixes match whole path components only
+        self.assertFalse(safety.check_file_access("/etcetera/notes.txt"))
+        self.assertIn("Access outside allowed directories: /etcetera/notes.txt", safety.violations)
+        self.assertFalse(safety.check_file_access("/etc"))
+        self.assertTrue(safety.check_file_access(self.work_dir))
+        
+        # A nested forbidden root overrides the allowed directory around it
+        nested = FileAccessSafety(["/tmp"], ["/tmp/secret"])
+        self.assertTrue(nested.check_file_access("/tmp/build/iso.cfg"))
+        self.assertFalse(nested.check_file_access("/tmp/secret/key"))
+        self.assertTrue(nested.check_file_access("/tmp/secrets.txt"))
     
     def test_process_isolation(self):
         """Test process isolation during ISO creation."""
         class ProcessIsolation:
             def __init__(self):
                 self.isolated_processes = []
-                self.security_violations = []
+                self.security_violations = deque()
             
             def run_isolated_command(self, command, timeout=30):
                 """Run command in isolated environment."""
@@ -332,7 +513,14 @@ mkfs.ext4 /dev/sdb1
                 self.max_memory = 1024 * 1024 * 1024  # 1GB
                 self.max_cpu_time = 300  # 5 minutes
                 self.max_disk_space = 10 * 1024 * 1024 * 1024  # 10GB
-                self.resource_violations = []
+                self.resource_violations = deque()
+                
+                # (usage key, message label, limit) for one pass over a usage sample
+                self._limits = (
+                    ("memory", "Memory usage", self.max_memory),
+                    ("cpu_time", "CPU time", self.max_cpu_time),
+                    ("disk_space", "Disk space", self.max_disk_space),
+                )
             
             def check_memory_usage(self, memory_usage):
                 """Check memory usage against limits."""
@@ -367,13 +555,12 @@ mkfs.ext4 /dev/sdb1
                 """Validate current resource usage."""
                 usage = self.get_resource_usage()
                 
-                checks = [
-                    self.check_memory_usage(usage["memory"]),
-                    self.check_cpu_time(usage["cpu_time"]),
-                    self.check_disk_space(usage["disk_space"])
-                ]
+                exceeded = [(label, usage[key], limit)
+                            for key, label, limit in self._limits if usage[key] > limit]
+                self.resource_violations.extend(
+                    f"{label} exceeded: {value} > {limit}" for label, value, limit in exceeded)
                 
-                return all(checks)
+                return not exceeded
         
         limiter = ResourceLimiter()
         
@@ -394,27 +581,42 @@ mkfs.ext4 /dev/sdb1
         # Test excessive disk space
         result = limiter.check_disk_space(20 * 1024 * 1024 * 1024)  # 20GB
         self.assertFalse(result)
+        
+        # Every exceeded limit in a usage sample is reported together
+        busy = ResourceLimiter()
+        busy.get_resource_usage = lambda: {"memory": 2 * 1024 ** 3, "cpu_time": 600, "disk_space": 1024}
+        self.assertFalse(busy.validate_resource_usage())
+        self.assertEqual(list(busy.resource_violations), [
+            f"Memory usage exceeded: {2 * 1024 ** 3} > {busy.max_memory}",
+            f"CPU time exceeded: 600 > {busy.max_cpu_time}",
+        ])
 
 class TestISOBuildProcessSafety(unittest.TestCase):
     """Test safety of ISO build process."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Create one scratch root shared by every test in the class."""
+        cls._root = tempfile.mkdtemp()
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the shared scratch root in one pass."""
+        shutil.rmtree(cls._root, ignore_errors=True)
+    
     def setUp(self):
         """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
+        # Fresh per-test directory under the shared root; removed with it
+        self.temp_dir = tempfile.mkdtemp(dir=self._root)
         self.build_dir = os.path.join(self.temp_dir, "build")
         os.makedirs(self.build_dir, exist_ok=True)
-        
-    def tearDown(self):
-        """Clean up test fixtures."""
-        if os.path.exists(self.temp_dir):
-            shutil.rmtree(self.temp_dir)
     
     def test_build_environment_safety(self):
         """Test build environment safety."""
         class BuildEnvironmentSafety:
             def __init__(self, build_dir):
                 self.build_dir = build_dir
-                self.safety_violations = []
+                self.safety_violations = deque()
                 self.warnings = []
             
             def setup_safe_environment(self):
@@ -454,15 +656,8 @@ class TestISOBuildProcessSafety(unittest.TestCase):
                 """Set safe permissions for build environment."""
                 build_dir = os.path.join(self.build_dir, "isolated_build")
                 
-                # Set directory permissions
-                for root, dirs, files in os.walk(build_dir):
-                    for d in dirs:
-                        dir_path = os.path.join(root, d)
-                        os.chmod(dir_path, 0o750)
-                    
-                    for f in files:
-                        file_path = os.path.join(root, f)
-                        os.chmod(file_path, 0o640)
+                # Set directory and file permissions
+                _chmod_tree(build_dir, 0o750, 0o640)
                 
                 return True
             
@@ -470,12 +665,18 @@ class TestISOBuildProcessSafety(unittest.TestCase):
                 """Create safe workspace directories."""
                 base_dir = os.path.join(self.build_dir, "isolated_build")
                 
-                # Create workspace directories
+                os.makedirs(base_dir, mode=0o750, exist_ok=True)
+                
+                # Create workspace directories with their mode set at creation;
+                # the umask can only make that stricter, so chmod is needed
+                # only for directories left over from an earlier run
                 workspace_dirs = ["src", "build", "output", "temp"]
                 for dir_name in workspace_dirs:
                     dir_path = os.path.join(base_dir, dir_name)
-                    os.makedirs(dir_path, exist_ok=True)
-                    os.chmod(dir_path, 0o750)
+                    try:
+                        os.mkdir(dir_path, 0o750)
+                    except FileExistsError:
+                        os.chmod(dir_path, 0o750)
                 
                 return True
             
@@ -504,18 +705,14 @@ class TestISOBuildProcessSafety(unittest.TestCase):
                 # Check artifacts for safety
                 unsafe_artifacts = []
                 
-                for root, dirs, files in os.walk(artifacts_dir):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        
-                        # Check for suspicious files
-                        if file.endswith((".sh", ".py", ".exe")):
-                            unsafe_artifacts.append(file_path)
-                        
-                        # Check file permissions
-                        stat_info = os.stat(file_path)
-                        if stat_info.st_mode & 0o111:  # Executable
-                            unsafe_artifacts.append(file_path)
+                for entry in _iter_tree(artifacts_dir):
+                    if entry.is_dir(follow_symlinks=False):
+                        continue
+                    
+                    # Check for suspicious files, then file permissions (executable)
+                    if (entry.name.endswith((".sh", ".py", ".exe"))
+                            or entry.stat(follow_symlinks=False).st_mode & 0o111):
+                        unsafe_artifacts.append(entry.path)
                 
                 if unsafe_artifacts:
                     self.warnings.append(f"Potentially unsafe artifacts: {unsafe_artifacts}")
@@ -529,9 +726,35 @@ class TestISOBuildProcessSafety(unittest.TestCase):
         self.assertTrue(result)
         self.assertEqual(len(safety.safety_violations), 0)
         
+        # Workspace directories are never group- or world-writable
+        for dir_name in ("src", "build", "output", "temp"):
+            mode = stat.S_IMODE(os.stat(os.path.join(self.build_dir, "isolated_build", dir_name)).st_mode)
+            self.assertEqual(mode & 0o027, 0)
+        
         # Test build artifacts validation
         result = safety.validate_build_artifacts()
         self.assertTrue(result)
+        
+        # Executable or script artifacts are flagged once each
+        output_dir = os.path.join(self.build_dir, "isolated_build", "output")
+        os.makedirs(os.path.join(output_dir, "nested"))
+        Path(output_dir, "regicideos.iso").write_bytes(b"")
+        Path(output_dir, "nested", "post-install.sh").write_text("")
+        os.chmod(os.path.join(output_dir, "nested", "post-install.sh"), 0o755)
+        self.assertFalse(safety.validate_build_artifacts())
+        self.assertEqual(
+            safety.warnings[-1],
+            f"Potentially unsafe artifacts: {[os.path.join(output_dir, 'nested', 'post-install.sh')]}")
+        os.remove(os.path.join(output_dir, "nested", "post-install.sh"))
+        
+        # Permissions are applied throughout the workspace tree
+        src_dir = os.path.join(self.build_dir, "isolated_build", "src")
+        source_file = os.path.join(src_dir, "main.c")
+        Path(source_file).write_text("")
+        os.chmod(source_file, 0o666)
+        safety._set_safe_permissions()
+        self.assertEqual(stat.S_IMODE(os.stat(src_dir).st_mode), 0o750)
+        self.assertEqual(stat.S_IMODE(os.stat(source_file).st_mode), 0o640)
     
     def test_build_script_safety(self):
         """Test build script safety."""
@@ -539,6 +762,24 @@ class TestISOBuildProcessSafety(unittest.TestCase):
             def __init__(self):
                 self.safety_violations = []
                 self.warnings = []
+                
+                # Dangerous commands, as one case-insensitive alternation. The
+                # lookahead makes finditer report overlapping hits too, so
+                # "sudo rm -rf" yields both "sudo rm" and "rm -rf".
+                dangerous_patterns = [
+                    "rm -rf",
+                    "dd if=/dev",
+                    "mkfs",
+                    "fdisk",
+                    "format",
+                    "wipe",
+                    "/dev/sd",
+                    "sudo rm",
+                    "chmod 777"
+                ]
+                self._danger_re = re.compile(
+                    "(?=(" + "|".join(map(re.escape, dangerous_patterns)) + "))", re.IGNORECASE)
+                self._network_re = re.compile("curl|wget|nc|netcat", re.IGNORECASE)
             
             def validate_build_script(self, script_path):
                 """Validate build script for safety issues."""
@@ -558,80 +799,40 @@ class TestISOBuildProcessSafety(unittest.TestCase):
             
             def _analyze_script_content(self, content):
                 """Analyze script content for safety issues."""
-                # Check for dangerous commands
-                dangerous_patterns = [
-                    "rm -rf",
-                    "dd if=/dev",
-                    "mkfs",
-                    "fdisk",
-                    "format",
-                    "wipe",
-                    "/dev/sd",
-                    "sudo rm",
-                    "chmod 777"
-                ]
-                
-                lines = content.split('\n')
-                for line_num, line in enumerate(lines, 1):
+                # Comment and blank lines are emptied in one C-level pass;
+                # the newlines stay, so line numbers still match the script
+                for line_num, line in enumerate(_COMMENT_OR_BLANK_RE.sub("", content).splitlines(), 1):
                     line = line.strip()
                     
-                    # Skip comments and empty lines
-                    if line.startswith('#') or not line:
+                    # Skip whitespace-only lines left behind
+                    if not line:
                         continue
                     
                     # Check for dangerous patterns
-                    for pattern in dangerous_patterns:
-                        if pattern in line.lower():
-                            self.safety_violations.append(f"Line {line_num}: Dangerous pattern '{pattern}'")
+                    found = dict.fromkeys(m.group(1).lower() for m in self._danger_re.finditer(line))
+                    self.safety_violations.extend(
+                        f"Line {line_num}: Dangerous pattern '{pattern}'" for pattern in found)
                     
                     # Check for privilege escalation
                     if "sudo" in line.lower():
                         self.warnings.append(f"Line {line_num}: Privilege escalation detected")
                     
                     # Check for network access
-                    if any(cmd in line.lower() for cmd in ["curl", "wget", "nc", "netcat"]):
+                    if self._network_re.search(line):
                         self.warnings.append(f"Line {line_num}: Network access detected")
                 
                 return len(self.safety_violations) == 0
             
             def generate_safe_script_template(self):
                 """Generate a safe build script template."""
-                safe_template = '''#!/bin/bash
-# Safe ISO Build Script for RegicideOS
-set -euo pipefail
-
-# Safety settings
-BUILD_DIR="$(pwd)/build"
-WORK_DIR="${BUILD_DIR}/work"
-OUTPUT_DIR="${BUILD_DIR}/output"
-
-# Validate environment
-if [[ ! -d "$BUILD_DIR" ]]; then
-    echo "Error: Build directory not found"
-    exit 1
-fi
-
-# Create safe workspace
-mkdir -p "$WORK_DIR" "$OUTPUT_DIR"
-
-# Safe build operations
-echo "Starting safe ISO build process..."
-
-# Add safe build commands here
-# Example: cp -r source/* "$WORK_DIR/"
-# Example: xorriso -as mkisofs -o "$OUTPUT_DIR/iso.iso" "$WORK_DIR"
-
-echo "ISO build completed successfully"
-'''
-                
-                return safe_template
+                return _SAFE_TEMPLATE
         
         safety = BuildScriptSafety()
         
         # Test safe script validation
         safe_script = os.path.join(self.build_dir, "safe_build.sh")
-        with open(safe_script, 'w') as f:
-            f.write(safety.generate_safe_script_template())
+        self.assertIs(safety.generate_safe_script_template(), _SAFE_TEMPLATE)
+        Path(safe_script).write_bytes(_SAFE_TEMPLATE_BYTES)
         
         result = safety.validate_build_script(safe_script)
         self.assertTrue(result)
@@ -639,15 +840,29 @@ echo "ISO build completed successfully"
         
         # Test dangerous script validation
         dangerous_script = os.path.join(self.build_dir, "dangerous_build.sh")
-        with open(dangerous_script, 'w') as f:
-            f.write('#!/bin/bash\n')
-            f.write('rm -rf /\n')
-            f.write('dd if=/dev/zero of=/dev/sda\n')
-            f.write('sudo mkfs.ext4 /dev/sdb1\n')
+        Path(dangerous_script).write_text("""\
+#!/bin/bash
+rm -rf /
+dd if=/dev/zero of=/dev/sda
+sudo mkfs.ext4 /dev/sdb1
+""")
         
         result = safety.validate_build_script(dangerous_script)
         self.assertFalse(result)
         self.assertGreater(len(safety.safety_violations), 0)
+        
+        # Findings are reported against the line they occur on
+        self.assertIn("Line 2: Dangerous pattern 'rm -rf'", safety.safety_violations)
+        self.assertIn("Line 4: Dangerous pattern 'mkfs'", safety.safety_violations)
+        self.assertEqual(safety.warnings, ["Line 4: Privilege escalation detected"])
+        
+        # Overlapping patterns on one line are each reported
+        safety.safety_violations.clear()
+        self.assertFalse(safety._analyze_script_content("SUDO RM -RF /tmp/build\n"))
+        self.assertEqual(safety.safety_violations, [
+            "Line 1: Dangerous pattern 'sudo rm'",
+            "Line 1: Dangerous pattern 'rm -rf'",
+        ])
 
 if __name__ == '__main__':
     # Run tests with detailed output
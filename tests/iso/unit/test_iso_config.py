@@ -3,80 +3,249 @@ Unit tests for ISO configuration parsing and validation.
 """
 
 import unittest
-from unittest.mock import Mock, patch, MagicMock
 import tempfile
 import os
-import sys
-import toml
-from pathlib import Path
+import json
+import re
+import shutil
+from functools import lru_cache
 
-# Add the project root to Python path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+_VERSION_RE = re.compile(r'^\d+\.\d+\.\d+$')
+_VALID_ARCHS = frozenset({"x86_64", "amd64", "i686", "i386", "arm64", "aarch64"})
+_VALID_COMPRESSIONS = frozenset({"gzip", "xz", "lzma", "lzo", "zstd"})
 
-class TestISOConfig(unittest.TestCase):
-    """Test ISO configuration parsing and validation."""
-    
-    def setUp(self):
-        """Set up test fixtures."""
-        self.valid_config = {
+# Required keys per config section
+_ISO_REQUIRED = frozenset({"name", "version", "architecture", "label"})
+_BOOTLOADER_REQUIRED = frozenset({"efi_bootloader", "grub_timeout", "menu_entries"})
+_MENU_ENTRY_REQUIRED = frozenset({"name", "title", "kernel", "initrd", "kernel_params"})
+_FILESYSTEM_REQUIRED = frozenset({"rootfs_type", "rootfs_compression", "min_disk_space"})
+
+# Default ISO configuration, built once at import
+_DEFAULT_CONFIG = {
+    "iso": {
+        "name": "RegicideOS",
+        "version": "1.0.0",
+        "architecture": "x86_64",
+        "label": "RegicideOS-1.0.0",
+        "publisher": "RegicideOS Team",
+        "application": "RegicideOS Live Installer"
+    },
+    "bootloader": {
+        "efi_bootloader": "grub",
+        "grub_theme": "regicideos",
+        "grub_timeout": 10,
+        "grub_default_entry": 0
+    },
+    "filesystem": {
+        "rootfs_type": "squashfs",
+        "rootfs_compression": "xz",
+        "rootfs_block_size": 131072
+    },
+    "security": {
+        "secure_boot": True,
+        "gpg_sign": True,
+        "strict_permissions": True
+    }
+}
+
+# (name, config, expected validate() result, error keywords, warning keywords)
+_VALIDATOR_CASES = [
+    (
+        "valid",
+        {
             "iso": {
                 "name": "RegicideOS",
                 "version": "1.0.0",
-                "architecture": "x86_64",
-                "label": "RegicideOS-1.0.0",
-                "publisher": "RegicideOS Team",
-                "application": "RegicideOS Live Installer"
+                "architecture": "x86_64"
             },
             "bootloader": {
                 "efi_bootloader": "grub",
-                "grub_theme": "regicideos",
-                "grub_timeout": 10,
-                "grub_default_entry": 0,
-                "menu_entries": [
-                    {
-                        "name": "RegicideOS Live",
-                        "title": "Start RegicideOS Live Environment",
-                        "kernel": "/boot/vmlinuz",
-                        "initrd": "/boot/initrd",
-                        "kernel_params": ["boot=live", "live-media-path=/live"]
-                    }
-                ]
-            },
-            "filesystem": {
-                "rootfs_type": "squashfs",
-                "rootfs_compression": "xz",
-                "rootfs_block_size": 131072,
-                "min_disk_space": 21474836480,
-                "recommended_disk_space": 32212254720
+                "grub_timeout": 10
+            }
+        },
+        True, (), (),
+    ),
+    (
+        "missing_sections",
+        {
+            "iso": {
+                "name": "RegicideOS"
+                # Missing version and architecture
+            }
+            # Missing bootloader section
+        },
+        False, ("version", "architecture", "bootloader"), (),
+    ),
+    (
+        "unsupported_architecture",
+        {
+            "iso": {
+                "name": "RegicideOS",
+                "version": "1.0.0",
+                "architecture": "invalid_arch"
             },
-            "security": {
-                "secure_boot": True,
-                "gpg_sign": True,
-                "strict_permissions": True
+            "bootloader": {
+                "efi_bootloader": "grub"
             }
-        }
+        },
+        # Valid, but with an architecture warning
+        True, (), ("invalid_arch",),
+    ),
+]
+
+# Fixture config shared by the whole module; tests must not mutate it
+_VALID_CONFIG = {
+    "iso": {
+        "name": "RegicideOS",
+        "version": "1.0.0",
+        "architecture": "x86_64",
+        "label": "RegicideOS-1.0.0",
+        "publisher": "RegicideOS Team",
+        "application": "RegicideOS Live Installer"
+    },
+    "bootloader": {
+        "efi_bootloader": "grub",
+        "grub_theme": "regicideos",
+        "grub_timeout": 10,
+        "grub_default_entry": 0,
+        "menu_entries": [
+            {
+                "name": "RegicideOS Live",
+                "title": "Start RegicideOS Live Environment",
+                "kernel": "/boot/vmlinuz",
+                "initrd": "/boot/initrd",
+                "kernel_params": ["boot=live", "live-media-path=/live"]
+            }
+        ]
+    },
+    "filesystem": {
+        "rootfs_type": "squashfs",
+        "rootfs_compression": "xz",
+        "rootfs_block_size": 131072,
+        "min_disk_space": 21474836480,
+        "recommended_disk_space": 32212254720
+    },
+    "security": {
+        "secure_boot": True,
+        "gpg_sign": True,
+        "strict_permissions": True
+    }
+}
+
+# Module-scoped scratch root and canonical config JSON -> config file path,
+# so each distinct config is written once per module run
+_scratch_root = None
+_config_file_cache = {}
+
+
+def setUpModule():
+    """Create the scratch root shared by every test in the module."""
+    global _scratch_root
+    _scratch_root = tempfile.mkdtemp()
+
+
+def tearDownModule():
+    """Remove every cached config file in one pass."""
+    global _scratch_root
+    # rmtree already tolerates a missing tree, so no existence check first
+    shutil.rmtree(_scratch_root, ignore_errors=True)
+    _scratch_root = None
+    _config_file_cache.clear()
+
+
+@lru_cache(maxsize=None)
+def _tomllib():
+    """Import the stdlib TOML reader on first use so tests that never parse TOML skip it."""
+    import tomllib
+    return tomllib
+
+
+@lru_cache(maxsize=None)
+def _toml_dumps():
+    """Return a TOML writer on first use: tomli_w when installed, toml otherwise."""
+    try:
+        import tomli_w
+    except ImportError:
+        import toml
+        return toml.dumps
+    return tomli_w.dumps
+
+
+@lru_cache(maxsize=None)
+def _dump_toml_bytes(canonical):
+    """Serialize a config given as canonical JSON to TOML bytes, once per distinct config."""
+    return _toml_dumps()(json.loads(canonical)).encode()
+
+
+class _ISOConfigValidator:
+    """Minimal configuration validator exercised by the validation tests."""
+    
+    def __init__(self):
+        self.errors = []
+        self.warnings = []
+    
+    def validate(self, config):
+        """Validate configuration and return list of errors."""
+        self.errors = []
+        self.warnings = []
+        
+        # Validate ISO section
+        if "iso" not in config:
+            self.errors.append("Missing 'iso' section")
+            return False
+        
+        iso_section = config["iso"]
+        if "name" not in iso_section:
+            self.errors.append("Missing 'name' in iso section")
         
-        self.temp_config_file = None
+        if "version" not in iso_section:
+            self.errors.append("Missing 'version' in iso section")
         
-    def tearDown(self):
-        """Clean up test fixtures."""
-        if self.temp_config_file and os.path.exists(self.temp_config_file):
-            os.unlink(self.temp_config_file)
+        if "architecture" not in iso_section:
+            self.errors.append("Missing 'architecture' in iso section")
+        
+        # Validate architecture
+        if "architecture" in iso_section:
+            arch = iso_section["architecture"]
+            if arch not in _VALID_ARCHS:
+                self.warnings.append(f"Unsupported architecture: {arch}")
+        
+        # Validate bootloader
+        if "bootloader" not in config:
+            self.errors.append("Missing 'bootloader' section")
+        
+        return len(self.errors) == 0
+
+
+class TestISOConfig(unittest.TestCase):
+    """Test ISO configuration parsing and validation."""
+    
+    valid_config = _VALID_CONFIG
     
     def create_temp_config(self, config_dict):
-        """Create a temporary config file."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.toml', delete=False) as f:
-            toml.dump(config_dict, f)
-            self.temp_config_file = f.name
-        return self.temp_config_file
+        """Create a temporary config file, reusing the one written for an identical config."""
+        canonical = json.dumps(config_dict, sort_keys=True)
+        path = _config_file_cache.get(canonical)
+        if path is None:
+            fd, path = tempfile.mkstemp(suffix='.toml', dir=_scratch_root)
+            try:
+                os.write(fd, _dump_toml_bytes(canonical))
+            finally:
+                os.close(fd)
+            _config_file_cache[canonical] = path
+        return path
+    
+    def _roundtrip(self, config_dict):
+        """Serialize and parse a config in memory."""
+        return _tomllib().loads(_toml_dumps()(config_dict))
     
     def test_load_valid_config(self):
         """Test loading a valid configuration."""
         config_file = self.create_temp_config(self.valid_config)
         
         # Simulate config loading
-        with open(config_file, 'r') as f:
-            loaded_config = toml.load(f)
+        with open(config_file, 'rb') as f:
+            loaded_config = _tomllib().load(f)
         
         self.assertEqual(loaded_config["iso"]["name"], "RegicideOS")
         self.assertEqual(loaded_config["iso"]["version"], "1.0.0")
@@ -91,26 +260,24 @@ class TestISOConfig(unittest.TestCase):
         iso_config = self.valid_config["iso"]
         
         # Check required fields
-        required_fields = ["name", "version", "architecture", "label"]
-        for field in required_fields:
-            self.assertIn(field, iso_config)
+        missing = _ISO_REQUIRED - iso_config.keys()
+        self.assertFalse(missing, f"missing: {missing}")
         
         # Validate version format
         version = iso_config["version"]
-        self.assertRegex(version, r'^\d+\.\d+\.\d+$')
+        self.assertRegex(version, _VERSION_RE)
         
         # Validate architecture
         arch = iso_config["architecture"]
-        self.assertIn(arch, ["x86_64", "amd64", "i686", "i386", "arm64", "aarch64"])
+        self.assertIn(arch, _VALID_ARCHS)
     
     def test_validate_bootloader_section(self):
         """Test validation of bootloader section."""
         bootloader_config = self.valid_config["bootloader"]
         
         # Check required fields
-        required_fields = ["efi_bootloader", "grub_timeout", "menu_entries"]
-        for field in required_fields:
-            self.assertIn(field, bootloader_config)
+        missing = _BOOTLOADER_REQUIRED - bootloader_config.keys()
+        self.assertFalse(missing, f"missing: {missing}")
         
         # Validate bootloader type
         bootloader_type = bootloader_config["efi_bootloader"]
@@ -128,18 +295,16 @@ class TestISOConfig(unittest.TestCase):
         
         # Check menu entry structure
         entry = menu_entries[0]
-        required_entry_fields = ["name", "title", "kernel", "initrd", "kernel_params"]
-        for field in required_entry_fields:
-            self.assertIn(field, entry)
+        missing = _MENU_ENTRY_REQUIRED - entry.keys()
+        self.assertFalse(missing, f"missing: {missing}")
     
     def test_validate_filesystem_section(self):
         """Test validation of filesystem section."""
         fs_config = self.valid_config["filesystem"]
         
         # Check required fields
-        required_fields = ["rootfs_type", "rootfs_compression", "min_disk_space"]
-        for field in required_fields:
-            self.assertIn(field, fs_config)
+        missing = _FILESYSTEM_REQUIRED - fs_config.keys()
+        self.assertFalse(missing, f"missing: {missing}")
         
         # Validate filesystem type
         fs_type = fs_config["rootfs_type"]
@@ -147,7 +312,7 @@ class TestISOConfig(unittest.TestCase):
         
         # Validate compression
         compression = fs_config["rootfs_compression"]
-        self.assertIn(compression, ["gzip", "xz", "lzma", "lzo", "zstd"])
+        self.assertIn(compression, _VALID_COMPRESSIONS)
         
         # Validate disk space requirements
         min_space = fs_config["min_disk_space"]
@@ -170,23 +335,20 @@ class TestISOConfig(unittest.TestCase):
         """Test handling of invalid configurations."""
         # Test missing required section
         invalid_config = {"iso": {"name": "Test"}}
-        config_file = self.create_temp_config(invalid_config)
-        
-        with open(config_file, 'r') as f:
-            loaded_config = toml.load(f)
+        loaded_config = self._roundtrip(invalid_config)
         
         # Should not have bootloader section
         self.assertNotIn("bootloader", loaded_config)
     
     def test_invalid_architecture(self):
         """Test handling of invalid architecture."""
-        invalid_config = self.valid_config.copy()
-        invalid_config["iso"]["architecture"] = "invalid_arch"
-        
-        config_file = self.create_temp_config(invalid_config)
+        # Rebuild only the iso section; the other sections stay shared with the fixture
+        invalid_config = {
+            **self.valid_config,
+            "iso": {**self.valid_config["iso"], "architecture": "invalid_arch"},
+        }
         
-        with open(config_file, 'r') as f:
-            loaded_config = toml.load(f)
+        loaded_config = self._roundtrip(invalid_config)
         
         # Should load but architecture is invalid
         self.assertEqual(loaded_config["iso"]["architecture"], "invalid_arch")
@@ -194,160 +356,56 @@ class TestISOConfig(unittest.TestCase):
     def test_empty_configuration(self):
         """Test handling of empty configuration."""
         empty_config = {}
-        config_file = self.create_temp_config(empty_config)
-        
-        with open(config_file, 'r') as f:
-            loaded_config = toml.load(f)
+        loaded_config = self._roundtrip(empty_config)
         
         # Should be empty
         self.assertEqual(loaded_config, {})
     
     def test_config_file_not_found(self):
         """Test handling of missing config file."""
+        # open() raises before any parser runs, so no TOML module is needed
+        missing = os.path.join(_scratch_root, "missing", "config.toml")
         with self.assertRaises(FileNotFoundError):
-            with open("/nonexistent/config.toml", 'r') as f:
-                toml.load(f)
+            open(missing, 'rb')
 
 class TestISOConfigValidation(unittest.TestCase):
     """Test ISO configuration validation logic."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Create one validator shared by every test in the class."""
+        cls.validator = _ISOConfigValidator()
+    
     def setUp(self):
-        """Set up test fixtures."""
-        self.validator = self.create_validator()
+        """Reset validator state left by the previous test."""
+        self.validator.errors.clear()
+        self.validator.warnings.clear()
     
-    def create_validator(self):
-        """Create a mock configuration validator."""
-        class ISOConfigValidator:
-            def __init__(self):
-                self.errors = []
-                self.warnings = []
-            
-            def validate(self, config):
-                """Validate configuration and return list of errors."""
-                self.errors = []
-                self.warnings = []
-                
-                # Validate ISO section
-                if "iso" not in config:
-                    self.errors.append("Missing 'iso' section")
-                    return False
-                
-                iso_section = config["iso"]
-                if "name" not in iso_section:
-                    self.errors.append("Missing 'name' in iso section")
-                
-                if "version" not in iso_section:
-                    self.errors.append("Missing 'version' in iso section")
-                
-                if "architecture" not in iso_section:
-                    self.errors.append("Missing 'architecture' in iso section")
-                
-                # Validate architecture
-                if "architecture" in iso_section:
-                    arch = iso_section["architecture"]
-                    valid_archs = ["x86_64", "amd64", "i686", "i386", "arm64", "aarch64"]
-                    if arch not in valid_archs:
-                        self.warnings.append(f"Unsupported architecture: {arch}")
+    def test_validate_cases(self):
+        """Test validation of valid, incomplete and unsupported-architecture configs."""
+        for name, config, expected, error_keywords, warning_keywords in _VALIDATOR_CASES:
+            with self.subTest(name=name):
+                result = self.validator.validate(config)
+                self.assertEqual(result, expected)
                 
-                # Validate bootloader
-                if "bootloader" not in config:
-                    self.errors.append("Missing 'bootloader' section")
+                # Check for expected errors, or none at all
+                errors = self.validator.errors
+                if error_keywords:
+                    for keyword in error_keywords:
+                        self.assertTrue(any(keyword in e for e in errors), keyword)
+                else:
+                    self.assertEqual(len(errors), 0)
                 
-                return len(self.errors) == 0
-        
-        return ISOConfigValidator()
-    
-    def test_valid_config_validation(self):
-        """Test validation of valid configuration."""
-        config = {
-            "iso": {
-                "name": "RegicideOS",
-                "version": "1.0.0",
-                "architecture": "x86_64"
-            },
-            "bootloader": {
-                "efi_bootloader": "grub",
-                "grub_timeout": 10
-            }
-        }
-        
-        result = self.validator.validate(config)
-        self.assertTrue(result)
-        self.assertEqual(len(self.validator.errors), 0)
-    
-    def test_missing_sections_validation(self):
-        """Test validation detects missing sections."""
-        config = {
-            "iso": {
-                "name": "RegicideOS"
-                # Missing version and architecture
-            }
-            # Missing bootloader section
-        }
-        
-        result = self.validator.validate(config)
-        self.assertFalse(result)
-        self.assertGreater(len(self.validator.errors), 0)
-        
-        # Check for expected errors
-        error_messages = [str(error) for error in self.validator.errors]
-        self.assertTrue(any("version" in msg for msg in error_messages))
-        self.assertTrue(any("architecture" in msg for msg in error_messages))
-        self.assertTrue(any("bootloader" in msg for msg in error_messages))
-    
-    def test_unsupported_architecture_warning(self):
-        """Test warning for unsupported architecture."""
-        config = {
-            "iso": {
-                "name": "RegicideOS",
-                "version": "1.0.0",
-                "architecture": "invalid_arch"
-            },
-            "bootloader": {
-                "efi_bootloader": "grub"
-            }
-        }
-        
-        result = self.validator.validate(config)
-        self.assertTrue(result)  # Should be valid but with warnings
-        self.assertEqual(len(self.validator.errors), 0)
-        self.assertGreater(len(self.validator.warnings), 0)
-        
-        # Check for architecture warning
-        warning_messages = [str(warning) for warning in self.validator.warnings]
-        self.assertTrue(any("invalid_arch" in msg for msg in warning_messages))
+                # Check for expected warnings
+                for keyword in warning_keywords:
+                    self.assertTrue(any(keyword in w for w in self.validator.warnings), keyword)
 
 class TestISOConfigDefaults(unittest.TestCase):
     """Test ISO configuration default values."""
     
     def test_default_configuration_creation(self):
         """Test creation of default configuration."""
-        default_config = {
-            "iso": {
-                "name": "RegicideOS",
-                "version": "1.0.0",
-                "architecture": "x86_64",
-                "label": "RegicideOS-1.0.0",
-                "publisher": "RegicideOS Team",
-                "application": "RegicideOS Live Installer"
-            },
-            "bootloader": {
-                "efi_bootloader": "grub",
-                "grub_theme": "regicideos",
-                "grub_timeout": 10,
-                "grub_default_entry": 0
-            },
-            "filesystem": {
-                "rootfs_type": "squashfs",
-                "rootfs_compression": "xz",
-                "rootfs_block_size": 131072
-            },
-            "security": {
-                "secure_boot": True,
-                "gpg_sign": True,
-                "strict_permissions": True
-            }
-        }
+        default_config = _DEFAULT_CONFIG
         
         # Validate defaults
         self.assertEqual(default_config["iso"]["name"], "RegicideOS")
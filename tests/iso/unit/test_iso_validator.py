@@ -6,100 +6,431 @@ import unittest
 from unittest.mock import Mock, patch, MagicMock, call, mock_open
 import tempfile
 import os
-import sys
 import hashlib
-from pathlib import Path
+import hmac
+import re
 import shutil
+import stat
+from concurrent.futures import ThreadPoolExecutor
 
-# Add the project root to Python path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+try:
+    from pyfakefs.fake_filesystem_unittest import TestCase as _FakeFsTestCase
+except ImportError:
+    _FakeFsTestCase = None
 
-class TestISOValidation(unittest.TestCase):
-    """Test ISO validation with comprehensive mocking."""
+# Contents of the mock ISO, built once; ~16KB
+_MOCK_ISO_BYTES = b"Mock ISO content" * 1000
+
+# Must match the digest build-iso.sh writes to the .sha256 sidecar
+_CHECKSUM_ALGORITHM = 'sha256'
+# A well-formed sidecar hash: exactly one digest's worth of hex digits
+_CHECKSUM_HEX_RE = re.compile(
+    r"[0-9a-fA-F]{%d}" % (hashlib.new(_CHECKSUM_ALGORITHM).digest_size * 2))
+
+
+def _file_digest(path):
+    """Return the hex _CHECKSUM_ALGORITHM digest of a file."""
+    with open(path, 'rb') as f:
+        return hashlib.file_digest(f, _CHECKSUM_ALGORITHM).hexdigest()
+
+
+def _write_checksum_file(path, line):
+    """Write a one-line checksum sidecar with a single unbuffered write."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        os.write(fd, line.encode())
+    finally:
+        os.close(fd)
+
+
+def _write_mock_iso(path):
+    """Write the mock ISO and ask the kernel to keep it in the page cache.
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.test_iso = os.path.join(self.temp_dir, "test.iso")
+    Every test in a class re-reads the same file, so WILLNEED up front
+    keeps those reads off the disk where posix_fadvise is available.
+    """
+    fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, _MOCK_ISO_BYTES)
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    finally:
+        os.close(fd)
+
+# Entries a mounted ISO must provide, relative to the mount point; tuples
+# keep the order used in error messages
+_REQUIRED_DIRS = ("EFI", "EFI/BOOT", "boot", "boot/grub", "live")
+_GRUB_CFG = "boot/grub/grub.cfg"
+_REQUIRED_FILES = ("EFI/BOOT/BOOTX64.EFI", _GRUB_CFG)
+_EFI_FILES = ("EFI/BOOT/BOOTX64.EFI", "EFI/BOOT/BOOTIA32.EFI")
+
+# Boot entries a usable grub.cfg must mention, matched in a single scan
+_GRUB_REQUIRED_ENTRIES = ("menuentry", "linux", "initrd")
+_GRUB_ENTRY_RE = re.compile(rb"menuentry|linux|initrd")
+# Lowercased needles for the mixed-case fallback, in _GRUB_REQUIRED_ENTRIES order
+_GRUB_ENTRY_NEEDLES = tuple(e.lower().encode() for e in _GRUB_REQUIRED_ENTRIES)
+
+
+def _collect_entries(root):
+    """Return every path under root, relative and '/'-separated, from one scandir walk."""
+    present = set()
+    stack = [("", root)]
+    while stack:
+        rel, path = stack.pop()
+        with os.scandir(path) as it:
+            for entry in it:
+                entry_rel = f"{rel}/{entry.name}" if rel else entry.name
+                present.add(entry_rel)
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry_rel, entry.path))
+    return present
+
+
+class _ISOValidator:
+    def __init__(self, iso_file):
+        self.iso_file = iso_file
+        self.errors = []
+        self.warnings = []
+        self.passed_checks = []
+    
+    def validate(self):
+        """Run all validation checks."""
+        # Open once; fstat and pread on the same descriptor serve every check
+        try:
+            fd = os.open(self.iso_file, os.O_RDONLY)
+        except FileNotFoundError:
+            self.errors.append("ISO file does not exist")
+            return False
+        except OSError as e:
+            self.errors.append(f"ISO file is not readable: {e}")
+            return False
+        
+        try:
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            st = os.fstat(fd)
+            
+            # The three checks are fixed, so they run straight-line rather
+            # than through a (name, callable) dispatch table
+            try:
+                if self._validate_file_format(st):
+                    self.passed_checks.append("file_format")
+                else:
+                    self.errors.append("Check file_format failed")
+            except Exception as e:
+                self.errors.append(f"Check file_format failed with exception: {e}")
+            
+            try:
+                if self._validate_file_size(st):
+                    self.passed_checks.append("file_size")
+                else:
+                    self.errors.append("Check file_size failed")
+            except Exception as e:
+                self.errors.append(f"Check file_size failed with exception: {e}")
+            
+            try:
+                if self._validate_file_readability(fd):
+                    self.passed_checks.append("file_readability")
+                else:
+                    self.errors.append("Check file_readability failed")
+            except Exception as e:
+                self.errors.append(f"Check file_readability failed with exception: {e}")
+        finally:
+            os.close(fd)
+        
+        return len(self.errors) == 0
+    
+    def _validate_file_format(self, st):
+        """Validate basic file format."""
+        if not stat.S_ISREG(st.st_mode):
+            self.errors.append("ISO path is not a file")
+            return False
         
-        # Create a mock ISO file
-        with open(self.test_iso, 'wb') as f:
-            f.write(b"Mock ISO content" * 1000)  # ~16KB file
+        return True
+    
+    def _validate_file_size(self, st):
+        """Validate file size constraints."""
+        file_size = st.st_size
         
-        self.validator = self.create_validator()
+        if file_size == 0:
+            self.errors.append("ISO file is empty")
+            return False
         
-    def tearDown(self):
-        """Clean up test fixtures."""
-        if os.path.exists(self.temp_dir):
-            shutil.rmtree(self.temp_dir)
+        if file_size < 1024:  # 1KB minimum
+            self.warnings.append("ISO file is very small")
+        
+        if file_size > 8589934592:  # 8GB maximum
+            self.warnings.append("ISO file is very large")
+        
+        return True
     
-    def create_validator(self, iso_file=None):
-        """Create a mock ISO validator."""
-        class ISOValidator:
-            def __init__(self, iso_file):
-                self.iso_file = iso_file
-                self.errors = []
-                self.warnings = []
-                self.passed_checks = []
+    def _validate_file_readability(self, fd):
+        """Validate file readability."""
+        try:
+            os.pread(fd, 1024, 0)  # Try to read first 1KB
+            return True
+        except Exception as e:
+            self.errors.append(f"ISO file is not readable: {e}")
+            return False
+
+
+class _ChecksumValidator:
+    def __init__(self, iso_file):
+        self.iso_file = iso_file
+        self.errors = []
+        self.warnings = []
+    
+    def validate_checksum(self, checksum_file):
+        """Validate checksum against checksum file."""
+        if not os.path.exists(checksum_file):
+            self.errors.append("Checksum file does not exist")
+            return False
+        
+        try:
+            # Read checksum from file
+            with open(checksum_file, 'r') as f:
+                checksum_line = f.readline().strip()
             
-            def validate(self):
-                """Run all validation checks."""
-                checks = [
-                    ("file_format", self._validate_file_format),
-                    ("file_size", self._validate_file_size),
-                    ("file_readability", self._validate_file_readability)
-                ]
-                
-                for check_name, check_func in checks:
-                    try:
-                        if check_func():
-                            self.passed_checks.append(check_name)
-                        else:
-                            self.errors.append(f"Check {check_name} failed")
-                    except Exception as e:
-                        self.errors.append(f"Check {check_name} failed with exception: {e}")
-                
-                return len(self.errors) == 0
+            # Extract hash from line (format: hash filename)
+            expected_hash = checksum_line.split()[0]
             
-            def _validate_file_format(self):
-                """Validate basic file format."""
-                if not os.path.exists(self.iso_file):
-                    self.errors.append("ISO file does not exist")
-                    return False
-                
-                if not os.path.isfile(self.iso_file):
-                    self.errors.append("ISO path is not a file")
-                    return False
-                
-                return True
+            # A malformed hash can never match; skip hashing the ISO
+            if not _CHECKSUM_HEX_RE.fullmatch(expected_hash):
+                self.errors.append(f"Checksum mismatch: malformed hash {expected_hash!r}")
+                return False
             
-            def _validate_file_size(self):
-                """Validate file size constraints."""
-                file_size = os.path.getsize(self.iso_file)
-                
-                if file_size == 0:
-                    self.errors.append("ISO file is empty")
-                    return False
-                
-                if file_size < 1024:  # 1KB minimum
-                    self.warnings.append("ISO file is very small")
-                
-                if file_size > 8589934592:  # 8GB maximum
-                    self.warnings.append("ISO file is very large")
-                
+            # Calculate checksum of ISO file
+            file_hash = _file_digest(self.iso_file)
+            
+            if hmac.compare_digest(file_hash, expected_hash.lower()):
                 return True
+            else:
+                self.errors.append("Checksum mismatch")
+                return False
+                
+        except Exception as e:
+            self.errors.append(f"Checksum validation failed: {e}")
+            return False
+
+
+class _StructureValidator:
+    def __init__(self, mount_point):
+        self.mount_point = mount_point
+        self._grub_config = os.path.join(mount_point, _GRUB_CFG)
+        self.errors = []
+        self.warnings = []
+        self._present = None
+    
+    def _present_entries(self):
+        """Walk the mount point once; later checks reuse the same listing."""
+        if self._present is None:
+            self._present = _collect_entries(self.mount_point)
+        return self._present
+    
+    def validate_structure(self):
+        """Validate ISO directory structure."""
+        present = self._present_entries()
+        
+        # Check required directories
+        missing_dirs = [d for d in _REQUIRED_DIRS if d not in present]
+        
+        if missing_dirs:
+            self.errors.append(f"Missing directories: {missing_dirs}")
+        
+        # Check required files
+        missing_files = [f for f in _REQUIRED_FILES if f not in present]
+        
+        if missing_files:
+            self.errors.append(f"Missing files: {missing_files}")
+        
+        return len(self.errors) == 0
+    
+    def validate_uefi_boot(self):
+        """Validate UEFI boot capability."""
+        present = self._present_entries()
+        if not any(efi_file in present for efi_file in _EFI_FILES):
+            self.errors.append("No UEFI bootloader found")
+            return False
+        
+        return True
+    
+    def validate_grub_config(self):
+        """Validate GRUB configuration."""
+        if _GRUB_CFG not in self._present_entries():
+            self.errors.append("GRUB configuration not found")
+            return False
+        
+        # Check for required boot entries
+        try:
+            with open(self._grub_config, 'rb') as f:
+                config_content = f.read()
+            
+            found = {m.group() for m in _GRUB_ENTRY_RE.finditer(config_content)}
+            missing_entries = [e for e in _GRUB_REQUIRED_ENTRIES if e.encode() not in found]
+            
+            if missing_entries:
+                # Slow path: retry the misses against a once-lowercased copy
+                normalized = config_content.lower()
+                missing_entries = [
+                    e for e, needle in zip(_GRUB_REQUIRED_ENTRIES, _GRUB_ENTRY_NEEDLES)
+                    if e in missing_entries and needle not in normalized
+                ]
             
-            def _validate_file_readability(self):
-                """Validate file readability."""
+            if missing_entries:
+                self.warnings.append(f"Missing GRUB entries: {missing_entries}")
+            
+        except Exception as e:
+            self.errors.append(f"Failed to read GRUB config: {e}")
+            return False
+        
+        return True
+
+
+# Steps of a complete validation, in report order
+_COMPLETE_STEPS = (
+    "basic_validation",
+    "checksum_validation",
+    "structure_validation",
+    "security_validation"
+)
+
+
+class _CompleteValidator:
+    def __init__(self, iso_file):
+        self.iso_file = iso_file
+        # Keys are fixed up front; running the steps only fills in values
+        self.validation_results = dict.fromkeys(_COMPLETE_STEPS)
+        self._passed = 0
+    
+    def run_complete_validation(self):
+        """Run all validation steps concurrently."""
+        # Each run counts afresh; the results dict is overwritten key by key
+        self._passed = 0
+        steps = (
+            self._validate_basic,
+            self._validate_checksum,
+            self._validate_structure,
+            self._validate_security
+        )
+        
+        # Steps touch disjoint state; each returns its own (passed, errors)
+        with ThreadPoolExecutor(max_workers=len(steps)) as executor:
+            futures = [(step_name, executor.submit(step_func))
+                       for step_name, step_func in zip(_COMPLETE_STEPS, steps)]
+            
+            for step_name, future in futures:
                 try:
-                    with open(self.iso_file, 'rb') as f:
-                        f.read(1024)  # Try to read first 1KB
-                    return True
+                    passed, errors = future.result()
+                    self.validation_results[step_name] = {
+                        "passed": passed,
+                        "errors": errors
+                    }
+                    if passed:
+                        self._passed += 1
                 except Exception as e:
-                    self.errors.append(f"ISO file is not readable: {e}")
-                    return False
+                    self.validation_results[step_name] = {
+                        "passed": False,
+                        "errors": [f"Exception: {e}"]
+                    }
+        
+        return self._generate_summary()
+    
+    def _validate_basic(self):
+        """Basic file validation."""
+        if not os.path.exists(self.iso_file):
+            return False, ["ISO file does not exist"]
+        
+        file_size = os.path.getsize(self.iso_file)
+        if file_size == 0:
+            return False, ["ISO file is empty"]
+        
+        return True, []
+    
+    def _validate_checksum(self):
+        """Checksum validation (mock)."""
+        # Mock checksum validation
+        return True, []
+    
+    def _validate_structure(self):
+        """Structure validation (mock)."""
+        # Mock structure validation
+        return True, []
+    
+    def _validate_security(self):
+        """Security validation (mock)."""
+        # Mock security validation
+        return True, []
+    
+    def _generate_summary(self):
+        """Generate validation summary."""
+        total_steps = len(self.validation_results)
+        passed_steps = self._passed
+        
+        summary = {
+            "total_steps": total_steps,
+            "passed_steps": passed_steps,
+            "failed_steps": total_steps - passed_steps,
+            "overall_result": passed_steps == total_steps,
+            "details": self.validation_results
+        }
+        
+        return summary
+
+
+class _FailureValidator:
+    def __init__(self, iso_file):
+        self.iso_file = iso_file
+        self.results = {}
+    
+    def validate_with_failures(self):
+        """Validation with intentional failures."""
+        # Simulate some validation failures
+        results = {
+            "basic_validation": {"passed": True, "errors": []},
+            "checksum_validation": {"passed": False, "errors": ["Checksum mismatch"]},
+            "structure_validation": {"passed": True, "errors": []},
+            "security_validation": {"passed": False, "errors": ["Security issue found"]}
+        }
+        
+        total = len(results)
+        passed = sum(1 for r in results.values() if r["passed"])
+        
+        return {
+            "total_checks": total,
+            "passed_checks": passed,
+            "failed_checks": total - passed,
+            "success_rate": passed / total,
+            "details": results
+        }
+
+
+class TestISOValidation(unittest.TestCase):
+    """Test ISO validation with comprehensive mocking."""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Write the mock ISO once and take its expected hash for the whole class."""
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.test_iso = os.path.join(cls.temp_dir, "test.iso")
         
-        return ISOValidator(iso_file if iso_file is not None else self.test_iso)
+        # Create a mock ISO file
+        _write_mock_iso(cls.test_iso)
+        
+        # Hash the in-memory bytes; no need to read the file back
+        cls.correct_hash = hashlib.new(_CHECKSUM_ALGORITHM, _MOCK_ISO_BYTES).hexdigest()
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up test fixtures."""
+        shutil.rmtree(cls.temp_dir, ignore_errors=True)
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.validator = self.create_validator()
+    
+    def create_validator(self, iso_file=None):
+        """Create a mock ISO validator."""
+        return _ISOValidator(iso_file if iso_file is not None else self.test_iso)
     
     def test_valid_iso_validation(self):
         """Test validation of a valid ISO file."""
@@ -146,49 +477,11 @@ class TestISOValidation(unittest.TestCase):
     
     def test_checksum_validation(self):
         """Test checksum validation."""
-        class ChecksumValidator:
-            def __init__(self, iso_file):
-                self.iso_file = iso_file
-                self.errors = []
-                self.warnings = []
-            
-            def validate_checksum(self, checksum_file):
-                """Validate checksum against checksum file."""
-                if not os.path.exists(checksum_file):
-                    self.errors.append("Checksum file does not exist")
-                    return False
-                
-                try:
-                    # Calculate checksum of ISO file
-                    with open(self.iso_file, 'rb') as f:
-                        file_hash = hashlib.sha256(f.read()).hexdigest()
-                    
-                    # Read checksum from file
-                    with open(checksum_file, 'r') as f:
-                        checksum_line = f.readline().strip()
-                    
-                    # Extract hash from line (format: hash filename)
-                    expected_hash = checksum_line.split()[0]
-                    
-                    if file_hash == expected_hash:
-                        return True
-                    else:
-                        self.errors.append("Checksum mismatch")
-                        return False
-                        
-                except Exception as e:
-                    self.errors.append(f"Checksum validation failed: {e}")
-                    return False
-        
         # Create checksum file with correct hash
-        with open(self.test_iso, 'rb') as f:
-            correct_hash = hashlib.sha256(f.read()).hexdigest()
-        
         checksum_file = os.path.join(self.temp_dir, "test.iso.sha256")
-        with open(checksum_file, 'w') as f:
-            f.write(f"{correct_hash} test.iso\\n")
+        _write_checksum_file(checksum_file, f"{self.correct_hash} test.iso\\n")
         
-        validator = ChecksumValidator(self.test_iso)
+        validator = _ChecksumValidator(self.test_iso)
         result = validator.validate_checksum(checksum_file)
         
         self.assertTrue(result)
@@ -196,37 +489,11 @@ class TestISOValidation(unittest.TestCase):
     
     def test_checksum_validation_failure(self):
         """Test checksum validation failure."""
-        class ChecksumValidator:
-            def __init__(self, iso_file):
-                self.iso_file = iso_file
-                self.errors = []
-            
-            def validate_checksum(self, checksum_file):
-                """Validate checksum against checksum file."""
-                try:
-                    # Read checksum from file
-                    with open(checksum_file, 'r') as f:
-                        checksum_line = f.readline().strip()
-                    
-                    expected_hash = checksum_line.split()[0]
-                    
-                    # Simulate different hash
-                    if expected_hash != "correct_hash":
-                        self.errors.append("Checksum mismatch")
-                        return False
-                    
-                    return True
-                    
-                except Exception as e:
-                    self.errors.append(f"Checksum validation failed: {e}")
-                    return False
-        
         # Create checksum file with wrong hash
         checksum_file = os.path.join(self.temp_dir, "test.iso.sha256")
-        with open(checksum_file, 'w') as f:
-            f.write("wrong_hash test.iso\\n")
+        _write_checksum_file(checksum_file, "wrong_hash test.iso\\n")
         
-        validator = ChecksumValidator(self.test_iso)
+        validator = _ChecksumValidator(self.test_iso)
         result = validator.validate_checksum(checksum_file)
         
         self.assertFalse(result)
@@ -235,12 +502,27 @@ class TestISOValidation(unittest.TestCase):
         # Check for specific error
         error_messages = [str(error) for error in validator.errors]
         self.assertTrue(any("mismatch" in msg for msg in error_messages))
+    
+    def test_checksum_validation_wrong_digest(self):
+        """Test checksum validation failure for a well-formed but wrong hash."""
+        checksum_file = os.path.join(self.temp_dir, "test.iso.sha256")
+        _write_checksum_file(checksum_file, f"{'0' * len(self.correct_hash)} test.iso\\n")
+        
+        validator = _ChecksumValidator(self.test_iso)
+        result = validator.validate_checksum(checksum_file)
+        
+        self.assertFalse(result)
+        self.assertEqual(validator.errors, ["Checksum mismatch"])
 
-class TestISOStructureValidation(unittest.TestCase):
+class TestISOStructureValidation(_FakeFsTestCase or unittest.TestCase):
     """Test ISO structure validation."""
     
     def setUp(self):
         """Set up test fixtures."""
+        # The mount tree is rebuilt per test; keep it in memory when pyfakefs is available
+        if _FakeFsTestCase is not None:
+            self.setUpPyfakefs()
+        
         self.temp_dir = tempfile.mkdtemp()
         self.temp_mount = os.path.join(self.temp_dir, "mount")
         os.makedirs(self.temp_mount, exist_ok=True)
@@ -254,103 +536,7 @@ class TestISOStructureValidation(unittest.TestCase):
     
     def create_structure_validator(self):
         """Create a mock ISO structure validator."""
-        class StructureValidator:
-            def __init__(self, mount_point):
-                self.mount_point = mount_point
-                self.errors = []
-                self.warnings = []
-            
-            def validate_structure(self):
-                """Validate ISO directory structure."""
-                required_dirs = [
-                    "EFI",
-                    "EFI/BOOT",
-                    "boot",
-                    "boot/grub",
-                    "live"
-                ]
-                
-                required_files = [
-                    "EFI/BOOT/BOOTX64.EFI",
-                    "boot/grub/grub.cfg"
-                ]
-                
-                # Check required directories
-                missing_dirs = []
-                for dir_path in required_dirs:
-                    full_path = os.path.join(self.mount_point, dir_path)
-                    if not os.path.exists(full_path):
-                        missing_dirs.append(dir_path)
-                
-                if missing_dirs:
-                    self.errors.append(f"Missing directories: {missing_dirs}")
-                
-                # Check required files
-                missing_files = []
-                for file_path in required_files:
-                    full_path = os.path.join(self.mount_point, file_path)
-                    if not os.path.exists(full_path):
-                        missing_files.append(file_path)
-                
-                if missing_files:
-                    self.errors.append(f"Missing files: {missing_files}")
-                
-                return len(self.errors) == 0
-            
-            def validate_uefi_boot(self):
-                """Validate UEFI boot capability."""
-                efi_files = [
-                    "EFI/BOOT/BOOTX64.EFI",
-                    "EFI/BOOT/BOOTIA32.EFI"
-                ]
-                
-                efi_found = False
-                for efi_file in efi_files:
-                    full_path = os.path.join(self.mount_point, efi_file)
-                    if os.path.exists(full_path):
-                        efi_found = True
-                        break
-                
-                if not efi_found:
-                    self.errors.append("No UEFI bootloader found")
-                    return False
-                
-                return True
-            
-            def validate_grub_config(self):
-                """Validate GRUB configuration."""
-                grub_config = os.path.join(self.mount_point, "boot/grub/grub.cfg")
-                
-                if not os.path.exists(grub_config):
-                    self.errors.append("GRUB configuration not found")
-                    return False
-                
-                # Check for required boot entries
-                try:
-                    with open(grub_config, 'r') as f:
-                        config_content = f.read()
-                    
-                    required_entries = [
-                        "menuentry",
-                        "linux",
-                        "initrd"
-                    ]
-                    
-                    missing_entries = []
-                    for entry in required_entries:
-                        if entry not in config_content:
-                            missing_entries.append(entry)
-                    
-                    if missing_entries:
-                        self.warnings.append(f"Missing GRUB entries: {missing_entries}")
-                    
-                except Exception as e:
-                    self.errors.append(f"Failed to read GRUB config: {e}")
-                    return False
-                
-                return True
-        
-        return StructureValidator(self.temp_mount)
+        return _StructureValidator(self.temp_mount)
     
     def test_valid_structure_validation(self):
         """Test validation of valid ISO structure."""
@@ -415,97 +601,23 @@ class TestISOStructureValidation(unittest.TestCase):
 class TestISOValidationIntegration(unittest.TestCase):
     """Test ISO validation integration."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.test_iso = os.path.join(self.temp_dir, "test.iso")
+    @classmethod
+    def setUpClass(cls):
+        """Write the mock ISO once for the whole class."""
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.test_iso = os.path.join(cls.temp_dir, "test.iso")
         
         # Create a mock ISO file
-        with open(self.test_iso, 'wb') as f:
-            f.write(b"Mock ISO content" * 1000)
-        
-    def tearDown(self):
+        _write_mock_iso(cls.test_iso)
+    
+    @classmethod
+    def tearDownClass(cls):
         """Clean up test fixtures."""
-        if os.path.exists(self.temp_dir):
-            shutil.rmtree(self.temp_dir)
+        shutil.rmtree(cls.temp_dir, ignore_errors=True)
     
     def test_complete_validation_workflow(self):
         """Test complete validation workflow."""
-        class CompleteValidator:
-            def __init__(self, iso_file):
-                self.iso_file = iso_file
-                self.validation_results = {}
-                self.errors = []
-            
-            def run_complete_validation(self):
-                """Run all validation steps."""
-                steps = [
-                    ("basic_validation", self._validate_basic),
-                    ("checksum_validation", self._validate_checksum),
-                    ("structure_validation", self._validate_structure),
-                    ("security_validation", self._validate_security)
-                ]
-                
-                for step_name, step_func in steps:
-                    try:
-                        result = step_func()
-                        self.validation_results[step_name] = {
-                            "passed": result,
-                            "errors": self.errors.copy()
-                        }
-                        self.errors.clear()  # Clear errors for next step
-                    except Exception as e:
-                        self.validation_results[step_name] = {
-                            "passed": False,
-                            "errors": [f"Exception: {e}"]
-                        }
-                
-                return self._generate_summary()
-            
-            def _validate_basic(self):
-                """Basic file validation."""
-                if not os.path.exists(self.iso_file):
-                    self.errors.append("ISO file does not exist")
-                    return False
-                
-                file_size = os.path.getsize(self.iso_file)
-                if file_size == 0:
-                    self.errors.append("ISO file is empty")
-                    return False
-                
-                return True
-            
-            def _validate_checksum(self):
-                """Checksum validation (mock)."""
-                # Mock checksum validation
-                return True
-            
-            def _validate_structure(self):
-                """Structure validation (mock)."""
-                # Mock structure validation
-                return True
-            
-            def _validate_security(self):
-                """Security validation (mock)."""
-                # Mock security validation
-                return True
-            
-            def _generate_summary(self):
-                """Generate validation summary."""
-                total_steps = len(self.validation_results)
-                passed_steps = sum(1 for result in self.validation_results.values() if result["passed"])
-                
-                summary = {
-                    "total_steps": total_steps,
-                    "passed_steps": passed_steps,
-                    "failed_steps": total_steps - passed_steps,
-                    "overall_result": passed_steps == total_steps,
-                    "details": self.validation_results
-                }
-                
-                return summary
-        
-        validator = CompleteValidator(self.test_iso)
+        validator = _CompleteValidator(self.test_iso)
         summary = validator.run_complete_validation()
         
         # Check summary structure
@@ -520,36 +632,16 @@ class TestISOValidationIntegration(unittest.TestCase):
         self.assertEqual(summary["passed_steps"], 4)
         self.assertEqual(summary["failed_steps"], 0)
         self.assertTrue(summary["overall_result"])
+        
+        # A second run on the same instance reports the same totals
+        rerun = validator.run_complete_validation()
+        self.assertEqual(rerun["passed_steps"], 4)
+        self.assertEqual(rerun["failed_steps"], 0)
+        self.assertTrue(rerun["overall_result"])
     
     def test_validation_with_failures(self):
         """Test validation with some failures."""
-        class FailureValidator:
-            def __init__(self, iso_file):
-                self.iso_file = iso_file
-                self.results = {}
-            
-            def validate_with_failures(self):
-                """Validation with intentional failures."""
-                # Simulate some validation failures
-                results = {
-                    "basic_validation": {"passed": True, "errors": []},
-                    "checksum_validation": {"passed": False, "errors": ["Checksum mismatch"]},
-                    "structure_validation": {"passed": True, "errors": []},
-                    "security_validation": {"passed": False, "errors": ["Security issue found"]}
-                }
-                
-                total = len(results)
-                passed = sum(1 for r in results.values() if r["passed"])
-                
-                return {
-                    "total_checks": total,
-                    "passed_checks": passed,
-                    "failed_checks": total - passed,
-                    "success_rate": passed / total,
-                    "details": results
-                }
-        
-        validator = FailureValidator(self.test_iso)
+        validator = _FailureValidator(self.test_iso)
         results = validator.validate_with_failures()
         
         # Check results
@@ -561,4 +653,4 @@ class TestISOValidationIntegration(unittest.TestCase):
 
 if __name__ == '__main__':
     # Run tests with detailed output
-    unittest.main(verbosity=2)
\ No newline at end of file
+    unittest.main(verbosity=2)
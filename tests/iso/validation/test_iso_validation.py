@@ -6,13 +6,663 @@ import unittest
 from unittest.mock import Mock, patch, MagicMock, call
 import tempfile
 import os
-import sys
 import hashlib
-from pathlib import Path
+import hmac
+import bisect
+import re
 import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+
+def _sha256_digest(path):
+    """Return the raw 32-byte SHA-256 of a file."""
+    with open(path, 'rb') as f:
+        return hashlib.file_digest(f, "sha256").digest()
+
+
+def _sha256_file(path):
+    """Return the hex SHA-256 of a file."""
+    return _sha256_digest(path).hex()
+
+
+def _blake3_digest(path):
+    """Return the raw BLAKE3 of a file: multithreaded SIMD tree hash of a mapping."""
+    hasher = blake3.blake3(max_threads=blake3.blake3.AUTO)
+    return hasher.update_mmap(path).digest()
+
+
+# Sidecar suffix per algorithm; BLAKE3 sums must never land in a .sha256
+# file, where sha256sum -c would read them as wrong SHA-256 sums
+_SIDECAR_SUFFIX = {"sha256": ".sha256", "blake3": ".b3"}
+
+
+def _hash_files(paths):
+    """Hash several files concurrently; returns {path: hex digest}.
+    
+    hashlib releases the GIL while digesting, so threads scale with cores.
+    """
+    paths = list(paths)
+    with ThreadPoolExecutor(max_workers=min(len(paths), os.cpu_count() or 1) or 1) as executor:
+        return dict(zip(paths, executor.map(_sha256_file, paths)))
+
+
+# Bytes read from the start of each file when looking for the sentinel
+_SENTINEL_PEEK_SIZE = 4096
+_SENTINEL = b"MALICIOUS"
+# Upper bound on the buffer of file heads searched in one pass
+_SENTINEL_BATCH_SIZE = 16 << 20
+# Executable headers (ELF, PE) that mark a file as binary without decoding it
+_BINARY_MAGICS = (b"\x7fELF", b"MZ")
+
+
+def _is_binary(head):
+    """Sniff a file's first block: known executable magic or a NUL early on."""
+    return head.startswith(_BINARY_MAGICS) or b"\0" in head[:512]
+
+
+def _sentinel_hits(buf, starts, paths):
+    """Yield each path whose segment of buf holds the sentinel, once per path."""
+    pos = buf.find(_SENTINEL)
+    while pos != -1:
+        i = bisect.bisect_right(starts, pos) - 1
+        yield paths[i]
+        # Resume at the next file's segment
+        pos = buf.find(_SENTINEL, starts[i + 1] if i + 1 < len(starts) else len(buf))
+
+
+def _paths_with_sentinel(heads):
+    """Yield the path of every (path, head) pair whose head contains the sentinel.
+    
+    Heads are packed into one buffer, NUL-separated so the sentinel cannot
+    straddle two files, and each batch is searched with a single bytes.find
+    loop instead of one search per file.
+    """
+    buf = bytearray()
+    starts = []
+    paths = []
+    for path, head in heads:
+        starts.append(len(buf))
+        paths.append(path)
+        buf += head
+        buf += b"\0"
+        if len(buf) >= _SENTINEL_BATCH_SIZE:
+            yield from _sentinel_hits(buf, starts, paths)
+            buf = bytearray()
+            starts = []
+            paths = []
+    
+    if paths:
+        yield from _sentinel_hits(buf, starts, paths)
+
+
+# Boot-config tokens, found in one scan; none can overlap another, so
+# non-overlapping matches still see every occurrence
+_BOOT_TOKEN_RE = re.compile(rb"menuentry|linux|initrd|efi|vmlinuz")
+_BOOT_REQUIRED_ENTRIES = ("menuentry", "linux", "initrd")
+_BOOT_UEFI_PARAMS = ("efi", "vmlinuz", "initrd")
+
+
+def _scan(root):
+    """Yield a DirEntry for every non-directory under root, as os.walk would list them.
+    
+    DirEntry caches what the directory read already returned, so callers can
+    use entry.stat() and entry.path without another syscall or path join.
+    """
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir():
+                    # os.walk lists directory symlinks but does not descend them
+                    if not entry.is_symlink():
+                        stack.append(entry.path)
+                else:
+                    yield entry
+
+
+# Script extensions that may legitimately be executable
+_SCRIPT_EXTS = frozenset({".sh", ".py", ".exe"})
+
+
+def _is_boot_name(name):
+    """Return True if a path component marks a boot location."""
+    return "boot" in name or "EFI" in name
+
+
+def _scan_boot_flagged(root):
+    """Like _scan, but yield (entry, under_boot) pairs.
+    
+    under_boot is worked out once per directory: it is True when root or any
+    directory on the way down names a boot location, so per-file checks
+    only need to look at the entry's own name.
+    """
+    stack = [(root, _is_boot_name(root))]
+    while stack:
+        path, under_boot = stack.pop()
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir():
+                    if not entry.is_symlink():
+                        stack.append((entry.path, under_boot or _is_boot_name(entry.name)))
+                else:
+                    yield entry, under_boot
+
+
+def _present(mount_point, rel_paths):
+    """Return which '/'-separated rel_paths exist under mount_point.
+    
+    Each parent directory is listed once with scandir, so paths sharing a
+    parent cost one directory read instead of one stat apiece. A parent is
+    only listed if its own parent's listing shows it, so absent subtrees
+    (the usual case for BIOS boot files) cost nothing past the first
+    missing component.
+    """
+    listings = {}
+    
+    def names_in(parent):
+        names = listings.get(parent)
+        if names is None:
+            grandparent, _, name = parent.rpartition('/')
+            if parent and name not in names_in(grandparent):
+                names = set()
+            else:
+                try:
+                    with os.scandir(os.path.join(mount_point, parent)) as it:
+                        names = {entry.name for entry in it}
+                except (FileNotFoundError, NotADirectoryError):
+                    names = set()
+            listings[parent] = names
+        return names
+    
+    present = set()
+    for rel in rel_paths:
+        parent, _, name = rel.rpartition('/')
+        if name in names_in(parent):
+            present.add(rel)
+    return present
+
+
+def _remove_tree(path):
+    """Remove a directory tree, delegating to rm -rf where it exists.
+    
+    coreutils rm unlinks with unlinkat in a tight C loop; shutil.rmtree is
+    the portable fallback.
+    """
+    rm = shutil.which("rm")
+    if rm and os.path.isdir(path):
+        subprocess.run([rm, "-rf", "--", path], check=False)
+    if os.path.exists(path):
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def _link_or_copy(src, dst):
+    """Hardlink src to dst, copying instead where the filesystem refuses links."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _build_live_tree(root):
+    """Write the canonical live-ISO layout the filesystem tests validate."""
+    for dir_name in ("EFI", "boot", "live", ".disk"):
+        os.makedirs(os.path.join(root, dir_name), exist_ok=True)
+    
+    # Create required files
+    with open(os.path.join(root, ".disk", "info"), 'w') as f:
+        f.write("RegicideOS 1.0.0\\n")
+    
+    # Create live filesystem
+    with open(os.path.join(root, "live", "filesystem.squashfs"), 'wb') as f:
+        f.write(b"Mock squashfs filesystem" * 1000)  # ~22KB
+
+
+class _ChecksumGenerator:
+    def __init__(self, file_path, algo="sha256"):
+        self.file_path = file_path
+        # blake3 is for local integrity checks only; without the package
+        # the generator falls back to SHA-256, and algo says which ran
+        self.algo = "blake3" if algo == "blake3" and blake3 is not None else "sha256"
+        self.errors = []
+        # ((st_ino, st_mtime_ns, st_size), hex digest) of the last hash
+        self._digest_cache = None
+    
+    def generate_sha256(self):
+        """Generate SHA256 checksum."""
+        try:
+            st = os.stat(self.file_path)
+            key = (st.st_ino, st.st_mtime_ns, st.st_size)
+            if self._digest_cache is not None and self._digest_cache[0] == key:
+                return self._digest_cache[1]
+            
+            digest = self._hash_file()
+            self._digest_cache = (key, digest)
+            return digest
+        except Exception as e:
+            self.errors.append(f"Failed to generate checksum: {e}")
+            return None
+    
+    def _hash_file(self):
+        """Hash the file without consulting the cache."""
+        return self._hash_path(self.file_path)
+    
+    def _hash_path(self, path):
+        """Hex digest of path with this generator's algorithm."""
+        if self.algo == "blake3":
+            return _blake3_digest(path).hex()
+        return _sha256_file(path)
+    
+    def generate_checksum_file(self, companion=None):
+        """Generate checksum file.
+        
+        A companion artifact (e.g. the live squashfs) is hashed with the same
+        algorithm on a second thread while the ISO is hashed, and listed on
+        its own line, relative to the ISO's directory.
+        """
+        if companion:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                companion_future = executor.submit(self._hash_path, companion)
+                checksum = self.generate_sha256()
+        else:
+            companion_future = None
+            checksum = self.generate_sha256()
+        if not checksum:
+            return False
+        
+        checksum_file = f"{self.file_path}{_SIDECAR_SUFFIX[self.algo]}"
+        # sha256sum's (and b3sum's) "<hash>  <name>" line, written as bytes in one syscall
+        payload = checksum.encode() + b"  " + os.path.basename(self.file_path).encode() + b"\n"
+        if companion_future is not None:
+            try:
+                companion_checksum = companion_future.result()
+            except Exception as e:
+                self.errors.append(f"Failed to generate checksum for {companion}: {e}")
+                return False
+            companion_name = os.path.relpath(companion, os.path.dirname(self.file_path))
+            payload += companion_checksum.encode() + b"  " + companion_name.encode() + b"\n"
+        try:
+            fd = os.open(checksum_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                os.write(fd, payload)
+            finally:
+                os.close(fd)
+            return True
+        except Exception as e:
+            self.errors.append(f"Failed to create checksum file: {e}")
+            return False
+
+
+class _ChecksumValidator:
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.errors = []
+        self.warnings = []
+        self._digest_cache = None
+    
+    def validate_checksum(self, checksum_file):
+        """Validate checksum against checksum file.
+        
+        The algorithm follows the sidecar's suffix: .b3 is BLAKE3, anything
+        else SHA-256.
+        """
+        if not os.path.exists(checksum_file):
+            self.errors.append("Checksum file does not exist")
+            return False
+        
+        algo = "blake3" if checksum_file.endswith(_SIDECAR_SUFFIX["blake3"]) else "sha256"
+        if algo == "blake3" and blake3 is None:
+            self.errors.append("Checksum validation failed: blake3 is not installed")
+            return False
+        
+        try:
+            # Read expected checksum from file
+            with open(checksum_file, 'r') as f:
+                checksum_line = f.readline().rstrip()
+            
+            # Parse checksum line (format: hash filename); a bare hash has
+            # no space and partition returns it whole
+            expected_checksum, _, _ = checksum_line.partition(' ')
+            
+            # Compare raw digests; a hash that is not hex cannot match, so
+            # the ISO is not hashed at all
+            try:
+                expected_digest = bytes.fromhex(expected_checksum)
+            except ValueError:
+                self.errors.append(f"Checksum mismatch: expected {expected_checksum}, which is not a hex digest")
+                return False
+            
+            # Calculate actual checksum
+            actual_digest = self._calculate_checksum(algo)
+            
+            if hmac.compare_digest(actual_digest, expected_digest):
+                return True
+            else:
+                self.errors.append(f"Checksum mismatch: expected {expected_checksum}, got {actual_digest.hex()}")
+                return False
+                
+        except Exception as e:
+            self.errors.append(f"Checksum validation failed: {e}")
+            return False
+    
+    def _calculate_checksum(self, algo="sha256"):
+        """Calculate the raw digest, reusing it while the file is unchanged."""
+        st = os.stat(self.file_path)
+        key = (algo, st.st_ino, st.st_mtime_ns, st.st_size)
+        if self._digest_cache is not None and self._digest_cache[0] == key:
+            return self._digest_cache[1]
+        
+        digest = self._hash_file(algo)
+        self._digest_cache = (key, digest)
+        return digest
+    
+    def _hash_file(self, algo="sha256"):
+        """Hash the file without consulting the cache."""
+        if algo == "blake3":
+            return _blake3_digest(self.file_path)
+        return _sha256_digest(self.file_path)
+
+
+class _UEFIBootValidator:
+    def __init__(self, mount_point):
+        self.mount_point = mount_point
+        self.errors = []
+        self.warnings = []
+    
+    def validate_uefi_boot(self):
+        """Validate UEFI boot capability."""
+        # Check for UEFI bootloader files
+        efi_files = [
+            "EFI/BOOT/BOOTX64.EFI",
+            "EFI/BOOT/BOOTIA32.EFI"
+        ]
+        
+        present = _present(self.mount_point, efi_files)
+        efi_found = False
+        for efi_file in efi_files:
+            if efi_file in present:
+                efi_found = True
+                self.warnings.append(f"Found UEFI bootloader: {efi_file}")
+        
+        if not efi_found:
+            self.errors.append("No UEFI bootloader found")
+            return False
+        
+        # Check for GRUB configuration
+        grub_config = os.path.join(self.mount_point, "boot/grub/grub.cfg")
+        if not os.path.exists(grub_config):
+            self.warnings.append("GRUB configuration not found")
+            return True  # Not critical
+        
+        return True
+    
+    def validate_secure_boot(self):
+        """Validate secure boot compatibility."""
+        # Check for secure boot related files
+        secure_boot_files = [
+            "EFI/BOOT/keys",
+            "EFI/BOOT/certificates"
+        ]
+        
+        secure_boot_support = bool(_present(self.mount_point, secure_boot_files))
+        
+        if secure_boot_support:
+            self.warnings.append("Secure boot support detected")
+        else:
+            self.warnings.append("Secure boot support not detected")
+        
+        return True  # Not critical
+
+
+class _BIOSBootValidator:
+    def __init__(self, mount_point):
+        self.mount_point = mount_point
+        self.errors = []
+    
+    def validate_no_bios_boot(self):
+        """Validate that BIOS boot is not supported."""
+        # Check for BIOS bootloader files (should not exist)
+        bios_files = [
+            "isolinux/isolinux.bin",
+            "syslinux/syslinux.cfg",
+            "boot/grub/i386-pc/core.img"
+        ]
+        
+        present = _present(self.mount_point, bios_files)
+        bios_found = False
+        for bios_file in bios_files:
+            if bios_file in present:
+                bios_found = True
+                self.errors.append(f"BIOS bootloader found: {bios_file}")
+        
+        if bios_found:
+            return False
+        
+        return True
+
+
+class _BootConfigValidator:
+    def __init__(self, mount_point):
+        self.mount_point = mount_point
+        self.errors = []
+        self.warnings = []
+    
+    def validate_boot_config(self):
+        """Validate boot configuration."""
+        grub_config = os.path.join(self.mount_point, "boot/grub/grub.cfg")
+        
+        if not os.path.exists(grub_config):
+            self.errors.append("GRUB configuration not found")
+            return False
+        
+        try:
+            with open(grub_config, 'rb') as f:
+                config_content = f.read()
+            
+            found = {m.group().decode() for m in _BOOT_TOKEN_RE.finditer(config_content)}
+            
+            # Check for required boot entries
+            missing_entries = [e for e in _BOOT_REQUIRED_ENTRIES if e not in found]
+            
+            if missing_entries:
+                self.warnings.append(f"Missing boot entries: {missing_entries}")
+            
+            # Check for UEFI-specific parameters
+            found_uefi_params = [p for p in _BOOT_UEFI_PARAMS if p in found]
+            
+            if len(found_uefi_params) < 2:
+                self.warnings.append("Insufficient UEFI boot parameters")
+            
+            return True
+            
+        except Exception as e:
+            self.errors.append(f"Failed to read boot configuration: {e}")
+            return False
+
+
+class _FilesystemValidator:
+    def __init__(self, mount_point):
+        self.mount_point = mount_point
+        self.errors = []
+        self.warnings = []
+    
+    def validate_filesystem_structure(self):
+        """Validate filesystem structure."""
+        # Required directories
+        required_dirs = [
+            "EFI",
+            "boot",
+            "live",
+            ".disk"
+        ]
+        
+        # Check required directories
+        present = _present(self.mount_point, required_dirs)
+        missing_dirs = [d for d in required_dirs if d not in present]
+        
+        if missing_dirs:
+            self.errors.append(f"Missing required directories: {missing_dirs}")
+            return False
+        
+        # Required files
+        required_files = [
+            ".disk/info",
+            ".disk/README"
+        ]
+        
+        present = _present(self.mount_point, required_files)
+        missing_files = [f for f in required_files if f not in present]
+        
+        if missing_files:
+            self.warnings.append(f"Missing optional files: {missing_files}")
+        
+        return True
+    
+    def validate_live_filesystem(self):
+        """Validate live filesystem."""
+        live_dir = os.path.join(self.mount_point, "live")
+        
+        if not os.path.exists(live_dir):
+            self.errors.append("Live filesystem directory not found")
+            return False
+        
+        # Check for squashfs filesystem
+        squashfs_file = os.path.join(live_dir, "filesystem.squashfs")
+        if not os.path.exists(squashfs_file):
+            self.errors.append("Live filesystem squashfs not found")
+            return False
+        
+        # Check squashfs file size
+        file_size = os.path.getsize(squashfs_file)
+        if file_size < 1048576:  # 1MB minimum
+            self.warnings.append("Live filesystem is very small")
+        
+        return True
+
+
+class _SecurityValidator:
+    def __init__(self, mount_point):
+        self.mount_point = mount_point
+        self.errors = []
+        self.warnings = []
+    
+    def validate_file_permissions(self):
+        """Validate file permissions."""
+        problematic_files = []
+        
+        # Walk through all files
+        for entry, under_boot in _scan_boot_flagged(self.mount_point):
+            file_path = entry.path
+            try:
+                # Check file permissions
+                mode = entry.stat().st_mode
+                
+                # Check for world-writable files
+                if mode & 0o002:  # World-writable
+                    problematic_files.append(file_path)
+                
+                # Check for executable files in sensitive locations
+                if mode & 0o111:  # Executable
+                    name = entry.name
+                    if under_boot or _is_boot_name(name):
+                        # Boot files can be executable
+                        pass
+                    elif name[name.rfind('.'):] in _SCRIPT_EXTS:
+                        # Script files can be executable
+                        pass
+                    else:
+                        self.warnings.append(f"Unexpected executable file: {file_path}")
+            
+            except Exception as e:
+                self.warnings.append(f"Could not check permissions for {file_path}: {e}")
+        
+        if problematic_files:
+            self.errors.append(f"World-writable files found: {problematic_files}")
+            return False
+        
+        return True
+    
+    def validate_secure_boot_compatibility(self):
+        """Validate secure boot compatibility."""
+        # Check for UEFI bootloader
+        efi_bootloader = os.path.join(self.mount_point, "EFI", "BOOT", "BOOTX64.EFI")
+        if not os.path.exists(efi_bootloader):
+            self.warnings.append("UEFI bootloader not found - secure boot may not work")
+        
+        # Check for secure boot keys
+        secure_boot_keys = os.path.join(self.mount_point, "EFI", "BOOT", "keys")
+        if os.path.exists(secure_boot_keys):
+            self.warnings.append("Secure boot keys found")
+        
+        return True  # Not critical
+
+
+class _IntegrityValidator:
+    def __init__(self, mount_point):
+        self.mount_point = mount_point
+        self.errors = []
+        self.warnings = []
+    
+    def validate_integrity(self):
+        """Validate ISO integrity."""
+        # Check for corrupted files (mock validation)
+        empty_files = []
+        
+        # Check for files with suspicious content; the sentinel is looked
+        # for in each file's first block, all heads searched together
+        suspicious_files = list(_paths_with_sentinel(self._file_heads(empty_files)))
+        corrupted_files = empty_files + suspicious_files
+        
+        if corrupted_files:
+            self.errors.append(f"Potentially corrupted files: {corrupted_files}")
+            return False
+        
+        return True
+    
+    def _file_heads(self, empty_files):
+        """Yield (path, first block) for each file, noting empty boot files on the way."""
+        for entry in _scan(self.mount_point):
+            file_path = entry.path
+            
+            # Check for empty files that shouldn't be empty
+            if file_path.endswith((".EFI", ".cfg", ".img")):
+                file_size = entry.stat().st_size
+                if file_size == 0:
+                    empty_files.append(file_path)
+            
+            try:
+                with open(file_path, 'rb') as f:
+                    head = f.read(_SENTINEL_PEEK_SIZE)
+            except:
+                # Permission issues
+                continue
+            
+            # The sentinel is a text marker; binaries are not scanned
+            if not _is_binary(head):
+                yield file_path, head
+    
+    def validate_signature(self):
+        """Validate file signatures (mock)."""
+        # In real implementation, this would check GPG signatures
+        signature_files = []
+        
+        for root, dirs, files in os.walk(self.mount_point):
+            for file in files:
+                if file.endswith((".sig", ".asc", ".pem")):
+                    signature_files.append(os.path.join(root, file))
+        
+        if signature_files:
+            self.warnings.append(f"Signature files found: {signature_files}")
+        else:
+            self.warnings.append("No signature files found")
+        
+        return True
 
-# Add the project root to Python path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
 class TestISOChecksumValidation(unittest.TestCase):
     """Test ISO checksum validation."""
@@ -37,98 +687,98 @@ class TestISOChecksumValidation(unittest.TestCase):
     
     def test_checksum_generation(self):
         """Test checksum generation."""
-        class ChecksumGenerator:
-            def __init__(self, file_path):
-                self.file_path = file_path
-                self.errors = []
-            
-            def generate_sha256(self):
-                """Generate SHA256 checksum."""
-                try:
-                    sha256_hash = hashlib.sha256()
-                    with open(self.file_path, 'rb') as f:
-                        # Read file in chunks to handle large files
-                        for chunk in iter(lambda: f.read(4096), b""):
-                            sha256_hash.update(chunk)
-                    return sha256_hash.hexdigest()
-                except Exception as e:
-                    self.errors.append(f"Failed to generate checksum: {e}")
-                    return None
-            
-            def generate_checksum_file(self):
-                """Generate checksum file."""
-                checksum = self.generate_sha256()
-                if not checksum:
-                    return False
-                
-                checksum_file = f"{self.file_path}.sha256"
-                try:
-                    with open(checksum_file, 'w') as f:
-                        f.write(f"{checksum} {os.path.basename(self.file_path)}\\n")
-                    return True
-                except Exception as e:
-                    self.errors.append(f"Failed to create checksum file: {e}")
-                    return False
-        
-        generator = ChecksumGenerator(self.test_file)
+        generator = _ChecksumGenerator(self.test_file)
         checksum = generator.generate_sha256()
         
         self.assertIsNotNone(checksum)
         self.assertEqual(checksum, self.expected_checksum)
         self.assertEqual(len(generator.errors), 0)
+        
+        # Batch hashing of build artifacts must agree with the generator
+        self.assertTrue(generator.generate_checksum_file())
+        checksum_file = f"{self.test_file}.sha256"
+        with open(checksum_file, 'rb') as f:
+            sidecar_bytes = f.read()
+        digests = _hash_files([self.test_file, checksum_file])
+        self.assertEqual(digests, {
+            self.test_file: self.expected_checksum,
+            checksum_file: hashlib.sha256(sidecar_bytes).hexdigest(),
+        })
+    
+    def test_checksum_generation_with_companion(self):
+        """Test that a companion artifact is hashed alongside the ISO."""
+        squashfs = os.path.join(self.temp_dir, "live", "filesystem.squashfs")
+        os.makedirs(os.path.dirname(squashfs))
+        with open(squashfs, 'wb') as f:
+            f.write(b"Mock squashfs filesystem")
+        
+        generator = _ChecksumGenerator(self.test_file)
+        self.assertTrue(generator.generate_checksum_file(companion=squashfs))
+        self.assertEqual(len(generator.errors), 0)
+        
+        with open(f"{self.test_file}.sha256") as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines, [
+            f"{self.expected_checksum}  test.iso",
+            f"{_sha256_file(squashfs)}  live/filesystem.squashfs",
+        ])
+    
+    def test_checksum_generation_with_companion_blake3_mode(self):
+        """Test that the companion line uses the same algorithm as the ISO line."""
+        squashfs = os.path.join(self.temp_dir, "filesystem.squashfs")
+        with open(squashfs, 'wb') as f:
+            f.write(b"Mock squashfs filesystem")
+        
+        generator = _ChecksumGenerator(self.test_file, algo="blake3")
+        self.assertTrue(generator.generate_checksum_file(companion=squashfs))
+        
+        suffix = _SIDECAR_SUFFIX[generator.algo]
+        with open(f"{self.test_file}{suffix}") as f:
+            iso_line, companion_line = f.read().splitlines()
+        self.assertEqual(iso_line, f"{generator.generate_sha256()}  test.iso")
+        
+        # The companion's sum must validate under the sidecar's algorithm
+        companion_sidecar = f"{squashfs}{suffix}"
+        with open(companion_sidecar, 'w') as f:
+            f.write(companion_line + "\n")
+        validator = _ChecksumValidator(squashfs)
+        self.assertTrue(validator.validate_checksum(companion_sidecar))
+    
+    def test_checksum_generation_blake3(self):
+        """Test the optional BLAKE3 mode and its SHA-256 fallback."""
+        generator = _ChecksumGenerator(self.test_file, algo="blake3")
+        checksum = generator.generate_sha256()
+        
+        if blake3 is None:
+            self.assertEqual(generator.algo, "sha256")
+            self.assertEqual(checksum, self.expected_checksum)
+        else:
+            self.assertEqual(generator.algo, "blake3")
+            with open(self.test_file, 'rb') as f:
+                self.assertEqual(checksum, blake3.blake3(f.read()).hexdigest())
+        self.assertEqual(len(generator.errors), 0)
+    
+    def test_checksum_file_roundtrip_blake3_mode(self):
+        """Test that a blake3-mode sidecar validates and never poses as .sha256."""
+        generator = _ChecksumGenerator(self.test_file, algo="blake3")
+        self.assertTrue(generator.generate_checksum_file())
+        
+        checksum_file = f"{self.test_file}{_SIDECAR_SUFFIX[generator.algo]}"
+        if generator.algo == "blake3":
+            self.assertFalse(os.path.exists(f"{self.test_file}.sha256"))
+        
+        validator = _ChecksumValidator(self.test_file)
+        self.assertTrue(validator.validate_checksum(checksum_file))
+        self.assertEqual(len(validator.errors), 0)
     
     def test_checksum_validation(self):
         """Test checksum validation."""
-        class ChecksumValidator:
-            def __init__(self, file_path):
-                self.file_path = file_path
-                self.errors = []
-                self.warnings = []
-            
-            def validate_checksum(self, checksum_file):
-                """Validate checksum against checksum file."""
-                if not os.path.exists(checksum_file):
-                    self.errors.append("Checksum file does not exist")
-                    return False
-                
-                try:
-                    # Read expected checksum from file
-                    with open(checksum_file, 'r') as f:
-                        checksum_line = f.readline().strip()
-                    
-                    # Parse checksum line (format: hash filename)
-                    if ' ' in checksum_line:
-                        expected_checksum = checksum_line.split(' ')[0]
-                    else:
-                        expected_checksum = checksum_line
-                    
-                    # Calculate actual checksum
-                    actual_checksum = self._calculate_checksum()
-                    
-                    if actual_checksum == expected_checksum:
-                        return True
-                    else:
-                        self.errors.append(f"Checksum mismatch: expected {expected_checksum}, got {actual_checksum}")
-                        return False
-                        
-                except Exception as e:
-                    self.errors.append(f"Checksum validation failed: {e}")
-                    return False
-            
-            def _calculate_checksum(self):
-                """Calculate SHA256 checksum."""
-                sha256_hash = hashlib.sha256()
-                with open(self.file_path, 'rb') as f:
-                    for chunk in iter(lambda: f.read(4096), b""):
-                        sha256_hash.update(chunk)
-                return sha256_hash.hexdigest()
-        
         # Create valid checksum file
         checksum_file = os.path.join(self.temp_dir, "test.iso.sha256")
         with open(checksum_file, 'w') as f:
             f.write(f"{self.expected_checksum} test.iso\\n")
         
-        validator = ChecksumValidator(self.test_file)
+        validator = _ChecksumValidator(self.test_file)
         result = validator.validate_checksum(checksum_file)
         
         self.assertTrue(result)
@@ -136,44 +786,12 @@ class TestISOChecksumValidation(unittest.TestCase):
     
     def test_checksum_validation_failure(self):
         """Test checksum validation failure."""
-        class ChecksumValidator:
-            def __init__(self, file_path):
-                self.file_path = file_path
-                self.errors = []
-            
-            def validate_checksum(self, checksum_file):
-                """Validate checksum against checksum file."""
-                try:
-                    with open(checksum_file, 'r') as f:
-                        checksum_line = f.readline().strip()
-                    
-                    expected_checksum = checksum_line.split(' ')[0]
-                    actual_checksum = self._calculate_checksum()
-                    
-                    if actual_checksum != expected_checksum:
-                        self.errors.append("Checksum mismatch")
-                        return False
-                    
-                    return True
-                    
-                except Exception as e:
-                    self.errors.append(f"Validation failed: {e}")
-                    return False
-            
-            def _calculate_checksum(self):
-                """Calculate SHA256 checksum."""
-                sha256_hash = hashlib.sha256()
-                with open(self.file_path, 'rb') as f:
-                    for chunk in iter(lambda: f.read(4096), b""):
-                        sha256_hash.update(chunk)
-                return sha256_hash.hexdigest()
-        
         # Create invalid checksum file
         checksum_file = os.path.join(self.temp_dir, "test.iso.sha256")
         with open(checksum_file, 'w') as f:
             f.write("invalid_checksum test.iso\\n")
         
-        validator = ChecksumValidator(self.test_file)
+        validator = _ChecksumValidator(self.test_file)
         result = validator.validate_checksum(checksum_file)
         
         self.assertFalse(result)
@@ -183,77 +801,35 @@ class TestISOChecksumValidation(unittest.TestCase):
         error_messages = [str(error) for error in validator.errors]
         self.assertTrue(any("mismatch" in msg for msg in error_messages))
 
-class TestISOBootValidation(unittest.TestCase):
-    """Test ISO boot validation."""
+class _ScratchRootTestCase(unittest.TestCase):
+    """Base for tests that each build a mount tree under one per-class root."""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Create one scratch root shared by every test in the class."""
+        cls._root = tempfile.mkdtemp()
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the shared scratch root in one pass."""
+        _remove_tree(cls._root)
     
     def setUp(self):
         """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
+        # Tests build their own trees, so each gets a subdirectory of the root
+        self.temp_dir = os.path.join(self._root, self.id().rsplit('.', 1)[-1])
         self.iso_mount = os.path.join(self.temp_dir, "mount")
-        os.makedirs(self.iso_mount, exist_ok=True)
-        
-    def tearDown(self):
-        """Clean up test fixtures."""
-        if os.path.exists(self.temp_dir):
-            shutil.rmtree(self.temp_dir)
+        self._create_mount()
+    
+    def _create_mount(self):
+        """Create this test's (empty) mount directory."""
+        os.makedirs(self.iso_mount)
+
+class TestISOBootValidation(_ScratchRootTestCase):
+    """Test ISO boot validation."""
     
     def test_uefi_boot_validation(self):
         """Test UEFI boot validation."""
-        class UEFIBootValidator:
-            def __init__(self, mount_point):
-                self.mount_point = mount_point
-                self.errors = []
-                self.warnings = []
-            
-            def validate_uefi_boot(self):
-                """Validate UEFI boot capability."""
-                # Check for UEFI bootloader files
-                efi_files = [
-                    "EFI/BOOT/BOOTX64.EFI",
-                    "EFI/BOOT/BOOTIA32.EFI"
-                ]
-                
-                efi_found = False
-                for efi_file in efi_files:
-                    full_path = os.path.join(self.mount_point, efi_file)
-                    if os.path.exists(full_path):
-                        efi_found = True
-                        self.warnings.append(f"Found UEFI bootloader: {efi_file}")
-                
-                if not efi_found:
-                    self.errors.append("No UEFI bootloader found")
-                    return False
-                
-                # Check for GRUB configuration
-                grub_config = os.path.join(self.mount_point, "boot/grub/grub.cfg")
-                if not os.path.exists(grub_config):
-                    self.warnings.append("GRUB configuration not found")
-                    return True  # Not critical
-                
-                return True
-            
-            def validate_secure_boot(self):
-                """Validate secure boot compatibility."""
-                # Check for secure boot related files
-                secure_boot_files = [
-                    "EFI/BOOT/keys",
-                    "EFI/BOOT/certificates"
-                ]
-                
-                secure_boot_support = False
-                for sb_file in secure_boot_files:
-                    full_path = os.path.join(self.mount_point, sb_file)
-                    if os.path.exists(full_path):
-                        secure_boot_support = True
-                        break
-                
-                if secure_boot_support:
-                    self.warnings.append("Secure boot support detected")
-                else:
-                    self.warnings.append("Secure boot support not detected")
-                
-                return True  # Not critical
-        
         # Create UEFI bootloader
         efi_dir = os.path.join(self.iso_mount, "EFI", "BOOT")
         os.makedirs(efi_dir, exist_ok=True)
@@ -261,7 +837,7 @@ class TestISOBootValidation(unittest.TestCase):
         with open(os.path.join(efi_dir, "BOOTX64.EFI"), 'w') as f:
             f.write("Mock UEFI bootloader\\n")
         
-        validator = UEFIBootValidator(self.iso_mount)
+        validator = _UEFIBootValidator(self.iso_mount)
         result = validator.validate_uefi_boot()
         
         self.assertTrue(result)
@@ -274,89 +850,27 @@ class TestISOBootValidation(unittest.TestCase):
     
     def test_bios_boot_rejection(self):
         """Test that BIOS boot is properly rejected."""
-        class BIOSBootValidator:
-            def __init__(self, mount_point):
-                self.mount_point = mount_point
-                self.errors = []
-            
-            def validate_no_bios_boot(self):
-                """Validate that BIOS boot is not supported."""
-                # Check for BIOS bootloader files (should not exist)
-                bios_files = [
-                    "isolinux/isolinux.bin",
-                    "syslinux/syslinux.cfg",
-                    "boot/grub/i386-pc/core.img"
-                ]
-                
-                bios_found = False
-                for bios_file in bios_files:
-                    full_path = os.path.join(self.mount_point, bios_file)
-                    if os.path.exists(full_path):
-                        bios_found = True
-                        self.errors.append(f"BIOS bootloader found: {bios_file}")
-                
-                if bios_found:
-                    return False
-                
-                return True
-        
-        validator = BIOSBootValidator(self.iso_mount)
+        validator = _BIOSBootValidator(self.iso_mount)
         result = validator.validate_no_bios_boot()
         
         self.assertTrue(result)
         self.assertEqual(len(validator.errors), 0)
     
+    def test_bios_boot_detected(self):
+        """Test that BIOS bootloaders below a present parent are reported."""
+        core_img = os.path.join(self.iso_mount, "boot", "grub", "i386-pc", "core.img")
+        os.makedirs(os.path.dirname(core_img))
+        with open(core_img, 'wb') as f:
+            f.write(b"Mock core image")
+        
+        validator = _BIOSBootValidator(self.iso_mount)
+        result = validator.validate_no_bios_boot()
+        
+        self.assertFalse(result)
+        self.assertEqual(validator.errors, ["BIOS bootloader found: boot/grub/i386-pc/core.img"])
+    
     def test_boot_configuration_validation(self):
         """Test boot configuration validation."""
-        class BootConfigValidator:
-            def __init__(self, mount_point):
-                self.mount_point = mount_point
-                self.errors = []
-                self.warnings = []
-            
-            def validate_boot_config(self):
-                """Validate boot configuration."""
-                grub_config = os.path.join(self.mount_point, "boot/grub/grub.cfg")
-                
-                if not os.path.exists(grub_config):
-                    self.errors.append("GRUB configuration not found")
-                    return False
-                
-                try:
-                    with open(grub_config, 'r') as f:
-                        config_content = f.read()
-                    
-                    # Check for required boot entries
-                    required_entries = [
-                        "menuentry",
-                        "linux",
-                        "initrd"
-                    ]
-                    
-                    missing_entries = []
-                    for entry in required_entries:
-                        if entry not in config_content:
-                            missing_entries.append(entry)
-                    
-                    if missing_entries:
-                        self.warnings.append(f"Missing boot entries: {missing_entries}")
-                    
-                    # Check for UEFI-specific parameters
-                    uefi_params = ["efi", "vmlinuz", "initrd"]
-                    found_uefi_params = []
-                    for param in uefi_params:
-                        if param in config_content:
-                            found_uefi_params.append(param)
-                    
-                    if len(found_uefi_params) < 2:
-                        self.warnings.append("Insufficient UEFI boot parameters")
-                    
-                    return True
-                    
-                except Exception as e:
-                    self.errors.append(f"Failed to read boot configuration: {e}")
-                    return False
-        
         # Create GRUB configuration
         grub_dir = os.path.join(self.iso_mount, "boot", "grub")
         os.makedirs(grub_dir, exist_ok=True)
@@ -368,110 +882,31 @@ class TestISOBootValidation(unittest.TestCase):
             f.write("    initrd /boot/initrd\\n")
             f.write("}\\n")
         
-        validator = BootConfigValidator(self.iso_mount)
+        validator = _BootConfigValidator(self.iso_mount)
         result = validator.validate_boot_config()
         
         self.assertTrue(result)
         self.assertEqual(len(validator.errors), 0)
 
-class TestISOFilesystemValidation(unittest.TestCase):
+class TestISOFilesystemValidation(_ScratchRootTestCase):
     """Test ISO filesystem validation."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.iso_mount = os.path.join(self.temp_dir, "mount")
-        os.makedirs(self.iso_mount, exist_ok=True)
-        
-    def tearDown(self):
-        """Clean up test fixtures."""
-        if os.path.exists(self.temp_dir):
-            shutil.rmtree(self.temp_dir)
+    @classmethod
+    def setUpClass(cls):
+        """Create the shared scratch root and the live-ISO template tree once."""
+        super().setUpClass()
+        cls._template = os.path.join(cls._root, "template")
+        _build_live_tree(cls._template)
+    
+    def _create_mount(self):
+        """Snapshot the template into this test's mount with hardlinks."""
+        # A test that rewrites a file must os.unlink it first so the
+        # template is untouched
+        shutil.copytree(self._template, self.iso_mount, copy_function=_link_or_copy)
     
     def test_filesystem_structure_validation(self):
         """Test filesystem structure validation."""
-        class FilesystemValidator:
-            def __init__(self, mount_point):
-                self.mount_point = mount_point
-                self.errors = []
-                self.warnings = []
-            
-            def validate_filesystem_structure(self):
-                """Validate filesystem structure."""
-                # Required directories
-                required_dirs = [
-                    "EFI",
-                    "boot",
-                    "live",
-                    ".disk"
-                ]
-                
-                # Check required directories
-                missing_dirs = []
-                for dir_name in required_dirs:
-                    dir_path = os.path.join(self.mount_point, dir_name)
-                    if not os.path.exists(dir_path):
-                        missing_dirs.append(dir_name)
-                
-                if missing_dirs:
-                    self.errors.append(f"Missing required directories: {missing_dirs}")
-                    return False
-                
-                # Required files
-                required_files = [
-                    ".disk/info",
-                    ".disk/README"
-                ]
-                
-                missing_files = []
-                for file_name in required_files:
-                    file_path = os.path.join(self.mount_point, file_name)
-                    if not os.path.exists(file_path):
-                        missing_files.append(file_name)
-                
-                if missing_files:
-                    self.warnings.append(f"Missing optional files: {missing_files}")
-                
-                return True
-            
-            def validate_live_filesystem(self):
-                """Validate live filesystem."""
-                live_dir = os.path.join(self.mount_point, "live")
-                
-                if not os.path.exists(live_dir):
-                    self.errors.append("Live filesystem directory not found")
-                    return False
-                
-                # Check for squashfs filesystem
-                squashfs_file = os.path.join(live_dir, "filesystem.squashfs")
-                if not os.path.exists(squashfs_file):
-                    self.errors.append("Live filesystem squashfs not found")
-                    return False
-                
-                # Check squashfs file size
-                file_size = os.path.getsize(squashfs_file)
-                if file_size < 1048576:  # 1MB minimum
-                    self.warnings.append("Live filesystem is very small")
-                
-                return True
-        
-        # Create filesystem structure
-        os.makedirs(os.path.join(self.iso_mount, "EFI"), exist_ok=True)
-        os.makedirs(os.path.join(self.iso_mount, "boot"), exist_ok=True)
-        os.makedirs(os.path.join(self.iso_mount, "live"), exist_ok=True)
-        os.makedirs(os.path.join(self.iso_mount, ".disk"), exist_ok=True)
-        
-        # Create required files
-        with open(os.path.join(self.iso_mount, ".disk", "info"), 'w') as f:
-            f.write("RegicideOS 1.0.0\\n")
-        
-        # Create live filesystem
-        live_dir = os.path.join(self.iso_mount, "live")
-        squashfs_file = os.path.join(live_dir, "filesystem.squashfs")
-        with open(squashfs_file, 'wb') as f:
-            f.write(b"Mock squashfs filesystem" * 1000)  # ~22KB
-        
-        validator = FilesystemValidator(self.iso_mount)
+        validator = _FilesystemValidator(self.iso_mount)
         
         # Test filesystem structure
         result1 = validator.validate_filesystem_structure()
@@ -483,79 +918,11 @@ class TestISOFilesystemValidation(unittest.TestCase):
         self.assertTrue(result2)
         self.assertEqual(len(validator.errors), 0)
 
-class TestISOSecurityValidation(unittest.TestCase):
+class TestISOSecurityValidation(_ScratchRootTestCase):
     """Test ISO security validation."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.iso_mount = os.path.join(self.temp_dir, "mount")
-        os.makedirs(self.iso_mount, exist_ok=True)
-        
-    def tearDown(self):
-        """Clean up test fixtures."""
-        if os.path.exists(self.temp_dir):
-            shutil.rmtree(self.temp_dir)
-    
     def test_file_permissions_validation(self):
         """Test file permissions validation."""
-        class SecurityValidator:
-            def __init__(self, mount_point):
-                self.mount_point = mount_point
-                self.errors = []
-                self.warnings = []
-            
-            def validate_file_permissions(self):
-                """Validate file permissions."""
-                problematic_files = []
-                
-                # Walk through all files
-                for root, dirs, files in os.walk(self.mount_point):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        try:
-                            # Check file permissions
-                            file_stat = os.stat(file_path)
-                            mode = file_stat.st_mode
-                            
-                            # Check for world-writable files
-                            if mode & 0o002:  # World-writable
-                                problematic_files.append(file_path)
-                            
-                            # Check for executable files in sensitive locations
-                            if mode & 0o111:  # Executable
-                                if "boot" in file_path or "EFI" in file_path:
-                                    # Boot files can be executable
-                                    pass
-                                elif file_path.endswith((".sh", ".py", ".exe")):
-                                    # Script files can be executable
-                                    pass
-                                else:
-                                    self.warnings.append(f"Unexpected executable file: {file_path}")
-                        
-                        except Exception as e:
-                            self.warnings.append(f"Could not check permissions for {file_path}: {e}")
-                
-                if problematic_files:
-                    self.errors.append(f"World-writable files found: {problematic_files}")
-                    return False
-                
-                return True
-            
-            def validate_secure_boot_compatibility(self):
-                """Validate secure boot compatibility."""
-                # Check for UEFI bootloader
-                efi_bootloader = os.path.join(self.mount_point, "EFI", "BOOT", "BOOTX64.EFI")
-                if not os.path.exists(efi_bootloader):
-                    self.warnings.append("UEFI bootloader not found - secure boot may not work")
-                
-                # Check for secure boot keys
-                secure_boot_keys = os.path.join(self.mount_point, "EFI", "BOOT", "keys")
-                if os.path.exists(secure_boot_keys):
-                    self.warnings.append("Secure boot keys found")
-                
-                return True  # Not critical
-        
         # Create test files with various permissions
         test_file = os.path.join(self.iso_mount, "test.txt")
         with open(test_file, 'w') as f:
@@ -564,7 +931,7 @@ class TestISOSecurityValidation(unittest.TestCase):
         # Set safe permissions
         os.chmod(test_file, 0o644)
         
-        validator = SecurityValidator(self.iso_mount)
+        validator = _SecurityValidator(self.iso_mount)
         result = validator.validate_file_permissions()
         
         self.assertTrue(result)
@@ -572,66 +939,12 @@ class TestISOSecurityValidation(unittest.TestCase):
     
     def test_integrity_validation(self):
         """Test integrity validation."""
-        class IntegrityValidator:
-            def __init__(self, mount_point):
-                self.mount_point = mount_point
-                self.errors = []
-                self.warnings = []
-            
-            def validate_integrity(self):
-                """Validate ISO integrity."""
-                # Check for corrupted files (mock validation)
-                corrupted_files = []
-                
-                for root, dirs, files in os.walk(self.mount_point):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        
-                        # Check for empty files that shouldn't be empty
-                        if file_path.endswith((".EFI", ".cfg", ".img")):
-                            file_size = os.path.getsize(file_path)
-                            if file_size == 0:
-                                corrupted_files.append(file_path)
-                        
-                        # Check for files with suspicious content
-                        try:
-                            with open(file_path, 'r', errors='ignore') as f:
-                                content = f.read()
-                                if "MALICIOUS" in content:
-                                    corrupted_files.append(file_path)
-                        except:
-                            # Binary files or permission issues
-                            pass
-                
-                if corrupted_files:
-                    self.errors.append(f"Potentially corrupted files: {corrupted_files}")
-                    return False
-                
-                return True
-            
-            def validate_signature(self):
-                """Validate file signatures (mock)."""
-                # In real implementation, this would check GPG signatures
-                signature_files = []
-                
-                for root, dirs, files in os.walk(self.mount_point):
-                    for file in files:
-                        if file.endswith((".sig", ".asc", ".pem")):
-                            signature_files.append(os.path.join(root, file))
-                
-                if signature_files:
-                    self.warnings.append(f"Signature files found: {signature_files}")
-                else:
-                    self.warnings.append("No signature files found")
-                
-                return True
-        
         # Create test files
         test_file = os.path.join(self.iso_mount, "test.txt")
         with open(test_file, 'w') as f:
             f.write("Legitimate content")
         
-        validator = IntegrityValidator(self.iso_mount)
+        validator = _IntegrityValidator(self.iso_mount)
         
         # Test integrity
         result1 = validator.validate_integrity()
@@ -642,6 +955,26 @@ class TestISOSecurityValidation(unittest.TestCase):
         result2 = validator.validate_signature()
         self.assertTrue(result2)
         self.assertGreater(len(validator.warnings), 0)
+    
+    def test_integrity_sentinel_scan(self):
+        """Test that text files carrying the sentinel are flagged and binaries are skipped."""
+        tampered = os.path.join(self.iso_mount, "tampered.txt")
+        with open(tampered, 'wb') as f:
+            f.write(b"header\nMALICIOUS payload\n")
+        
+        with open(os.path.join(self.iso_mount, "vmlinuz"), 'wb') as f:
+            f.write(b"\x7fELF\x02\x01\x01MALICIOUS")
+        
+        # Split across two files, the sentinel must not match
+        with open(os.path.join(self.iso_mount, "a.txt"), 'wb') as f:
+            f.write(b"MALIC")
+        with open(os.path.join(self.iso_mount, "b.txt"), 'wb') as f:
+            f.write(b"IOUS")
+        
+        validator = _IntegrityValidator(self.iso_mount)
+        
+        self.assertFalse(validator.validate_integrity())
+        self.assertEqual(validator.errors, [f"Potentially corrupted files: {[tampered]}"])
 
 if __name__ == '__main__':
     # Run tests with detailed output
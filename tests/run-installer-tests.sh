@@ -55,6 +55,17 @@ else
     echo -e "${YELLOW}python3 not found, skipping CLI tests${NC}"
 fi
 
+# Run mock-only Python unit tests; they are IO-free, so shard them across
+# cores when pytest-xdist is installed
+if command -v python3 &>/dev/null && python3 -c "import pytest" &>/dev/null; then
+    XDIST_ARGS=()
+    if python3 -c "import xdist" &>/dev/null; then
+        XDIST_ARGS=(-n auto --dist loadscope)
+    fi
+    run_test "Python unit tests (tests/installer/unit)" \
+        python3 -m pytest -q ${XDIST_ARGS[@]+"${XDIST_ARGS[@]}"} "$SCRIPT_DIR/installer/unit"
+fi
+
 # Run self-contained Python safety tests
 for test_file in "$SCRIPT_DIR"/installer/safety/test_destructive_operations.py; do
     if [[ -f "$test_file" ]]; then